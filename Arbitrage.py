@@ -1,70 +1,10 @@
 import streamlit as st
 import pandas as pd
+from i18n import get_translations
 
 def arbitrage_page():
-    # 语言翻译字典
-    translations = {
-        "en": {
-            "title": "📊 Arbitrage",
-            "arbitrage": "🔍 Arbitrage Overview",
-            "explanation": (
-                "Arbitrage is the practice of simultaneously buying and selling the same asset, or equivalent assets, "
-                "in different markets to profit from price differences. It exploits temporary inefficiencies between markets."
-            ),
-            "concept": "What is Arbitrage?",
-            "example_title": "💡 Example Scenario",
-            "example": (
-                "Suppose Bitcoin is trading at $72,500 on Broker A and $72,800 on Broker B. "
-                "You could buy Bitcoin on Broker A and sell on Broker B, making a $300 profit (minus fees)."
-            ),
-            "calc_title": "📈 Try It Yourself: Arbitrage Calculator",
-            "buy_price": "Buy Price (Market A)",
-            "sell_price": "Sell Price (Market B)",
-            "amount": "Amount (BTC)",
-            "fees": "Total Fees",
-            "calculate": "Calculate Profit",
-            "profit": "Estimated Profit",
-            "note": "*For simplicity, assume no slippage. Always factor in fees and execution speed in real trading!*",
-            "steps": "How Arbitrage Works",
-            "step1": "1. Identify price gaps between two markets.",
-            "step2": "2. Buy at the lower-priced market, sell at the higher-priced one.",
-            "step3": "3. Account for fees, transfer costs, and timing risks.",
-            "step4": "4. Execute quickly before the gap closes.",
-            "more": "More Resources",
-            "learn_more": "Learn more about arbitrage strategies",
-        },
-        "zh": {
-            "title": "📊 套利",
-            "arbitrage": "🔍 套利概览",
-            "explanation": (
-                "套利是指在不同市场同时买入和卖出同一资产或等价资产，从价格差异中获利。"
-                "这种方式利用了市场之间的临时价格失衡。"
-            ),
-            "concept": "什么是套利？",
-            "example_title": "💡 示例场景",
-            "example": (
-                "假设比特币在经纪商A处价格为72,500美元，在经纪商B为72,800美元。"
-                "你可以在A买入，在B卖出，获得300美元利润（扣除手续费）。"
-            ),
-            "calc_title": "📈 自己试一试：套利计算器",
-            "buy_price": "买入价（市场A）",
-            "sell_price": "卖出价（市场B）",
-            "amount": "数量（BTC）",
-            "fees": "总手续费",
-            "calculate": "计算利润",
-            "profit": "预估利润",
-            "note": "*为简化计算，假设无滑点。实际操作请考虑手续费与成交速度风险！*",
-            "steps": "套利流程",
-            "step1": "1. 发现两个市场的价格差。",
-            "step2": "2. 在价格低的市场买入，在价格高的市场卖出。",
-            "step3": "3. 考虑手续费、转账成本和时间风险。",
-            "step4": "4. 尽快执行，否则套利空间可能消失。",
-            "more": "扩展阅读",
-            "learn_more": "深入了解套利策略",
-        }
-    }
     lang = st.session_state.get("language", "en")
-    t = translations[lang]
+    t = get_translations("arbitrage", lang)
 
     # 页面宽度美化
     st.markdown("""
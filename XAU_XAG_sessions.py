@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, time
 from zoneinfo import ZoneInfo
+from i18n import get_translations
 
 # ---------- Helpers ----------
 TZ_ABBR_TO_IANA = {
@@ -60,49 +61,7 @@ def _to_utc_range(tzname, open_t, close_t):
 def xau_xag_market_page():
     lang = st.session_state.get("language", "zh")
 
-    T = {
-        "en": {
-            "title": "🥇 XAU / 🥈 XAG Sessions (DST aware, no calendar dates)",
-            "note": ("Spot gold/silver trade OTC 24×5. We use New York / London / Tokyo / Sydney "
-                     "business hours as sessions and convert them to UTC and your timezone."),
-            "tbl_sessions": "🌍 Four major sessions",
-            "col_market": "Market", "col_local": "Local Time", "col_utc": "UTC", "col_yours": "Your Local",
-            "ny": "New York", "ld": "London", "tk": "Tokyo", "sy": "Sydney",
-            "overlaps": "🔁 Typical overlaps (shown without dates)",
-            "ov_ld_ny": "London ↔ New York", "ov_tk_ld": "Tokyo ↔ London", "ov_sy_tk": "Sydney ↔ Tokyo",
-            "otc_title": "⏱️ Global OTC hours for XAU/XAG (typical)",
-            "otc_md": (
-                "- Open: around **Sun 21:00 UTC** (Sydney starts)\n"
-                "- Close: around **Fri 21:00–22:00 UTC** (NY winds down)\n"
-                "- Weekday maintenance (many brokers): **~21:00–22:00 UTC** Mon–Thu, 45–60m\n"
-                "- Exact windows vary by broker/server timezone; check your platform."
-            ),
-            "warn": "Sessions are liquidity conventions, not single-exchange opens.",
-            "cfg": "Settings", "ld_close": "London close",
-            "tzconv": "🕒 Timezone converter", "tz_src": "Source timezone (IANA or abbrev.)",
-            "tz_time": "Time (no date)", "tz_targets": "Convert to", "tz_out": "Converted times",
-        },
-        "zh": {
-            "title": "🥇 XAU / 🥈 XAG 市场时段（含夏令时、无日期）",
-            "note": ("现货金银为 OTC 24×5。这里用纽约/伦敦/东京/悉尼的工作时段作为“会话”，并换算到 UTC 与你的本地时区。"),
-            "tbl_sessions": "🌍 四大时段",
-            "col_market": "市场", "col_local": "当地时间", "col_utc": "UTC", "col_yours": "你的本地时间",
-            "ny": "纽约", "ld": "伦敦", "tk": "东京", "sy": "悉尼",
-            "overlaps": "🔁 典型重叠时段（不含日期）",
-            "ov_ld_ny": "伦敦 ↔ 纽约", "ov_tk_ld": "东京 ↔ 伦敦", "ov_sy_tk": "悉尼 ↔ 东京",
-            "otc_title": "⏱️ XAU/XAG 全球 OTC 交易时间（常见口径）",
-            "otc_md": (
-                "- 开市：周日 **21:00 UTC**（悉尼启动）\n"
-                "- 收市：周五 **21:00–22:00 UTC**（纽约收尾）\n"
-                "- 工作日维护：周一至周四 **约 21:00–22:00 UTC**，45–60 分钟\n"
-                "- 具体时间以券商服务器与合约细则为准。"
-            ),
-            "warn": "本页采用行业习惯的“会话”定义，用于教学/流动性观察。",
-            "cfg": "设置", "ld_close": "伦敦收市",
-            "tzconv": "🕒 时区转换器", "tz_src": "源时区（IANA 或缩写）",
-            "tz_time": "时间（不含日期）", "tz_targets": "转换到", "tz_out": "换算结果",
-        }
-    }[lang]
+    T = get_translations("xau_xag_sessions", lang)
 
     st.markdown("""
         <style>
@@ -0,0 +1,114 @@
+# 页面图表：matplotlib 输出按输入哈希缓存为 PNG（有界 LRU，图形用完即释放），或走 Altair / Streamlit 原生图表
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+CHART_ENGINES = ("Altair", "Streamlit", "Matplotlib")
+CHART_CACHE_SIZE = 32
+
+_png_cache = OrderedDict()
+_png_lock = threading.Lock()  # 多个会话在不同线程里共享同一缓存
+
+
+def _chart_key(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(part.tobytes())
+        else:
+            h.update(repr(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _render_bar_png(labels, values, xlabel, ylabel, title, value_format):
+    # 直接使用 Figure 而非 pyplot：不进入 pyplot 的全局图形表，不依赖 GUI 后端
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(10, 5))
+    try:
+        ax = fig.subplots()
+        bars = ax.bar(labels, values, color='skyblue')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        for bar in bars:
+            yval = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2, yval, value_format.format(yval), va='bottom', ha='center', fontsize=10, fontweight='bold')
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def bar_chart_png(labels, values, xlabel="", ylabel="", title="", value_format="{:.4f}"):
+    """Annotated bar chart as PNG bytes, cached by a hash of the inputs (bounded LRU)."""
+    labels = [str(label) for label in labels]
+    values = np.asarray(values, dtype=float)
+    key = _chart_key(labels, values, xlabel, ylabel, title, value_format)
+    with _png_lock:
+        if key in _png_cache:
+            _png_cache.move_to_end(key)
+            return _png_cache[key]
+    png = _render_bar_png(labels, values, xlabel, ylabel, title, value_format)
+    with _png_lock:
+        _png_cache[key] = png
+        _png_cache.move_to_end(key)
+        while len(_png_cache) > CHART_CACHE_SIZE:
+            _png_cache.popitem(last=False)
+    return png
+
+
+def bar_chart_altair(labels, values, xlabel="", ylabel="", title="", value_format=".4f"):
+    """Annotated bar chart as an Altair chart (no matplotlib import)."""
+    import altair as alt
+    data = pd.DataFrame({"label": [str(label) for label in labels], "value": np.asarray(values, dtype=float)})
+    base = alt.Chart(data, title=title).encode(
+        x=alt.X("label:N", title=xlabel, sort=None),
+        y=alt.Y("value:Q", title=ylabel),
+    )
+    bars = base.mark_bar(color="skyblue")
+    text = base.mark_text(dy=-6, fontWeight="bold").encode(text=alt.Text("value:Q", format=value_format))
+    return bars + text
+
+
+def stress_heatmap(shocks_pct, correlations, grid):
+    """Altair heatmap of margin level over (shock %, correlation), coloured by margin zone."""
+    import altair as alt
+    from core.stress import SAFE, MARGIN_CALL, STOP_OUT
+    shocks_pct = np.asarray(shocks_pct, dtype=float)
+    correlations = np.asarray(correlations, dtype=float)
+    # 每个格子的左右、上下边界取相邻取值的中点
+    dx = np.diff(shocks_pct).mean() / 2 if len(shocks_pct) > 1 else 0.5
+    dy = np.diff(correlations).mean() / 2 if len(correlations) > 1 else 0.5
+    rows, cols = np.meshgrid(np.arange(len(correlations)), np.arange(len(shocks_pct)), indexing="ij")
+    data = pd.DataFrame({
+        "shock": shocks_pct[cols.ravel()],
+        "rho": correlations[rows.ravel()],
+        "equity": grid["equity"].ravel(),
+        "free_margin": grid["free_margin"].ravel(),
+        "margin_level": np.minimum(grid["margin_level"].ravel(), 1e9),
+        "zone": grid["zone"].ravel(),
+    })
+    data["x0"], data["x1"] = data["shock"] - dx, data["shock"] + dx
+    data["y0"], data["y1"] = data["rho"] - dy, data["rho"] + dy
+    return alt.Chart(data).mark_rect().encode(
+        x=alt.X("x0:Q", title="Lead symbol shock (%)"), x2="x1",
+        y=alt.Y("y0:Q", title="Correlation of other symbols (ρ)"), y2="y1",
+        color=alt.Color("zone:N", title="Zone", scale=alt.Scale(
+            domain=[SAFE, MARGIN_CALL, STOP_OUT], range=["#8fd694", "#f5b041", "#e74c3c"])),
+        tooltip=[alt.Tooltip("shock:Q", format=".2f"), alt.Tooltip("rho:Q", format=".2f"),
+                 alt.Tooltip("equity:Q", format=",.2f"), alt.Tooltip("free_margin:Q", format=",.2f"),
+                 alt.Tooltip("margin_level:Q", format=",.2f")],
+    )
+
+
+def clear_chart_cache():
+    """Drop all cached PNG charts."""
+    with _png_lock:
+        _png_cache.clear()
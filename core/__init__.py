@@ -0,0 +1,25 @@
+# 无 Streamlit 依赖的计算核心：页面与批处理任务共用
+#
+#   core.instruments  品种规格注册表
+#   core.spread       点差与点差成本
+#   core.files        CSV / Excel / Parquet / Arrow 定型分块读取与按内容哈希缓存
+#   core.ticks        tick 文件流式点差统计
+#   core.costs        成交日志点差成本
+#   core.fixed        int64 tick 定点价格与精度校验
+#   core.sketch       可合并的点差分位数草图
+#   core.margin       保证金与分档杠杆组合保证金引擎
+#   core.rates        交叉汇率矩阵（经 USD 三角换算，按报价快照缓存）、账户货币盈亏与点值
+#   core.sizing       按风险比例批量计算手数（手数步长与上下限取整）
+#   core.swap         按结算周期与节假日历的隔夜利息展期计提、版本化 swap 费率与成交记录批量计提
+#   core.account      浮动盈亏与账户汇总
+#   core.orders       三个持仓页面共用的列式订单簿
+#   core.stress       价格冲击压力测试网格
+#   core.stopout      强平价位闭式求解（多账户）
+#   core.replay       报价逐笔回放与保证金阈值穿越事件
+#   core.history      由成交记录与价格历史还原账户保证金比率时间序列
+#   core.montecarlo   蒙特卡洛权益路径与追保概率
+#   core.nop          净持仓（NOP）汇总
+#   core.routing      风险评级与 A/B-Book 路由
+#   core.batch        日终批处理命令行：python -m core.batch accounts|swap ...
+#
+# 所有函数均为纯函数，既接受标量，也接受等长的 NumPy / pandas 列。
@@ -0,0 +1,161 @@
+# 浮动盈亏与账户汇总（余额、权益、已用/可用保证金、保证金比率）
+import numpy as np
+import pandas as pd
+
+from core.margin import margin_requirement
+
+LONG, SHORT = 1, -1
+# 页面与导入文件中出现过的多头 / 空头方向标签（中英文，英文不区分大小写）
+LONG_LABELS = ("Long", "Buy", "买入", "多头")
+SHORT_LABELS = ("Short", "Sell", "卖出", "空头")
+_LABEL_SIGN = {**{label.lower(): LONG for label in LONG_LABELS}, **{label.lower(): SHORT for label in SHORT_LABELS}}
+
+
+def direction_sign(direction):
+    """Map direction labels, booleans (True = long) or signed values to +1 / -1.
+
+    Labels are matched against LONG_LABELS / SHORT_LABELS ignoring case and
+    surrounding spaces; unknown or missing labels raise ValueError.
+    """
+    direction = np.asarray(direction)
+    if direction.dtype.kind == "b":
+        return np.where(direction, LONG, SHORT)
+    if direction.dtype.kind in "iuf":
+        return np.where(direction > 0, LONG, SHORT)
+    # 先对标签去重，只对不同取值查表
+    codes, labels = pd.factorize(direction.reshape(-1))
+    signs = np.array([_LABEL_SIGN.get(str(label).strip().lower(), 0) for label in labels] + [0], dtype=np.int64)
+    if (signs[codes] == 0).any():
+        names = [str(label) for label in np.asarray(labels, dtype=object)[signs[:-1] == 0]]
+        if (codes < 0).any():
+            names.append("<missing>")
+        raise ValueError(f"Unknown directions: {', '.join(sorted(names))}")
+    return signs[codes].reshape(direction.shape)
+
+
+def floating_pnl(direction, size, contract_size, entry_price, current_price):
+    """Floating P/L = (current - entry) × direction × size × contract size."""
+    return (np.subtract(current_price, entry_price) * direction_sign(direction)
+            * np.multiply(size, contract_size))
+
+
+def margin_level(equity, used_margin):
+    """Margin Level (%) = equity ÷ used margin × 100; inf when no margin is used."""
+    equity = np.asarray(equity, dtype=float)
+    used_margin = np.asarray(used_margin, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        level = np.where(used_margin > 0, equity / np.where(used_margin > 0, used_margin, 1.0) * 100, np.inf)
+    return level[()] if level.ndim == 0 else level
+
+
+def evaluate_orders(direction, size, contract_size, entry_price, current_price, margin_rate):
+    """Per-order sign, exposure (size × contract size), floating P/L and used margin in one pass."""
+    sign = direction_sign(direction)
+    exposure = np.multiply(np.asarray(size, dtype=float), np.asarray(contract_size, dtype=float))
+    return {
+        "sign": sign,
+        "exposure": exposure,
+        "floating": np.subtract(current_price, entry_price) * sign * exposure,
+        "margin": margin_requirement(exposure, 1.0, current_price, margin_rate),
+    }
+
+
+def summarize_orders(balance, orders):
+    """Account summary from `evaluate_orders` columns: one NumPy reduction per figure."""
+    account = RunningAccount()
+    account._load(orders)
+    return account.summary(balance)
+
+
+def calc_account_summary(balance, direction, size, contract_size, entry_price, current_price, margin_rate):
+    """Summarize an account from equal-length order columns (or scalars for one order)."""
+    return summarize_orders(balance, evaluate_orders(
+        direction, size, contract_size, entry_price, current_price, margin_rate))
+
+
+class RunningAccount:
+    """Running totals of a book (floating P/L, used margin, long/short exposure).
+
+    `add`, `remove` and `reprice` adjust the totals by the given orders' contribution
+    only (O(1) for one order); `verify` recomputes from the full book and resyncs if
+    the totals drifted. Orders without prices count towards exposure only.
+
+    `to_account` (per order, quote → account currency rate) converts floating P/L
+    and used margin as they are accumulated, so those totals are in the account
+    currency; exposure stays in units.
+    """
+
+    def __init__(self):
+        self.orders = 0
+        self.floating = 0.0
+        self.used_margin = 0.0
+        self.long_size = 0.0
+        self.short_size = 0.0
+
+    @classmethod
+    def from_columns(cls, direction, size, contract_size, entry_price, current_price, margin_rate, to_account=1.0):
+        """Build the totals from equal-length order columns (full recompute)."""
+        account = cls()
+        account._load(evaluate_orders(direction, size, contract_size, entry_price, current_price, margin_rate),
+                      to_account)
+        return account
+
+    def _load(self, orders, to_account=1.0):
+        self.__init__()
+        self._accumulate(1, orders, to_account)
+
+    def _accumulate(self, weight, orders, to_account=1.0):
+        sign, exposure = orders["sign"], orders["exposure"]
+        self.orders += weight * int(np.size(sign))
+        self.floating += weight * float(np.nansum(orders["floating"] * to_account))
+        self.used_margin += weight * float(np.nansum(orders["margin"] * to_account))
+        self.long_size += weight * float(np.sum(exposure, where=sign == LONG))
+        self.short_size += weight * float(np.sum(exposure, where=sign == SHORT))
+
+    def add(self, direction, size, contract_size, entry_price, current_price, margin_rate, to_account=1.0):
+        """Add the contribution of one order (scalars) or several (columns)."""
+        self._accumulate(1, evaluate_orders(direction, size, contract_size, entry_price, current_price, margin_rate),
+                         to_account)
+
+    def remove(self, direction, size, contract_size, entry_price, current_price, margin_rate, to_account=1.0):
+        """Subtract the contribution of one order (scalars) or several (columns)."""
+        self._accumulate(-1, evaluate_orders(direction, size, contract_size, entry_price, current_price, margin_rate),
+                         to_account)
+
+    def reprice(self, direction, size, contract_size, entry_price, old_price, new_price, margin_rate, to_account=1.0):
+        """Move orders' current price from `old_price` to `new_price`."""
+        self.remove(direction, size, contract_size, entry_price, old_price, margin_rate, to_account)
+        self.add(direction, size, contract_size, entry_price, new_price, margin_rate, to_account)
+
+    def summary(self, balance, used_margin=None, floating=None):
+        """Same figures as `summarize_orders`, from the running totals.
+
+        `used_margin` / `floating` replace the running totals, e.g. with the tiered
+        margin of core.margin.portfolio_margin or figures converted to the account
+        currency (core.rates).
+        """
+        used_margin = self.used_margin if used_margin is None else used_margin
+        floating = self.floating if floating is None else floating
+        equity = balance + floating
+        return {
+            "floating": floating,
+            "used_margin": used_margin,
+            "free_margin": equity - used_margin,
+            "margin_level": float(margin_level(equity, used_margin)),
+            "margin_used_pct": (used_margin / balance * 100) if balance > 0 else 0,
+            "long_size": self.long_size,
+            "short_size": self.short_size,
+            "net_position": self.long_size - self.short_size,
+            "equity": equity,
+        }
+
+    def verify(self, orders, rtol=1e-9, atol=1e-6, to_account=1.0):
+        """Compare with a full recompute (`evaluate_orders` columns); resync and return False on drift."""
+        expected = RunningAccount()
+        expected._load(orders, to_account)
+        ours = np.array([self.orders, self.floating, self.used_margin, self.long_size, self.short_size])
+        full = np.array([expected.orders, expected.floating, expected.used_margin, expected.long_size, expected.short_size])
+        if np.allclose(ours, full, rtol=rtol, atol=atol):
+            return True
+        self.__dict__.update(expected.__dict__)
+        return False
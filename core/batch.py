@@ -0,0 +1,242 @@
+# 日终批处理任务（命令行）：python -m core.batch <任务> ...
+#
+#   accounts  多账户持仓快照（Parquet）→ 每个账户的余额、权益、保证金与保证金比率（Parquet）
+#   swap      成交记录 + 版本化 swap 费率 → 每笔成交的应计 swap 与对账差额（Parquet）
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.account import LONG, SHORT, evaluate_orders, margin_level
+from core.instruments import CONTRACT_SIZE, MARGIN_RATE, require_symbol_ids
+from core.history import TRADE_COLUMNS, TRADE_DTYPES
+from core.rates import quote_snapshot, quote_to_account
+from core.stress import MARGIN_CALL_LEVEL
+from core.swap import SwapRates, parse_holidays, trade_swaps
+
+# 持仓快照的列；contract_size / margin_rate 缺省时取注册表，balance 也可由单独的余额文件提供，
+# account_currency 缺省时所有账户按同一账户货币（默认 USD）汇总
+SNAPSHOT_COLUMNS = ["account_id", "symbol", "direction", "lots", "entry", "current", "margin_rate"]
+OPTIONAL_COLUMNS = ["contract_size", "balance", "account_currency"]
+_SUMS = ["orders", "floating", "used_margin", "long_size", "short_size"]
+
+
+def position_sums(positions, account_currency="USD", quotes=None):
+    """Per-account order count, floating P/L, used margin and long/short exposure of a snapshot chunk.
+
+    P/L and margin are converted from each symbol's quote currency into the account
+    currency (the snapshot's `account_currency` column, else `account_currency`) at
+    the `quotes` snapshot (core.rates.quote_snapshot; reference quotes by default).
+    One factorize plus a bincount per figure; the sums are additive, so chunks of the
+    same snapshot can be reduced independently and added. Unknown symbols raise KeyError.
+    """
+    sid = require_symbol_ids(positions["symbol"])
+    contract_size = CONTRACT_SIZE[sid]
+    if "contract_size" in positions:
+        contract_size = positions["contract_size"].fillna(pd.Series(contract_size, index=positions.index)).to_numpy(dtype=float)
+    margin_rate = positions["margin_rate"].to_numpy(dtype=float) if "margin_rate" in positions else MARGIN_RATE[sid]
+    margin_rate = np.where(np.isnan(margin_rate), MARGIN_RATE[sid], margin_rate)
+    orders = evaluate_orders(positions["direction"].to_numpy(), positions["lots"].to_numpy(dtype=float), contract_size,
+                             positions["entry"].to_numpy(dtype=float), positions["current"].to_numpy(dtype=float),
+                             margin_rate)
+
+    if "account_currency" in positions:
+        account_currency = positions["account_currency"].fillna(account_currency).to_numpy()
+    to_account = quote_to_account(sid, account_currency, quote_snapshot() if quotes is None else quotes)
+
+    codes, accounts = pd.factorize(positions["account_id"])
+    n = len(accounts)
+
+    def per_account(weights):
+        return np.bincount(codes, weights=np.nan_to_num(weights), minlength=n)
+
+    sign, exposure = orders["sign"], orders["exposure"]
+    sums = pd.DataFrame({
+        "orders": np.bincount(codes, minlength=n),
+        "floating": per_account(orders["floating"] * to_account),
+        "used_margin": per_account(orders["margin"] * to_account),
+        "long_size": per_account(np.where(sign == LONG, exposure, 0.0)),
+        "short_size": per_account(np.where(sign == SHORT, exposure, 0.0)),
+    }, index=pd.Index(accounts, name="account_id"))
+    if "balance" in positions:
+        sums["balance"] = positions.groupby("account_id", sort=False)["balance"].first()
+    if "account_currency" in positions:
+        sums["account_currency"] = positions.groupby("account_id", sort=False)["account_currency"].first()
+    return sums
+
+
+def account_summaries(sums, balance=None):
+    """Vectorized `RunningAccount.summary` for every account in `position_sums` output.
+
+    `balance` (Series indexed by account_id) overrides a balance column in `sums`;
+    with neither, ValueError. Accounts missing from `balance` keep a NaN balance.
+    """
+    if balance is None:
+        if "balance" not in sums:
+            raise ValueError("No balance source: the snapshot has no balance column and no balances were given")
+        balance = sums["balance"]
+    balance = pd.Series(balance, dtype=float)
+    accounts = sums.index
+    if balance.index.dtype != accounts.dtype:
+        # 余额文件（CSV）的账户号按文本读入，与快照中的数值账户号按文本对齐
+        balance.index, accounts = balance.index.astype(str), accounts.astype(str)
+    balance = balance.reindex(accounts).to_numpy()
+    floating = sums["floating"].to_numpy()
+    used_margin = sums["used_margin"].to_numpy()
+    equity = balance + floating
+    with np.errstate(divide="ignore", invalid="ignore"):
+        used_pct = np.where(balance > 0, used_margin / balance * 100, 0.0)
+    result = pd.DataFrame({
+        "balance": balance,
+        "equity": equity,
+        "floating": floating,
+        "used_margin": used_margin,
+        "free_margin": equity - used_margin,
+        "margin_level": margin_level(equity, used_margin),
+        "margin_used_pct": used_pct,
+        "long_size": sums["long_size"].to_numpy(),
+        "short_size": sums["short_size"].to_numpy(),
+        "net_position": sums["long_size"].to_numpy() - sums["short_size"].to_numpy(),
+        "orders": sums["orders"].to_numpy(dtype=np.int64),
+    }, index=sums.index)
+    if "account_currency" in sums:
+        result.insert(0, "account_currency", sums["account_currency"].to_numpy())
+    return result.reset_index()
+
+
+def _combine(partials):
+    sums = pd.concat(partials)
+    if sums.index.has_duplicates:  # 同一账户跨多个分块
+        how = dict.fromkeys(_SUMS, "sum")
+        for name in ("balance", "account_currency"):
+            if name in sums:
+                how[name] = "first"
+        sums = sums.groupby(level=0, sort=False).agg(how)
+    return sums
+
+
+def _snapshot_columns(path):
+    import pyarrow.parquet as pq
+    names = pq.ParquetFile(path).schema_arrow.names
+    missing = [name for name in SNAPSHOT_COLUMNS if name not in names and name != "margin_rate"]
+    if missing:
+        raise KeyError(f"Missing columns: {', '.join(missing)}")
+    return [name for name in SNAPSHOT_COLUMNS + OPTIONAL_COLUMNS if name in names]
+
+
+def _row_offsets(parquet_file):
+    sizes = [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)]
+    return np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+
+
+def _summarize_rows(args):
+    import pyarrow.parquet as pq
+    path, start, stop, columns, account_currency, quotes = args
+    # 只读取与行区间 [start, stop) 重叠的 row group，再切出本区间的行
+    parquet_file = pq.ParquetFile(path)
+    offsets = _row_offsets(parquet_file)
+    groups = np.flatnonzero((offsets[:-1] < stop) & (offsets[1:] > start))
+    table = parquet_file.read_row_groups(groups, columns=columns).slice(start - offsets[groups[0]], stop - start)
+    return position_sums(table.to_pandas(), account_currency, quotes)
+
+
+def summarize_snapshot(path, balances=None, workers=1, account_currency="USD", quotes=None):
+    """Account summaries for a Parquet position snapshot.
+
+    The rows are split into `workers` equal row ranges (independent of how the file
+    is divided into row groups) reduced in a process pool; the per-account partial
+    sums are then added. `balances` maps account_id → balance (otherwise the
+    snapshot's `balance` column is used). Figures are in each account's currency,
+    converted at `quotes` (see `position_sums`).
+    """
+    import pyarrow.parquet as pq
+    columns = _snapshot_columns(path)
+    n_rows = int(_row_offsets(pq.ParquetFile(path))[-1])
+    if n_rows == 0:
+        return account_summaries(position_sums(pd.DataFrame(columns=columns), account_currency, quotes), balances)
+    bounds = np.linspace(0, n_rows, min(max(int(workers), 1), n_rows) + 1).astype(np.int64)
+    jobs = [(path, start, stop, columns, account_currency, quotes) for start, stop in zip(bounds[:-1], bounds[1:])]
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            partials = list(pool.map(_summarize_rows, jobs))
+    else:
+        partials = [_summarize_rows(job) for job in jobs]
+    return account_summaries(_combine(partials), balances)
+
+
+def _read_balances(path):
+    from core.files import read_table
+    table = read_table(path, {"account_id": object, "balance": np.float64})
+    return table.groupby("account_id", sort=False)["balance"].first()
+
+
+def _read_quotes(path):
+    from core.files import read_table
+    table = read_table(path, {"symbol": str, "price": np.float64})
+    return quote_snapshot(dict(zip(table["symbol"], table["price"])))
+
+
+def _accounts(args):
+    started = time.perf_counter()
+    balances = _read_balances(args.balances) if args.balances else None
+    quotes = _read_quotes(args.quotes) if args.quotes else None
+    result = summarize_snapshot(args.snapshot, balances, args.workers, args.currency, quotes)
+    result.to_parquet(args.output, index=False)
+    below = int((result["margin_level"] < args.margin_call).sum())
+    missing = int(result["balance"].isna().sum())  # 没有余额的账户无法判断，单独报告
+    print(f"{len(result):,} accounts → {args.output} in {time.perf_counter() - started:.1f}s; "
+          f"{below:,} below {args.margin_call:g}% margin level; {missing:,} without a balance")
+
+
+def _swap(args):
+    from core.files import read_table
+    started = time.perf_counter()
+    trades = read_table(args.trades, {"account_id": object, **TRADE_DTYPES})
+    rates = SwapRates.from_file(args.rates) if args.rates else SwapRates()
+    result = trade_swaps(trades, rates, parse_holidays(args.holidays), as_of=args.as_of)
+    result.to_parquet(args.output, index=False)
+    missing = int(result["expected_swap"].isna().sum())
+    print(f"{len(result):,} trades → {args.output} in {time.perf_counter() - started:.1f}s; "
+          f"expected swap {result['expected_swap'].sum():,.2f}; {missing:,} without a rate in force")
+    if args.accounts:
+        if "account_id" not in result:
+            raise KeyError("Missing column: account_id")
+        sums = ["expected_swap", "swap", "swap_diff"] if "swap" in result else ["expected_swap"]
+        result.groupby("account_id", sort=False)[sums].sum(min_count=1).reset_index().to_parquet(args.accounts, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.batch", description="End-of-day batch jobs.")
+    jobs = parser.add_subparsers(dest="job", required=True)
+    accounts = jobs.add_parser("accounts", help="account summaries from a Parquet position snapshot")
+    accounts.add_argument("snapshot", help="Parquet file: " + ", ".join(SNAPSHOT_COLUMNS))
+    accounts.add_argument("output", help="Parquet file to write, one row per account")
+    accounts.add_argument("--balances", help="CSV/Parquet file with account_id, balance")
+    accounts.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    accounts.add_argument("--currency", default="USD",
+                          help="account currency of accounts without an account_currency column (default: USD)")
+    accounts.add_argument("--quotes", help="CSV/Parquet file with symbol, price for currency conversion "
+                                           "(default: built-in reference quotes)")
+    accounts.add_argument("--margin-call", type=float, default=MARGIN_CALL_LEVEL, help="margin level (%%) to report")
+    accounts.set_defaults(run=_accounts)
+    swap = jobs.add_parser("swap", help="expected swap per trade from a trade log and versioned swap rates")
+    swap.add_argument("trades", help="CSV/Parquet trade log: " + ", ".join(TRADE_COLUMNS) + " (optional account_id, swap)")
+    swap.add_argument("output", help="Parquet file to write, one row per trade")
+    swap.add_argument("--rates", help="CSV/Parquet swap rates: symbol, direction, effective_date, swap (default: built-in)")
+    swap.add_argument("--holidays", default="", help="comma separated YYYY-MM-DD dates without rollover")
+    swap.add_argument("--as-of", help="accrue open trades up to this moment")
+    swap.add_argument("--accounts", help="also write per-account totals to this Parquet file")
+    swap.set_defaults(run=_swap)
+    args = parser.parse_args(argv)
+    try:
+        args.run(args)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# 成交日志的点差成本：逐笔计算，按品种、按账户累计，分块处理
+import numpy as np
+import pandas as pd
+
+from core.files import iter_table_chunks
+from core.fixed import spread_ticks, from_ticks
+from core.instruments import SYMBOLS, CONTRACT_SIZE, DECIMAL_PLACES, PIP_SIZE, TICK_SIZE, symbol_ids
+
+FILL_COLUMNS = ["account", "symbol", "size", "bid", "ask"]
+DEFAULT_CHUNKSIZE = 250_000
+_SUMS = ["fills", "volume", "cost", "_pips_volume"]
+
+
+def fill_costs(fills):
+    """Per-fill spread cost: (ask - bid) × |size in lots| × contract size, in quote currency.
+
+    Bid/ask are the quotes at fill time; the spread is taken on integer ticks. Extra
+    columns (order id, timestamp, ...) are passed through; unknown symbols are dropped.
+    """
+    sid = symbol_ids(fills["symbol"])
+    known = sid >= 0
+    fills = fills[known]
+    sid = sid[known]
+    decimals = DECIMAL_PLACES[sid]
+    ticks = spread_ticks(fills["bid"].to_numpy(dtype=float), fills["ask"].to_numpy(dtype=float), decimals)
+    spread = from_ticks(ticks, decimals)
+    size = fills["size"].to_numpy(dtype=float)
+
+    costs = fills.drop(columns=FILL_COLUMNS).reset_index(drop=True)
+    costs["account"] = fills["account"].to_numpy()
+    costs["symbol"] = np.asarray(SYMBOLS, dtype=object)[sid]
+    costs["size"] = size
+    costs["spread"] = spread
+    costs["spread_pips"] = ticks * TICK_SIZE[sid] / PIP_SIZE[sid]
+    costs["cost"] = spread * np.abs(size) * CONTRACT_SIZE[sid]
+    return costs
+
+
+class SpreadCostSummary:
+    """Running per-symbol and per-account spread-cost totals over fill chunks.
+
+    Costs are in each instrument's quote currency, so account totals are broken
+    down by symbol rather than added across currencies.
+    """
+
+    def __init__(self):
+        self.fills = 0
+        self.skipped = 0  # 注册表中不存在的品种，跳过的成交笔数
+        self._by_symbol = None
+        self._by_account = None
+
+    def update(self, costs, skipped=0):
+        """Add one chunk of per-fill costs (output of `fill_costs`)."""
+        self.fills += len(costs)
+        self.skipped += int(skipped)
+        volume = np.abs(costs["size"].to_numpy(dtype=float))
+        sums = pd.DataFrame({
+            "account": costs["account"].to_numpy(),
+            "symbol": costs["symbol"].to_numpy(),
+            "fills": 1,
+            "volume": volume,
+            "cost": costs["cost"].to_numpy(dtype=float),
+            "_pips_volume": costs["spread_pips"].to_numpy(dtype=float) * volume,
+        })
+        by_symbol = sums.groupby("symbol", sort=False)[_SUMS].sum()
+        by_account = sums.groupby(["account", "symbol"], sort=False)[_SUMS].sum()
+        self._by_symbol = by_symbol if self._by_symbol is None else self._by_symbol.add(by_symbol, fill_value=0)
+        self._by_account = by_account if self._by_account is None else self._by_account.add(by_account, fill_value=0)
+
+    @staticmethod
+    def _finish(totals, index):
+        if totals is None:
+            return pd.DataFrame(columns=index + ["fills", "volume", "cost", "avg_spread_pips"])
+        out = totals[["fills", "volume", "cost"]].astype({"fills": np.int64})
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["avg_spread_pips"] = totals["_pips_volume"] / totals["volume"]  # 按手数加权
+        return out.sort_values("cost", ascending=False).reset_index()
+
+    def by_symbol(self):
+        """Fills, volume (lots), total cost and volume-weighted spread (pips) per symbol."""
+        return self._finish(self._by_symbol, ["symbol"])
+
+    def by_account(self):
+        """The same totals per (account, symbol)."""
+        return self._finish(self._by_account, ["account", "symbol"])
+
+
+def summarize_order_log(source, chunksize=DEFAULT_CHUNKSIZE, on_chunk=None):
+    """Stream a fills CSV/Parquet file; return a SpreadCostSummary.
+
+    `on_chunk(costs, fraction_done)` receives each chunk's per-fill costs.
+    """
+    summary = SpreadCostSummary()
+    for chunk, done in iter_table_chunks(source, chunksize):
+        costs = fill_costs(chunk)
+        summary.update(costs, skipped=len(chunk) - len(costs))
+        if on_chunk is not None:
+            on_chunk(costs, done)
+    return summary
@@ -0,0 +1,145 @@
+# 表格文件（CSV / Excel / Parquet / Arrow IPC）分块读取：tick 文件、成交日志、订单导入等共用，内存占用与文件大小无关
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+EXCEL_SUFFIXES = (".xlsx", ".xls")
+DEFAULT_CHUNKSIZE = 250_000
+TABLE_CACHE_SIZE = 8  # 按内容哈希缓存的已解析表格数
+
+_table_cache = OrderedDict()
+_table_lock = threading.Lock()
+
+
+def _name(source):
+    return str(getattr(source, "name", source)).lower()
+
+
+def is_parquet(source):
+    """True when `source` (path or uploaded file) names a Parquet file."""
+    return _name(source).endswith(PARQUET_SUFFIXES)
+
+
+def _remaining_bytes(handle):
+    start = handle.tell()
+    end = handle.seek(0, os.SEEK_END)
+    handle.seek(start)
+    return start, end - start
+
+
+def _columns(usecols, names):
+    if usecols is None:
+        return None
+    if callable(usecols):
+        return [name for name in names if usecols(name)]
+    return list(usecols)
+
+
+def _typed(frame, dtype):
+    if not dtype:
+        return frame
+    return frame.astype({name: kind for name, kind in dtype.items() if name in frame.columns})
+
+
+def iter_table_chunks(source, chunksize, usecols=None, dtype=None):
+    """Yield (DataFrame, fraction done) for each chunk of at most `chunksize` rows.
+
+    `usecols` is a list of columns or a predicate on column names; `dtype` maps
+    column → dtype and is applied while parsing (CSV) or per batch (Arrow formats).
+    Parquet and Arrow IPC progress is counted in rows, CSV progress in bytes consumed
+    from the underlying file. Excel has no streaming reader and arrives as one chunk.
+    """
+    name = _name(source)
+    if name.endswith(PARQUET_SUFFIXES):
+        import pyarrow.parquet as pq  # 只有读取 Parquet / Arrow 时才需要 pyarrow
+        parquet = pq.ParquetFile(source)
+        total = max(parquet.metadata.num_rows, 1)
+        done = 0
+        columns = _columns(usecols, parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            done += batch.num_rows
+            yield _typed(batch.to_pandas(), dtype), done / total
+        return
+
+    if name.endswith(ARROW_SUFFIXES):
+        import pyarrow.ipc as ipc
+        reader = ipc.open_file(source)  # Feather v2 即 Arrow IPC 文件格式
+        columns = _columns(usecols, reader.schema.names)
+        total = max(reader.num_record_batches, 1)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, chunksize):
+                yield _typed(batch.slice(offset, chunksize).to_pandas(), dtype), (i + 1) / total
+        return
+
+    if name.endswith(EXCEL_SUFFIXES):
+        yield pd.read_excel(source, usecols=usecols, dtype=dtype), 1.0
+        return
+
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    try:
+        start, size = _remaining_bytes(handle)
+        for chunk in pd.read_csv(handle, chunksize=chunksize, usecols=usecols, dtype=dtype):
+            yield chunk, min((handle.tell() - start) / size, 1.0) if size else 1.0
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def read_table(source, dtypes, chunksize=DEFAULT_CHUNKSIZE):
+    """Read the columns named in `dtypes` (those present in the file) with their declared dtypes."""
+    frames = [chunk for chunk, _ in iter_table_chunks(source, chunksize, usecols=dtypes.__contains__, dtype=dtypes)]
+    if not frames:
+        return pd.DataFrame({name: pd.Series(dtype=kind) for name, kind in dtypes.items()})
+    return pd.concat(frames, ignore_index=True)
+
+
+def content_hash(data):
+    """Hex digest identifying a file's bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def source_hash(source):
+    """`content_hash` of an uploaded file or of a file path, read in blocks."""
+    if hasattr(source, "getvalue"):
+        return content_hash(source.getvalue())
+    h = hashlib.blake2b(digest_size=16)
+    with open(source, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_table(data, name, dtypes, chunksize=DEFAULT_CHUNKSIZE):
+    """Parse uploaded file bytes with `read_table`, memoized by content hash (bounded LRU).
+
+    `name` only selects the format by its suffix. The returned frame is shared with
+    the cache and must not be modified in place.
+    """
+    key = (content_hash(data), os.path.splitext(name.lower())[1], tuple(dtypes.items()))
+    with _table_lock:
+        if key in _table_cache:
+            _table_cache.move_to_end(key)
+            return _table_cache[key]
+    source = io.BytesIO(data)
+    source.name = name
+    frame = read_table(source, dtypes, chunksize)
+    with _table_lock:
+        _table_cache[key] = frame
+        while len(_table_cache) > TABLE_CACHE_SIZE:
+            _table_cache.popitem(last=False)
+    return frame
+
+
+def clear_table_cache():
+    """Drop all memoized parsed tables."""
+    with _table_lock:
+        _table_cache.clear()
@@ -0,0 +1,31 @@
+# 定点价格：内部以 int64 最小变动单位（tick）计数表示，按品种的 decimal_places 缩放
+import numpy as np
+
+# 判断是否落在价格网格上的容差（以 tick 为单位）：绝对 1e-6 加上与数值大小成正比的浮点舍入误差
+GRID_TOLERANCE = 1e-6
+_REL_TOLERANCE = 16 * np.finfo(np.float64).eps
+
+
+def _scale(decimal_places):
+    return 10.0 ** np.asarray(decimal_places, dtype=np.int64)
+
+
+def to_ticks(price, decimal_places):
+    """Price → int64 tick count (rounded to the nearest tick of `decimal_places`)."""
+    return np.rint(np.multiply(price, _scale(decimal_places))).astype(np.int64)
+
+
+def from_ticks(ticks, decimal_places):
+    """int64 tick count → float price."""
+    return np.divide(np.asarray(ticks, dtype=np.int64), _scale(decimal_places))
+
+
+def on_grid(price, decimal_places):
+    """True where `price` has no more than `decimal_places` decimals (within float error)."""
+    scaled = np.multiply(price, _scale(decimal_places))
+    return np.abs(scaled - np.rint(scaled)) <= GRID_TOLERANCE + _REL_TOLERANCE * np.abs(scaled)
+
+
+def spread_ticks(bid, ask, decimal_places):
+    """Exact spread in ticks: to_ticks(ask) - to_ticks(bid)."""
+    return to_ticks(ask, decimal_places) - to_ticks(bid, decimal_places)
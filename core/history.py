@@ -0,0 +1,178 @@
+# 历史账户还原：由成交记录（开仓 / 平仓）与价格历史，用累计和与 as-of 连接重建余额、权益、已用保证金与保证金比率的时间序列
+import numpy as np
+import pandas as pd
+
+from core.account import direction_sign, margin_level
+from core.instruments import CONTRACT_SIZE, MARGIN_RATE, SYMBOLS, require_symbol_ids, symbol_ids
+
+# 成交记录：每行一笔持仓；未平仓的 close_time / close_price 为空
+TRADE_COLUMNS = ["open_time", "close_time", "symbol", "direction", "lots", "open_price", "close_price"]
+TRADE_DTYPES = {
+    "open_time": str, "close_time": str, "symbol": str, "direction": str, "lots": np.float64,
+    "open_price": np.float64, "close_price": np.float64,
+    "contract_size": np.float64, "margin_rate": np.float64, "commission": np.float64, "swap": np.float64,
+}
+PRICE_DTYPES = {"timestamp": str, "symbol": str, "close": np.float64, "price": np.float64,
+                "bid": np.float64, "ask": np.float64}
+_STATE = ["net_exposure", "cost", "gross_rate", "realized"]
+
+
+def _times(values):
+    return pd.to_datetime(values).to_numpy().astype("datetime64[ns]")
+
+
+def _close_times(trades):
+    if "close_time" not in trades:
+        return np.full(len(trades), np.datetime64("NaT"), dtype="datetime64[ns]")
+    return _times(trades["close_time"])
+
+
+def _column(trades, name, default):
+    if name not in trades:
+        return default
+    values = trades[name].to_numpy(dtype=float)
+    return np.where(np.isnan(values), default, values)
+
+
+def trade_events(trades, to_account=1.0):
+    """Open and close events of a trade log as per-symbol state changes, in time order.
+
+    Each event changes the symbol's net signed exposure, the open cost of that
+    exposure (Σ sign × exposure × open price), its gross exposure × margin rate, and
+    the realized P/L booked into the balance (closes, plus commission and swap).
+    Exposure is scaled by `to_account` (quote → account currency rate, scalar or per
+    trade); commission and swap are taken as already in the account currency.
+    """
+    sid = require_symbol_ids(trades["symbol"])
+    sign = direction_sign(trades["direction"].to_numpy())
+    exposure = (trades["lots"].to_numpy(dtype=float) * _column(trades, "contract_size", CONTRACT_SIZE[sid])
+                * to_account)
+    rate = _column(trades, "margin_rate", MARGIN_RATE[sid]) / 100
+    open_price = trades["open_price"].to_numpy(dtype=float)
+    close_time = _close_times(trades)
+    closed = ~np.isnat(close_time)
+    charges = np.nan_to_num(_column(trades, "commission", 0.0)) + np.nan_to_num(_column(trades, "swap", 0.0))
+    realized = sign * exposure * (trades["close_price"].to_numpy(dtype=float) - open_price) + charges
+
+    opens = pd.DataFrame({
+        "timestamp": _times(trades["open_time"]),
+        "symbol": sid,
+        "net_exposure": sign * exposure,
+        "cost": sign * exposure * open_price,
+        "gross_rate": exposure * rate,
+        "realized": 0.0,
+    })
+    closes = opens[closed].assign(timestamp=close_time[closed], realized=realized[closed])
+    closes[["net_exposure", "cost", "gross_rate"]] *= -1
+    return pd.concat([opens, closes], ignore_index=True).sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def price_history(prices):
+    """Normalize bars (close) or ticks (bid/ask mid) to timestamp, symbol id, price."""
+    if "close" in prices:
+        price = prices["close"].to_numpy(dtype=float)
+    elif "price" in prices:
+        price = prices["price"].to_numpy(dtype=float)
+    else:
+        price = (prices["bid"].to_numpy(dtype=float) + prices["ask"].to_numpy(dtype=float)) / 2
+    sid = symbol_ids(prices["symbol"])
+    known = (sid >= 0) & np.isfinite(price)
+    return pd.DataFrame({
+        "timestamp": _times(prices["timestamp"])[known],
+        "symbol": sid[known],
+        "price": price[known],
+    })
+
+
+def _evaluate(timestamps, events, prices, balance, inclusive):
+    symbols = np.unique(events["symbol"])
+    timeline = pd.DataFrame({"timestamp": np.asarray(timestamps, dtype="datetime64[ns]")})
+    timeline["_order"] = np.arange(len(timeline))
+    timeline = timeline.sort_values("timestamp", kind="stable")
+    # 每个时点 × 持仓过的品种
+    grid = pd.DataFrame({
+        "timestamp": np.repeat(timeline["timestamp"].to_numpy(), len(symbols)),
+        "_order": np.repeat(timeline["_order"].to_numpy(), len(symbols)),
+        "symbol": np.tile(symbols, len(timeline)),
+    })
+
+    # 各品种的状态 = 事件增量的累计和；inclusive=False 时取该时点之前（不含同一时刻的成交）的状态
+    state = events.copy()
+    state[_STATE] = state.groupby("symbol", sort=False)[_STATE].cumsum()
+    state = state.drop_duplicates(["timestamp", "symbol"], keep="last")
+    grid = pd.merge_asof(grid, state, on="timestamp", by="symbol", allow_exact_matches=inclusive)
+    grid = pd.merge_asof(grid, prices.sort_values("timestamp", kind="stable"), on="timestamp", by="symbol")
+    grid[_STATE] = grid[_STATE].fillna(0.0)
+
+    held = (grid["net_exposure"] != 0) | (grid["gross_rate"] != 0)
+    price = grid["price"].to_numpy()
+    grid["floating"] = np.where(held, grid["net_exposure"] * price - grid["cost"], 0.0)
+    grid["used_margin"] = np.where(held, grid["gross_rate"] * price, 0.0)
+    # 对品种求和；持仓品种尚无价格时结果为 NaN，不会被静默当作 0
+    order = timeline["_order"].to_numpy()
+
+    def per_moment(column):
+        return np.bincount(grid["_order"], weights=grid[column], minlength=len(timeline))[order]
+
+    result = pd.DataFrame(index=pd.DatetimeIndex(timeline["timestamp"].to_numpy(), name="timestamp"))
+    result["balance"] = balance + per_moment("realized")  # 已平仓盈亏计入余额
+    result["floating"] = per_moment("floating")
+    result["equity"] = result["balance"] + result["floating"]
+    result["used_margin"] = per_moment("used_margin")
+    result["free_margin"] = result["equity"] - result["used_margin"]
+    result["margin_level"] = margin_level(result["equity"].to_numpy(), result["used_margin"].to_numpy())
+    return result, order
+
+
+def margin_history(trades, prices, balance, freq=None, to_account=1.0):
+    """Balance, floating P/L, equity, used margin, free margin and margin level over time.
+
+    `trades` is a trade log (TRADE_COLUMNS, optional contract_size, margin_rate,
+    commission, swap); `prices` holds bars (timestamp, symbol, close) or ticks
+    (timestamp, symbol, bid, ask). Open and close prices of the trades count as price
+    observations too. The series is evaluated at every price and trade timestamp, or
+    on a regular `freq` grid (e.g. "1min") when given; `balance` is the starting balance.
+    Amounts are in the account currency when `to_account` is given (see trade_events).
+    """
+    events = trade_events(trades, to_account)
+    prices = pd.concat([price_history(prices), _trade_prices(trades)], ignore_index=True)
+    if freq is None:
+        timestamps = np.unique(np.concatenate([prices["timestamp"].to_numpy(), events["timestamp"].to_numpy()]))
+    else:
+        start = min(prices["timestamp"].min(), events["timestamp"].min())
+        end = max(prices["timestamp"].max(), events["timestamp"].max())
+        timestamps = pd.date_range(start.floor(freq), end.ceil(freq), freq=freq).to_numpy()
+    return _evaluate(timestamps, events, prices, balance, inclusive=True)[0]
+
+
+def margin_at(trades, prices, balance, timestamps, to_account=1.0):
+    """Account state at given moments, counting only trades executed strictly before each one.
+
+    Prices up to and including the moment are used, so for a position closed by a
+    stop-out this is the margin level that triggered it. Rows follow `timestamps`.
+    """
+    events = trade_events(trades, to_account)
+    prices = pd.concat([price_history(prices), _trade_prices(trades)], ignore_index=True)
+    result, order = _evaluate(_times(np.atleast_1d(timestamps)), events, prices, balance, inclusive=False)
+    return result.iloc[np.argsort(order, kind="stable")]
+
+
+def _trade_prices(trades):
+    sid = require_symbol_ids(trades["symbol"])
+    close_price = trades["close_price"].to_numpy(dtype=float) if "close_price" in trades else np.full(len(trades), np.nan)
+    frame = pd.DataFrame({
+        "timestamp": np.concatenate([_times(trades["open_time"]), _close_times(trades)]),
+        "symbol": np.concatenate([sid, sid]),
+        "price": np.concatenate([trades["open_price"].to_numpy(dtype=float), close_price]),
+    })
+    return frame.dropna()
+
+
+def closed_trade_levels(trades, prices, balance, to_account=1.0):
+    """Every closed trade with the account's margin level just before it was closed."""
+    closed = trades[~np.isnat(_close_times(trades))].reset_index(drop=True)
+    state = margin_at(trades, prices, balance, _close_times(closed), to_account)
+    out = closed.assign(symbol=np.asarray(SYMBOLS, dtype=object)[require_symbol_ids(closed["symbol"])])
+    out["equity_before"] = state["equity"].to_numpy()
+    out["margin_level_before"] = state["margin_level"].to_numpy()
+    return out
@@ -0,0 +1,107 @@
+# 统一的品种规格注册表：每个字段是一列 NumPy 数组，按整数 id 索引
+import numpy as np
+import pandas as pd
+
+ASSET_CLASSES = ("fx", "metal", "energy", "index", "crypto")
+
+# (symbol, asset class, unit, contract size, contract label, decimal places, pip size, margin rate %,
+#  base, quote currency, lot step, min lot, max lot) —— 非外汇品种的 base 为标的代码，报价货币即盈亏与保证金的计价货币
+_SPECS = [
+    ("Gold (XAUUSD)", "metal", "Ounces", 100, "100 Ounces", 2, 0.01, 2.0, "XAU", "USD", 0.01, 0.01, 50),
+    ("Silver (XAGUSD)", "metal", "Ounces", 1000, "1000 Ounces", 3, 0.01, 2.0, "XAG", "USD", 0.01, 0.01, 50),
+    ("Oil (WTI)", "energy", "Barrels", 1000, "1000 Barrels", 2, 0.01, 5.0, "WTI", "USD", 0.01, 0.01, 100),
+    ("Index (S&P 500)", "index", "Points", 50, "$50 per point", 2, 1.0, 5.0, "SPX", "USD", 0.1, 0.1, 100),
+    ("EUR/USD", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "EUR", "USD", 0.01, 0.01, 100),
+    ("GBP/USD", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "GBP", "USD", 0.01, 0.01, 100),
+    ("USD/JPY", "fx", "Units of Base Currency", 100000, "100,000 Units", 3, 0.01, 1.0, "USD", "JPY", 0.01, 0.01, 100),
+    ("AUD/USD", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "AUD", "USD", 0.01, 0.01, 100),
+    ("USD/CHF", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "USD", "CHF", 0.01, 0.01, 100),
+    ("USD/CAD", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "USD", "CAD", 0.01, 0.01, 100),
+    ("NZD/USD", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "NZD", "USD", 0.01, 0.01, 100),
+    ("EUR/JPY", "fx", "Units of Base Currency", 100000, "100,000 Units", 3, 0.01, 1.0, "EUR", "JPY", 0.01, 0.01, 100),
+    ("GBP/JPY", "fx", "Units of Base Currency", 100000, "100,000 Units", 3, 0.01, 1.0, "GBP", "JPY", 0.01, 0.01, 100),
+    ("EUR/GBP", "fx", "Units of Base Currency", 100000, "100,000 Units", 5, 0.0001, 1.0, "EUR", "GBP", 0.01, 0.01, 100),
+    ("BTC/USD", "crypto", "Coins", 1, "1 Coin", 8, 0.01, 50.0, "BTC", "USD", 0.01, 0.01, 20),
+    ("ETH/USD", "crypto", "Coins", 1, "1 Coin", 8, 0.01, 50.0, "ETH", "USD", 0.01, 0.01, 200),
+    ("BNB/USD", "crypto", "Coins", 1, "1 Coin", 8, 0.01, 50.0, "BNB", "USD", 0.1, 0.1, 500),
+    ("XRP/USD", "crypto", "Coins", 1, "1 Coin", 8, 0.01, 50.0, "XRP", "USD", 10, 10, 100000),
+    ("LTC/USD", "crypto", "Coins", 1, "1 Coin", 8, 0.01, 50.0, "LTC", "USD", 0.1, 0.1, 2000),
+]
+
+
+def _column(values, dtype):
+    arr = np.array(values, dtype=dtype)
+    arr.setflags(write=False)  # 进程内共享，只读
+    return arr
+
+
+SYMBOLS = tuple(row[0] for row in _SPECS)
+ASSET_CLASS = _column([ASSET_CLASSES.index(row[1]) for row in _SPECS], np.int8)
+UNIT = _column([row[2] for row in _SPECS], object)
+CONTRACT_SIZE = _column([row[3] for row in _SPECS], np.float64)
+CONTRACT_LABEL = _column([row[4] for row in _SPECS], object)
+DECIMAL_PLACES = _column([row[5] for row in _SPECS], np.int8)
+TICK_SIZE = _column([10.0 ** -row[5] for row in _SPECS], np.float64)
+PIP_SIZE = _column([row[6] for row in _SPECS], np.float64)
+MARGIN_RATE = _column([row[7] for row in _SPECS], np.float64)  # 百分比，与页面输入一致
+BASE_CURRENCY = _column([row[8] for row in _SPECS], object)
+QUOTE_CURRENCY = _column([row[9] for row in _SPECS], object)
+LOT_STEP = _column([row[10] for row in _SPECS], np.float64)
+MIN_LOT = _column([row[11] for row in _SPECS], np.float64)
+MAX_LOT = _column([row[12] for row in _SPECS], np.float64)
+
+# 名称 -> id（含常见别名，如 "XAUUSD"、"EURUSD"、"S&P 500"）
+SYMBOL_INDEX = {name: i for i, name in enumerate(SYMBOLS)}
+_ALIASES = {
+    "Gold (XAUUSD)": ("XAUUSD", "XAU/USD", "Gold"),
+    "Silver (XAGUSD)": ("XAGUSD", "XAG/USD", "Silver"),
+    "Oil (WTI)": ("WTI", "USOIL", "Oil"),
+    "Index (S&P 500)": ("S&P 500", "SPX500", "US500"),
+}
+for _name, _aliases in _ALIASES.items():
+    for _alias in _aliases:
+        SYMBOL_INDEX[_alias] = SYMBOL_INDEX[_name]
+for _name in SYMBOLS:
+    if "/" in _name:
+        SYMBOL_INDEX.setdefault(_name.replace("/", ""), SYMBOL_INDEX[_name])
+
+
+def symbol_id(symbol):
+    """Return the integer id of `symbol` (name or alias); raises KeyError if unknown."""
+    return SYMBOL_INDEX[symbol]
+
+
+def symbol_ids(symbols):
+    """Vectorized symbol_id over an array/column of names; unknown names map to -1."""
+    codes, names = pd.factorize(np.asarray(symbols, dtype=object).reshape(-1))
+    ids = np.array([SYMBOL_INDEX.get(n, -1) for n in names] + [-1], dtype=np.int32)
+    return ids[codes]  # factorize 对缺失值给出 -1，正好落在末尾的 -1 上
+
+
+def require_symbol_ids(symbols):
+    """symbol_ids for columns that must be fully known; raises KeyError listing unknown names."""
+    sid = symbol_ids(symbols)
+    if (sid < 0).any():
+        unknown = np.asarray(symbols, dtype=object).reshape(-1)[sid < 0]
+        raise KeyError(f"Unknown instruments: {', '.join(sorted(set(unknown.astype(str))))}")
+    return sid
+
+
+def spec(sid):
+    """Return the specification of one instrument id as a plain dict (for the UI)."""
+    return {
+        "symbol": SYMBOLS[sid],
+        "asset_class": ASSET_CLASSES[ASSET_CLASS[sid]],
+        "unit": UNIT[sid],
+        "contract_size": float(CONTRACT_SIZE[sid]),
+        "contract_label": CONTRACT_LABEL[sid],
+        "decimal_places": int(DECIMAL_PLACES[sid]),
+        "tick_size": float(TICK_SIZE[sid]),
+        "pip_size": float(PIP_SIZE[sid]),
+        "margin_rate": float(MARGIN_RATE[sid]),
+        "base_currency": BASE_CURRENCY[sid],
+        "quote_currency": QUOTE_CURRENCY[sid],
+        "lot_step": float(LOT_STEP[sid]),
+        "min_lot": float(MIN_LOT[sid]),
+        "max_lot": float(MAX_LOT[sid]),
+    }
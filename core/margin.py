@@ -0,0 +1,86 @@
+# 保证金计算
+import numpy as np
+import pandas as pd
+
+from core.instruments import SYMBOLS, ASSET_CLASS, ASSET_CLASSES
+from core.rates import conversion_rates, quote_to_account
+
+
+def margin_required(ask, trade_size, leverage, contract_size=1.0):
+    """Margin for a trade quoted at `ask`: ask × trade size × contract size ÷ leverage."""
+    return np.multiply(np.multiply(ask, trade_size), contract_size) / np.asarray(leverage)
+
+
+def margin_requirement(size, contract_size, price, margin_rate):
+    """Margin Requirement = Position Size × Contract Size × Price × Margin Rate (%)."""
+    return np.multiply(np.multiply(size, contract_size), price) * (np.asarray(margin_rate) / 100)
+
+
+# 按名义价值分档的杠杆：(档位下限, 杠杆)，档位以 TIER_CURRENCY 计。第一档与注册表默认保证金率一致
+TIER_CURRENCY = "USD"
+LEVERAGE_TIERS = {
+    "fx": ((0.0, 1_000_000.0, 5_000_000.0, 20_000_000.0), (100.0, 50.0, 20.0, 10.0)),
+    "metal": ((0.0, 500_000.0, 2_000_000.0, 10_000_000.0), (50.0, 25.0, 10.0, 5.0)),
+    "energy": ((0.0, 500_000.0, 2_000_000.0), (20.0, 10.0, 5.0)),
+    "index": ((0.0, 1_000_000.0, 5_000_000.0), (20.0, 10.0, 5.0)),
+    "crypto": ((0.0, 100_000.0, 1_000_000.0), (2.0, 1.5, 1.0)),
+}
+
+
+def tiered_margin(notional, floors, leverages):
+    """Margin of `notional` under one tier schedule: each slice of notional at its tier's leverage.
+
+    `floors` are the ascending lower bounds of the tiers (the first is 0). The tier is
+    found with one searchsorted over the sorted bounds; the margin of all lower tiers
+    is precomputed as a cumulative sum.
+    """
+    floors = np.asarray(floors, dtype=float)
+    rates = 1.0 / np.asarray(leverages, dtype=float)
+    below = np.concatenate([[0.0], np.cumsum(np.diff(floors) * rates[:-1])])  # 各档下限处的累计保证金
+    notional = np.abs(np.asarray(notional, dtype=float))
+    tier = np.searchsorted(floors, notional, side="right") - 1
+    return below[tier] + (notional - floors[tier]) * rates[tier]
+
+
+def portfolio_margin(symbol, size, contract_size, price, prices, account_currency="USD", account=None,
+                     tiers=LEVERAGE_TIERS):
+    """Tiered margin of a whole position table, in the account currency.
+
+    Notional = |size| × contract size × price, converted from the quote currency with
+    the cross-rate matrix of the `prices` snapshot (see core.rates). Tiers apply to
+    the gross notional of each (account, symbol), measured in TIER_CURRENCY, per its
+    asset class's schedule; the pair's margin is split back over its positions pro
+    rata to notional. Notional and margin are returned in `account_currency`.
+    """
+    symbol = np.asarray(symbol, dtype=np.int64)
+    n_symbols = len(SYMBOLS)
+    notional = (np.abs(np.multiply(np.asarray(size, dtype=float), contract_size)) * np.asarray(price, dtype=float)
+                * quote_to_account(symbol, TIER_CURRENCY, prices))
+    codes, accounts = pd.factorize(np.zeros(len(symbol), dtype=np.int64) if account is None else np.asarray(account))
+    pairs, inverse = np.unique(codes * n_symbols + symbol, return_inverse=True)
+    pair_notional = np.bincount(inverse, weights=notional, minlength=len(pairs))
+    pair_symbol = pairs % n_symbols
+    pair_margin = np.empty(len(pairs))
+    for i, name in enumerate(ASSET_CLASSES):
+        in_class = ASSET_CLASS[pair_symbol] == i
+        pair_margin[in_class] = tiered_margin(pair_notional[in_class], *tiers[name])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(pair_notional[inverse] > 0, notional / pair_notional[inverse], 0.0)
+        leverage = pair_notional / pair_margin
+    to_account = conversion_rates(TIER_CURRENCY, account_currency, prices)[0]
+    notional, pair_notional, pair_margin = notional * to_account, pair_notional * to_account, pair_margin * to_account
+    position_margin = pair_margin[inverse] * share
+    return {
+        "notional": notional,
+        "margin": position_margin,
+        "pairs": pd.DataFrame({
+            "account": accounts[pairs // n_symbols],
+            "symbol": np.asarray(SYMBOLS, dtype=object)[pair_symbol],
+            "notional": pair_notional,
+            "margin": pair_margin,
+            "effective_leverage": leverage,
+        }),
+        "accounts": pd.Series(np.bincount(codes, weights=position_margin, minlength=len(accounts)),
+                              index=accounts, name="margin"),
+    }
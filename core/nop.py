@@ -0,0 +1,28 @@
+# 净持仓（NOP）= 多头总量 − 空头总量（按品种）
+import numpy as np
+import pandas as pd
+
+from core.account import LONG, direction_sign
+
+HIGH_NOP_THRESHOLD = 1_000_000
+FULLY_HEDGED, NET_LONG, NET_SHORT = "fully_hedged", "net_long", "net_short"
+
+
+def nop_status(nop):
+    """Classify NOP values as fully hedged, net long or net short."""
+    nop = np.asarray(nop)
+    status = np.where(nop > 0, NET_LONG, np.where(nop < 0, NET_SHORT, FULLY_HEDGED))
+    return status[()] if status.ndim == 0 else status
+
+
+def net_open_positions(product, direction, size):
+    """Aggregate long/short size and NOP per product from order columns."""
+    frame = pd.DataFrame({"product": np.asarray(product), "size": np.asarray(size, dtype=float)})
+    is_long = direction_sign(direction) == LONG
+    frame["longs"] = np.where(is_long, frame["size"], 0.0)
+    frame["shorts"] = np.where(is_long, 0.0, frame["size"])
+    summary = frame.groupby("product", sort=False)[["longs", "shorts"]].sum().reset_index()
+    summary["nop"] = summary["longs"] - summary["shorts"]
+    summary["status"] = nop_status(summary["nop"].to_numpy())
+    summary["high_nop"] = summary["nop"].abs() >= HIGH_NOP_THRESHOLD
+    return summary
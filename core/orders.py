@@ -0,0 +1,200 @@
+# 列式订单簿：定型 NumPy 列，品种存注册表 id、方向存 int8；Balance & Equity、Short & Long 页面共用一份，NOP 页面读取它并以同一 schema 另存本页订单
+import numpy as np
+
+from core.account import RunningAccount, direction_sign, evaluate_orders
+from core.instruments import SYMBOLS, CONTRACT_SIZE, MARGIN_RATE, require_symbol_ids
+from core.rates import quote_to_account
+
+# 订单簿的唯一 schema：列名 -> dtype
+ORDER_SCHEMA = {
+    "symbol": np.int16,          # core.instruments 中的品种 id
+    "direction": np.int8,        # LONG = 1, SHORT = -1
+    "size": np.float64,          # 手数；NOP 页面按单位录入时 contract_size = 1
+    "contract_size": np.float64,
+    "entry_price": np.float64,   # 未录入价格的订单为 NaN，只计入敞口
+    "current_price": np.float64,
+    "margin_rate": np.float64,   # 百分比
+    "to_account": np.float64,    # 报价货币 → 账户货币的汇率（见 set_account_currency）；未设置账户货币时为 1
+}
+
+# 订单导入/导出文件的列名 -> 订单簿列；缺少的可选列按注册表默认值补齐
+ORDER_FILE_COLUMNS = {
+    "Instrument": "symbol",
+    "Direction": "direction",
+    "Position Size": "size",
+    "Contract Size": "contract_size",
+    "Entry Price": "entry_price",
+    "Current Price": "current_price",
+    "Margin Rate": "margin_rate",
+}
+ORDER_FILE_DTYPES = {
+    "Instrument": str,
+    "Direction": str,
+    "Position Size": np.float64,
+    "Contract Size": np.float64,
+    "Entry Price": np.float64,
+    "Current Price": np.float64,
+    "Margin Rate": np.float64,
+}
+
+
+def encode_direction(direction):
+    """Directions (labels, booleans or signed numbers) → int8 LONG / SHORT; raises on unknown labels."""
+    return direction_sign(np.atleast_1d(np.asarray(direction))).astype(np.int8)
+
+
+class OrderStore:
+    """Growable columnar order book with O(1) amortized append.
+
+    Columns are read through `store[name]` as read-only views (no copy). A
+    RunningAccount in `store.account` is kept in step with every change; once an
+    account currency is set, its floating P/L and used margin are in that currency.
+    """
+
+    def __init__(self, capacity=64):
+        self._columns = {name: np.empty(capacity, dtype) for name, dtype in ORDER_SCHEMA.items()}
+        self._size = 0
+        self.account = RunningAccount()
+        self.account_currency = None
+        self.quotes = None  # 换算所用的报价快照：每个品种一个价格（core.rates.quote_snapshot）
+
+    @classmethod
+    def from_frame(cls, frame, columns=ORDER_FILE_COLUMNS, **defaults):
+        """Build a store from an imported table; `columns` maps file columns → `extend` arguments.
+
+        Symbol, direction and size are required (KeyError when missing); `defaults`
+        fill arguments the file does not provide.
+        """
+        values = dict(defaults)
+        values.update({field: frame[name].to_numpy() for name, field in columns.items() if name in frame.columns})
+        missing = [name for name, field in columns.items() if field in ("symbol", "direction", "size") and field not in values]
+        if missing:
+            raise KeyError(f"Missing columns: {', '.join(missing)}")
+        store = cls(capacity=max(len(frame), 64))
+        return store.extend(**values) if len(frame) else store
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, name):
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def symbols(self):
+        """Instrument names of all orders."""
+        return np.asarray(SYMBOLS, dtype=object)[self["symbol"]]
+
+    def _account_columns(self, rows=slice(None)):
+        return (self["direction"][rows], self["size"][rows], self["contract_size"][rows],
+                self["entry_price"][rows], self["current_price"][rows], self["margin_rate"][rows])
+
+    def _to_account(self, sid):
+        if self.account_currency is None:
+            return np.ones(len(sid))
+        return quote_to_account(sid, self.account_currency, self.quotes)
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._columns["size"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def extend(self, symbol, direction, size, contract_size=None, entry_price=np.nan, current_price=np.nan,
+               margin_rate=None):
+        """Append orders from equal-length columns (scalars broadcast).
+
+        Contract size and margin rate default to the instrument registry; unknown
+        instruments raise KeyError and unknown direction labels raise ValueError.
+        """
+        sid = require_symbol_ids(np.atleast_1d(np.asarray(symbol, dtype=object)))
+        n = len(sid)
+        values = {
+            "symbol": sid,
+            "direction": np.broadcast_to(encode_direction(direction), n),
+            "size": np.broadcast_to(np.asarray(size, dtype=float), n),
+            "contract_size": self._with_default(contract_size, CONTRACT_SIZE[sid], n),
+            "entry_price": np.broadcast_to(np.asarray(entry_price, dtype=float), n),
+            "current_price": np.broadcast_to(np.asarray(current_price, dtype=float), n),
+            "margin_rate": self._with_default(margin_rate, MARGIN_RATE[sid], n),
+            "to_account": self._to_account(sid),
+        }
+        self._reserve(n)
+        rows = slice(self._size, self._size + n)
+        for name, column in self._columns.items():
+            column[rows] = values[name]
+        self._size += n
+        self.account.add(*self._account_columns(rows), self["to_account"][rows])
+        return self
+
+    @staticmethod
+    def _with_default(values, default, n):
+        if values is None:
+            return default
+        values = np.broadcast_to(np.asarray(values, dtype=float), n)
+        return np.where(np.isnan(values), default, values)
+
+    def append(self, symbol, direction, size, contract_size=None, entry_price=np.nan, current_price=np.nan,
+               margin_rate=None):
+        """Append one order; returns its row index."""
+        self.extend(symbol, direction, size, contract_size, entry_price, current_price, margin_rate)
+        return self._size - 1
+
+    def remove(self, rows):
+        """Delete the given row indices (the remaining rows keep their order)."""
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        if rows.size == 0:
+            return self
+        self.account.remove(*self._account_columns(rows), self["to_account"][rows])
+        keep = np.ones(self._size, dtype=bool)
+        keep[rows] = False
+        remaining = int(keep.sum())
+        for column in self._columns.values():
+            column[:remaining] = column[:self._size][keep]
+        self._size = remaining
+        return self
+
+    def set_price(self, row, price):
+        """Update one order's current price."""
+        columns = self._account_columns(row)
+        self.account.reprice(*columns[:4], columns[4], price, columns[5], self["to_account"][row])
+        self._columns["current_price"][row] = price
+        return self
+
+    def set_account_currency(self, account_currency, quotes):
+        """Keep the running totals in `account_currency`, converted at the `quotes` snapshot.
+
+        `quotes` holds one price per symbol (core.rates.quote_snapshot). The rates and
+        totals are recomputed only when the currency or the snapshot changes.
+        """
+        quotes = np.asarray(quotes, dtype=float)
+        if (account_currency == self.account_currency and self.quotes is not None
+                and np.array_equal(quotes, self.quotes, equal_nan=True)):
+            return self
+        self.account_currency, self.quotes = account_currency, quotes.copy()
+        self._columns["to_account"][:self._size] = self._to_account(self["symbol"])
+        self.account = RunningAccount.from_columns(*self._account_columns(), self["to_account"])
+        return self
+
+    def account_contract_size(self):
+        """Contract sizes × quote → account rate: P/L and margin computed from them are in the account currency."""
+        return self["contract_size"] * self["to_account"]
+
+    def clear(self):
+        """Remove every order."""
+        self._size = 0
+        self.account = RunningAccount()
+        return self
+
+    def evaluate(self):
+        """Per-order floating P/L, used margin (quote currency) and exposure (see core.account.evaluate_orders)."""
+        return evaluate_orders(*self._account_columns())
+
+    def verify(self):
+        """Check the running account totals against a full recompute (resyncs on drift)."""
+        return self.account.verify(self.evaluate(), to_account=self["to_account"])
@@ -0,0 +1,112 @@
+# 交叉汇率矩阵：由各品种报价经 USD 三角换算出任意两种货币（及标的）之间的汇率，按报价快照缓存；
+# 在此之上提供按账户货币换算的盈亏与点值
+from functools import lru_cache
+
+import numpy as np
+
+from core.instruments import (SYMBOLS, ASSET_CLASS, ASSET_CLASSES, BASE_CURRENCY, QUOTE_CURRENCY, CONTRACT_SIZE, PIP_SIZE,
+                              SYMBOL_INDEX)
+
+# 货币 / 标的代码，USD 在首位
+CURRENCIES = tuple(dict.fromkeys(("USD",) + tuple(QUOTE_CURRENCY) + tuple(BASE_CURRENCY)))
+CURRENCY_INDEX = {code: i for i, code in enumerate(CURRENCIES)}
+# 可作为账户货币的法币：外汇品种出现过的货币
+_FX = ASSET_CLASS == ASSET_CLASSES.index("fx")
+ACCOUNT_CURRENCIES = tuple(dict.fromkeys(("USD",) + tuple(BASE_CURRENCY[_FX]) + tuple(QUOTE_CURRENCY[_FX])))
+_BASE = np.array([CURRENCY_INDEX[c] for c in BASE_CURRENCY])
+_QUOTE = np.array([CURRENCY_INDEX[c] for c in QUOTE_CURRENCY])
+
+# 没有实时报价时使用的参考价（中间价）
+REFERENCE_QUOTES = {
+    "Gold (XAUUSD)": 2300.0, "Silver (XAGUSD)": 27.0, "Oil (WTI)": 78.0, "Index (S&P 500)": 5200.0,
+    "EUR/USD": 1.08, "GBP/USD": 1.27, "USD/JPY": 155.0, "AUD/USD": 0.66, "USD/CHF": 0.91, "USD/CAD": 1.37,
+    "NZD/USD": 0.60, "EUR/JPY": 167.4, "GBP/JPY": 196.9, "EUR/GBP": 0.85,
+    "BTC/USD": 65000.0, "ETH/USD": 3200.0, "BNB/USD": 580.0, "XRP/USD": 0.52, "LTC/USD": 85.0,
+}
+
+
+def quote_snapshot(quotes=None, reference=True):
+    """Per-symbol mid prices (array over the registry, NaN when unknown).
+
+    `quotes` maps symbol names or aliases to prices and overrides the reference
+    quotes (or fills an empty snapshot when `reference` is False).
+    """
+    prices = np.full(len(SYMBOLS), np.nan)
+    if reference:
+        for name, price in REFERENCE_QUOTES.items():
+            prices[SYMBOL_INDEX[name]] = price
+    for name, price in (quotes or {}).items():
+        if name in SYMBOL_INDEX and np.isfinite(price) and price > 0:
+            prices[SYMBOL_INDEX[name]] = price
+    return prices
+
+
+def usd_values(prices):
+    """USD value of one unit of every code in CURRENCIES, triangulated from per-symbol prices.
+
+    Each pass prices codes quoted against an already valued code (base from quote, or
+    quote from base), so crosses such as EUR/GBP resolve once GBP is known. Codes
+    that cannot be reached stay NaN.
+    """
+    prices = np.asarray(prices, dtype=float)
+    quoted = np.isfinite(prices) & (prices > 0)
+    value = np.full(len(CURRENCIES), np.nan)
+    value[CURRENCY_INDEX["USD"]] = 1.0
+    while True:
+        known = np.isfinite(value)
+        from_quote = quoted & known[_QUOTE] & ~known[_BASE]
+        from_base = quoted & known[_BASE] & ~known[_QUOTE]
+        if not (from_quote.any() or from_base.any()):
+            return value
+        # 同一货币有多条路径时取第一个品种给出的值
+        value[_BASE[from_quote][::-1]] = (prices * value[_QUOTE])[from_quote][::-1]
+        value[_QUOTE[from_base][::-1]] = (value[_BASE] / np.where(quoted, prices, 1.0))[from_base][::-1]
+
+
+@lru_cache(maxsize=16)
+def _cached_matrix(snapshot):
+    value = usd_values(np.frombuffer(snapshot))
+    matrix = value[:, None] / value[None, :]
+    matrix.setflags(write=False)
+    return matrix
+
+
+def rate_matrix(prices):
+    """Cross-rate matrix R with R[i, j] = units of CURRENCIES[j] per unit of CURRENCIES[i].
+
+    Cached per quote snapshot (the exact per-symbol price array); read-only.
+    """
+    return _cached_matrix(np.ascontiguousarray(prices, dtype=np.float64).tobytes())
+
+
+def conversion_rates(codes, to_currency, prices):
+    """Rates converting amounts in each of `codes` into `to_currency` (vectorized)."""
+    index = np.array([CURRENCY_INDEX[c] for c in np.atleast_1d(np.asarray(codes, dtype=object))], dtype=np.int64)
+    return rate_matrix(prices)[index, CURRENCY_INDEX[to_currency]]
+
+
+def quote_to_account(symbol, account_currency, prices):
+    """Rate converting each symbol id's quote currency into `account_currency` (one code, or one per symbol id)."""
+    # 每行一个账户货币时（多账户快照）先对货币去重再查表
+    codes, inverse = np.unique(np.asarray(account_currency, dtype=object).astype(str), return_inverse=True)
+    unknown = [code for code in codes if code not in CURRENCY_INDEX]
+    if unknown:
+        raise KeyError(f"Unknown currencies: {', '.join(unknown)}")
+    account = np.array([CURRENCY_INDEX[code] for code in codes], dtype=np.int64)[inverse].reshape(np.shape(account_currency))
+    return rate_matrix(prices)[_QUOTE[np.asarray(symbol, dtype=np.int64)], account]
+
+
+def convert_pnl(symbol, pnl, account_currency, prices):
+    """P/L in each symbol id's quote currency → `account_currency` (vectorized)."""
+    return np.asarray(pnl, dtype=float) * quote_to_account(symbol, account_currency, prices)
+
+
+def pip_values(symbol, lots, account_currency, prices, contract_size=None):
+    """Value of a one-pip move per position, in `account_currency`.
+
+    pip size × lots × contract size (registry default) in the quote currency,
+    converted with the cross-rate matrix of the `prices` snapshot.
+    """
+    symbol = np.asarray(symbol, dtype=np.int64)
+    contract_size = CONTRACT_SIZE[symbol] if contract_size is None else contract_size
+    return convert_pnl(symbol, PIP_SIZE[symbol] * np.multiply(lots, contract_size), account_currency, prices)
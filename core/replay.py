@@ -0,0 +1,223 @@
+# 报价回放：逐笔按市价重估订单簿，只更新受该品种影响的 (账户, 品种) 持仓，输出保证金比率穿越阈值的事件
+import numpy as np
+import pandas as pd
+
+from core.account import LONG, direction_sign, margin_level
+from core.instruments import SYMBOLS, symbol_ids
+from core.stress import MARGIN_CALL_LEVEL, STOP_OUT_LEVEL
+from core.ticks import DEFAULT_CHUNKSIZE, iter_tick_chunks
+
+MARGIN_LEVELS = (300.0, MARGIN_CALL_LEVEL, STOP_OUT_LEVEL)  # %，最后一档为强平线
+DOWN, UP = "down", "up"
+
+
+class MarginReplay:
+    """Mark a book to market tick by tick and report margin-level threshold crossings.
+
+    Positions of the same account and symbol are folded into one (account, symbol)
+    pair whose P/L and margin are linear in bid (longs) and ask (shorts); pairs are
+    stored grouped by symbol, so a tick only touches the pairs holding its symbol.
+    Until a symbol's first tick its positions keep their own current price. With
+    `liquidate`, an account crossing the stop-out level is closed at that tick: its
+    floating P/L is realized into the balance and its positions are dropped.
+    P/L and margin are multiplied by `to_account` (quote → account currency rate,
+    scalar or per order) so they add up with the balance.
+    """
+
+    def __init__(self, symbol, direction, size, contract_size, entry_price, current_price, margin_rate,
+                 balance, account=None, levels=MARGIN_LEVELS, liquidate=True, to_account=1.0):
+        symbol = np.asarray(symbol, dtype=np.int64)
+        n = len(symbol)
+        codes, self.accounts = pd.factorize(np.zeros(n, dtype=np.int64) if account is None else np.asarray(account))
+        if account is None and n == 0:
+            self.accounts = pd.Index([0])
+        k, s = len(self.accounts), len(SYMBOLS)
+        self.levels = np.sort(np.asarray(levels, dtype=float))[::-1]
+        self.liquidate = liquidate
+
+        entry = np.asarray(entry_price, dtype=float)
+        priced = np.isfinite(entry)  # 没有开仓价的订单只计入敞口，不参与重估
+        # 盈亏与保证金按账户货币计：数量乘以报价货币 → 账户货币汇率
+        exposure = np.where(priced, np.multiply(np.asarray(size, dtype=float), contract_size) * to_account, 0.0)
+        rate = np.asarray(margin_rate, dtype=float) / 100
+        is_long = direction_sign(direction) == LONG
+        mark = np.where(np.isfinite(current_price), current_price, entry)
+
+        # (品种, 账户) 对按品种排序：每个品种的持仓对是连续的一段
+        pairs, inverse = np.unique(symbol * k + codes, return_inverse=True)
+        self._pair_symbol = pairs // k
+        self._pair_account = pairs % k
+        self._symbol_start = np.searchsorted(self._pair_symbol, np.arange(s + 1))
+
+        def per_pair(weights):
+            return np.bincount(inverse, weights=np.nan_to_num(weights), minlength=len(pairs))
+
+        self._long_exposure = per_pair(np.where(is_long, exposure, 0.0))
+        self._short_exposure = per_pair(np.where(is_long, 0.0, exposure))
+        self._long_cost = per_pair(np.where(is_long, exposure * entry, 0.0))
+        self._short_cost = per_pair(np.where(is_long, 0.0, exposure * entry))
+        self._long_margin = per_pair(np.where(is_long, exposure * rate, 0.0))
+        self._short_margin = per_pair(np.where(is_long, 0.0, exposure * rate))
+        self._pair_floating = per_pair(np.where(is_long, 1, -1) * exposure * (mark - entry))
+        self._pair_margin = per_pair(exposure * rate * mark)
+
+        if np.isscalar(balance):
+            self.balance = np.full(k, float(balance))
+        else:
+            self.balance = pd.Series(balance, dtype=float).reindex(self.accounts).to_numpy(copy=True)
+        self.floating = np.bincount(self._pair_account, weights=self._pair_floating, minlength=k)
+        self.used_margin = np.bincount(self._pair_account, weights=self._pair_margin, minlength=k)
+        self._zone = self._zones(margin_level(self.balance + self.floating, self.used_margin))
+        self.bid = np.full(s, np.nan)
+        self.ask = np.full(s, np.nan)
+        self.ticks = 0
+
+    @classmethod
+    def from_store(cls, store, balance, **options):
+        """Replay the single-account book held in a core.orders.OrderStore."""
+        return cls(store["symbol"], store["direction"], store["size"], store["contract_size"],
+                   store["entry_price"], store["current_price"], store["margin_rate"], balance,
+                   to_account=store["to_account"], **options)
+
+    def _zones(self, level):
+        # 0 = 高于所有阈值；i = 低于第 i 个（由高到低排列的）阈值
+        return (np.asarray(level)[..., None] < self.levels).sum(axis=-1)
+
+    def _pair_values(self, pair, bid, ask):
+        floating = (self._long_exposure[pair] * bid - self._long_cost[pair]
+                    + self._short_cost[pair] - self._short_exposure[pair] * ask)
+        margin = self._long_margin[pair] * bid + self._short_margin[pair] * ask
+        return floating, margin
+
+    def _segment(self, sid, bid, ask):
+        # 展开为 (tick, 受影响的持仓对) 行，按 tick 顺序
+        counts = np.diff(self._symbol_start)[sid]
+        row = np.repeat(np.arange(len(sid)), counts)
+        offset = np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair = self._symbol_start[sid][row] + offset
+        floating, margin = self._pair_values(pair, bid[row], ask[row])
+
+        # 相对同一持仓对上一次估值的增量，再按账户累加
+        by_pair = pd.DataFrame({"pair": pair, "floating": floating, "margin": margin}).groupby("pair", sort=False)
+        prev_floating = by_pair["floating"].shift(1).to_numpy()
+        first = np.isnan(prev_floating)
+        prev_floating = np.where(first, self._pair_floating[pair], prev_floating)
+        prev_margin = np.where(first, self._pair_margin[pair], by_pair["margin"].shift(1).to_numpy())
+        account = self._pair_account[pair]
+        deltas = pd.DataFrame({"account": account, "floating": floating - prev_floating, "margin": margin - prev_margin})
+        running = deltas.groupby("account", sort=False)[["floating", "margin"]].cumsum()
+        account_floating = self.floating[account] + running["floating"].to_numpy()
+        account_margin = self.used_margin[account] + running["margin"].to_numpy()
+        equity = self.balance[account] + account_floating
+        level = margin_level(equity, account_margin)
+        zone = self._zones(level)
+        prev_zone = pd.Series(zone).groupby(account, sort=False).shift(1).to_numpy()
+        prev_zone = np.where(np.isnan(prev_zone), self._zone[account], prev_zone).astype(np.int64)
+        return {
+            "row": row, "pair": pair, "account": account,
+            "pair_floating": floating, "pair_margin": margin,
+            "floating": account_floating, "used_margin": account_margin, "equity": equity,
+            "margin_level": level, "zone": zone, "prev_zone": prev_zone,
+        }
+
+    def _commit(self, seg):
+        last_pair = pd.Series(np.arange(len(seg["pair"]))).groupby(seg["pair"], sort=False).last()
+        self._pair_floating[last_pair.index] = seg["pair_floating"][last_pair.to_numpy()]
+        self._pair_margin[last_pair.index] = seg["pair_margin"][last_pair.to_numpy()]
+        last_account = pd.Series(np.arange(len(seg["account"]))).groupby(seg["account"], sort=False).last()
+        rows = last_account.to_numpy()
+        self.floating[last_account.index] = seg["floating"][rows]
+        self.used_margin[last_account.index] = seg["used_margin"][rows]
+        self._zone[last_account.index] = seg["zone"][rows]
+
+    def _close(self, accounts):
+        # 强平：浮动盈亏计入余额，清空该账户的全部持仓
+        self.balance[accounts] += self.floating[accounts]
+        self.floating[accounts] = 0.0
+        self.used_margin[accounts] = 0.0
+        self._zone[accounts] = 0
+        closed = np.isin(self._pair_account, accounts)
+        for column in (self._long_exposure, self._short_exposure, self._long_cost, self._short_cost,
+                       self._long_margin, self._short_margin, self._pair_floating, self._pair_margin):
+            column[closed] = 0.0
+
+    def _events(self, seg, timestamp, sid, stopped=None):
+        changed = np.flatnonzero(seg["zone"] != seg["prev_zone"])
+        events = []
+        for i in changed:
+            old, new = seg["prev_zone"][i], seg["zone"][i]
+            crossed = self.levels[old:new] if new > old else self.levels[new:old][::-1]
+            for threshold in crossed:
+                events.append({
+                    "timestamp": pd.Timestamp(timestamp[seg["row"][i]]),
+                    "account": self.accounts[seg["account"][i]],
+                    "symbol": SYMBOLS[sid[seg["row"][i]]],
+                    "threshold": float(threshold),
+                    "direction": DOWN if new > old else UP,
+                    "margin_level": float(seg["margin_level"][i]),
+                    "equity": float(seg["equity"][i]),
+                    "used_margin": float(seg["used_margin"][i]),
+                    "liquidated": bool(stopped is not None and stopped[i] and threshold == self.levels[-1]),
+                })
+        return events
+
+    def update(self, chunk):
+        """Consume one tick chunk (timestamp, symbol, bid, ask); return its threshold-crossing events in time order."""
+        sid = symbol_ids(chunk["symbol"])
+        bid = chunk["bid"].to_numpy(dtype=float)
+        ask = chunk["ask"].to_numpy(dtype=float)
+        timestamp = chunk["timestamp"].to_numpy()
+        known = (sid >= 0) & np.isfinite(bid) & np.isfinite(ask)
+        sid, bid, ask, timestamp = sid[known], bid[known], ask[known], timestamp[known]
+        self.ticks += len(sid)
+        if not len(sid):
+            return []
+        last = pd.Series(np.arange(len(sid))).groupby(sid, sort=False).last()
+        self.bid[last.index] = bid[last.to_numpy()]
+        self.ask[last.index] = ask[last.to_numpy()]
+
+        seg = self._segment(sid, bid, ask)
+        stopped = None
+        if self.liquidate:
+            # 各账户互不影响：账户在首次跌破强平线的那一笔 tick 强平，只需丢弃该账户此后的行，其余账户的行保持不变
+            hits = np.flatnonzero((seg["zone"] == len(self.levels)) & (seg["prev_zone"] < len(self.levels)))
+            first = pd.Series(hits).groupby(seg["account"][hits], sort=False).first()
+            stop_at = np.full(len(self.accounts), len(seg["row"]))
+            stop_at[first.index] = first.to_numpy()
+            position = np.arange(len(seg["row"]))
+            keep = position <= stop_at[seg["account"]]
+            seg = {name: values[keep] for name, values in seg.items()}
+            stopped = position[keep] == stop_at[seg["account"]]
+        events = self._events(seg, timestamp, sid, stopped)
+        self._commit(seg)
+        if stopped is not None and stopped.any():
+            self._close(np.unique(seg["account"][stopped]))
+        return events
+
+    def marks(self, symbol, direction):
+        """Latest replayed close price per position: bid for longs, ask for shorts (NaN before the first tick)."""
+        symbol = np.asarray(symbol, dtype=np.int64)
+        return np.where(direction_sign(direction) == LONG, self.bid[symbol], self.ask[symbol])
+
+    def summary(self):
+        """Current balance, floating P/L, equity, used margin and margin level per account."""
+        equity = self.balance + self.floating
+        return pd.DataFrame({
+            "account": self.accounts,
+            "balance": self.balance,
+            "floating": self.floating,
+            "equity": equity,
+            "used_margin": self.used_margin,
+            "margin_level": margin_level(equity, self.used_margin),
+        })
+
+
+def margin_events(chunks, replay):
+    """Generator stage: map tick chunks to margin threshold-crossing events (see MarginReplay)."""
+    for chunk in chunks:
+        yield from replay.update(chunk)
+
+
+def replay_tick_file(source, replay, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Stream a tick file through `replay`, yielding its margin events as they occur."""
+    return margin_events(iter_tick_chunks(source, chunksize, columns), replay)
@@ -0,0 +1,142 @@
+# 风险评级（1–5）与 A-Book / B-Book / MM-Stream / Monitor 路由建议
+import numpy as np
+
+RISK_UP = {
+    "scalper": 0.6, "ultra short trader": 0.7, "martingale": 1.3, "arbitrage": 1.0,
+    "stacking": 0.7, "fast TP": 0.5, "system spam orders": 0.9, "first two abnormal": 0.5,
+    "changing trading behaviour": 0.4, "changing EA": 0.4, "increasing trading size": 0.6,
+    "AML": 1.6, "abnormal funding": 1.1, "large order": 0.8, "medium order": 0.4,
+    "pending order": 0.2, "Day trade": 0.3, "copy trade": 0.6
+}
+RISK_DOWN = {
+    "hedger": -0.7, "experience trader": -0.4, "low frequency trading": -0.25,
+    "swing trader": -0.15, "holds profit/loss": -0.15, "withdraw profit": -0.15,
+    "no trade": -0.25, "inactive now": -0.35, "profiting": -0.15,
+}
+# (最小手数, 对应标签, 加分, 归因说明)，按从大到小匹配第一个
+SIZE_BUCKETS = (
+    (6, "trade 6+ lots per position", 1.2, "Size ≥6 lots → +1.2"),
+    (3, "trade 3-6 lots per position", 0.7, "Size 3–6 lots → +0.7"),
+    (1, "trade 1-3 lots per position", 0.3, "Size 1–3 lots → +0.3"),
+)
+HEAVY_WEIGHT = 0.6
+ONBOARDING_LABELS = ("new account", "delay trade activation")
+COMPLIANCE_LABELS = ("AML", "abnormal funding", "CEO flagged")
+
+
+def _has(labels, name):
+    """Label flag: `labels` is a collection of label names, or a mapping/DataFrame of bool columns."""
+    if hasattr(labels, "keys"):
+        return np.asarray(labels[name], dtype=bool) if name in labels else np.False_
+    return np.bool_(name in labels)
+
+
+def risk_score(max_profit, max_loss, avg_size, labels=(), heavy=False, recent_weight=0.7):
+    """Return (score, reasons). Reasons are only itemized for a single (scalar) client."""
+    max_profit = np.asarray(max_profit, dtype=float)
+    max_loss = np.asarray(max_loss, dtype=float)
+    avg_size = np.asarray(avg_size, dtype=float)
+    recent_weight = np.asarray(recent_weight, dtype=float)
+    score = np.zeros(np.broadcast(max_profit, max_loss, avg_size, recent_weight).shape)
+    explain = score.ndim == 0
+    reasons = []
+
+    # Profit/Loss shape
+    has_pl = (max_profit > 0) | (max_loss > 0)
+    ratio = (max_profit + 1e-9) / (max_loss + 1e-9)
+    prof_signal = 2.0 * (ratio - 1.0) / (np.abs(ratio) + 1.0)  # bounded symmetric transform
+    score = score + np.where(has_pl, prof_signal, 0.0)
+    if explain and has_pl:
+        reasons.append(f"P/L shape ratio≈{ratio:.2f} → {prof_signal:+.2f}")
+
+    # Size buckets
+    matched = np.zeros(score.shape, dtype=bool)
+    for min_lots, label, weight, note in SIZE_BUCKETS:
+        hit = ~matched & (_has(labels, label) | (avg_size >= min_lots))
+        score = score + np.where(hit, weight, 0.0)
+        matched = matched | hit
+        if explain and hit:
+            reasons.append(note)
+
+    # Risk-up / risk-down labels
+    for table, fmt in ((RISK_UP, "+{}"), (RISK_DOWN, "{}")):
+        for label, weight in table.items():
+            hit = _has(labels, label)
+            score = score + np.where(hit, weight, 0.0)
+            if explain and hit:
+                reasons.append(f"Label '{label}' → {fmt.format(weight)}")
+
+    # Heavy affects rating only
+    heavy = np.asarray(heavy, dtype=bool)
+    score = score + np.where(heavy, HEAVY_WEIGHT, 0.0)
+    if explain and heavy:
+        reasons.append(f"Heavy trader → +{HEAVY_WEIGHT} (rating influence only)")
+
+    # Recency weighting
+    score = score * (0.5 + recent_weight / 2)
+    if explain:
+        reasons.append(f"Recency weighting {recent_weight:.2f} applied")
+        score = float(score)
+    return score, reasons
+
+
+def risk_rating(score):
+    """Map a risk score to an integer rating 1–5."""
+    rating = np.clip(np.round(3 + 2 * (np.asarray(score) / 3.0)), 1, 5).astype(int)
+    return int(rating) if rating.ndim == 0 else rating
+
+
+def abook_gate(rating, max_profit, max_loss):
+    """A-Book only when rating > 3 AND Biggest Profit > Biggest Loss."""
+    return (np.asarray(rating) > 3) & (np.asarray(max_profit) > np.asarray(max_loss))
+
+
+def prefer_mm_stream(heavy, burst, avg_size, labels=()):
+    """MM-Stream heuristic: heavy with large sizes, or bursts from heavy/large traders."""
+    heavy = np.asarray(heavy, dtype=bool)
+    burst = np.asarray(burst, dtype=bool)
+    avg_size = np.asarray(avg_size, dtype=float)
+    large = (avg_size >= 3) | _has(labels, "trade 3-6 lots per position") | _has(labels, "trade 6+ lots per position")
+    return (heavy & large) | (burst & (heavy | (avg_size >= 3)))
+
+
+def needs_monitor(labels):
+    """Return (onboarding, compliance) flags for the Monitor overlay."""
+    onboarding = np.zeros((), dtype=bool)
+    for label in ONBOARDING_LABELS:
+        onboarding = onboarding | _has(labels, label)
+    compliance = np.zeros((), dtype=bool)
+    for label in COMPLIANCE_LABELS:
+        compliance = compliance | _has(labels, label)
+    return onboarding, compliance
+
+
+def suggest_route(rating, max_profit, max_loss, avg_size, labels=(), heavy=False, burst=False):
+    """Routing suggestion for one client, with the operational notes behind it."""
+    if abook_gate(rating, max_profit, max_loss):
+        base_route = "A-Book"
+        base_note = "Rating > 3 and Biggest Profit > Biggest Loss → route to A-Book."
+    else:
+        base_route = "B-Book"
+        if rating > 3 and not (max_profit > max_loss):
+            base_note = "Rating > 3 but Biggest Profit ≤ Biggest Loss → stay in B-Book."
+        else:
+            base_note = "Rating ≤ 3 → stay in B-Book."
+
+    op_notes = [base_note]
+    onboarding, compliance = needs_monitor(labels)
+    if onboarding:
+        op_notes.append("Onboarding: add Monitor.")
+    if compliance:
+        op_notes.append("Compliance flags: add Monitor.")
+    if burst and base_route == "A-Book":
+        op_notes.append("Burst on A-Book: verify LP depth, throttles, credit lines.")
+    elif burst:
+        op_notes.append("Burst internalized: enforce throttles/position caps/circuit breakers.")
+
+    return {
+        "base_route": base_route,
+        "prefer_mm": bool(prefer_mm_stream(heavy, burst, avg_size, labels)),
+        "need_monitor": bool(onboarding or compliance),
+        "op_notes": op_notes,
+    }
@@ -0,0 +1,45 @@
+# 按风险计算手数：账户权益 × 单笔风险比例 ÷（止损点数 × 每手点值），按注册表的手数步长与上下限取整
+import numpy as np
+import pandas as pd
+
+from core.instruments import SYMBOLS, LOT_STEP, MIN_LOT, MAX_LOT
+from core.rates import pip_values
+
+OK, BELOW_MIN, CAPPED = "ok", "below_min_lot", "capped_at_max_lot"
+
+
+def round_lots(lots, step, min_lot, max_lot):
+    """Round lots down to the lot step, capped at `max_lot`; below `min_lot` becomes 0.
+
+    Rounding is down so the rounded position never risks more than requested.
+    """
+    steps = np.floor(np.asarray(lots, dtype=float) / step + 1e-9)  # 容差避免 0.3 / 0.1 = 2.9999…
+    rounded = np.minimum(steps * step, np.floor(max_lot / step + 1e-9) * step)
+    return np.where(rounded + 1e-12 >= min_lot, np.round(rounded, 8), 0.0)
+
+
+def position_sizes(equity, risk_pct, symbol, stop_pips, account_currency, prices):
+    """Lots per watchlist row so that hitting the stop loses `risk_pct` % of equity.
+
+    `symbol` holds registry ids and `stop_pips` the stop distance of each row; pip
+    values come from the cross-rate matrix of the `prices` snapshot (core.rates).
+    One vectorized pass over the whole watchlist.
+    """
+    symbol = np.asarray(symbol, dtype=np.int64)
+    stop_pips = np.asarray(stop_pips, dtype=float)
+    risk = equity * risk_pct / 100
+    loss_per_lot = stop_pips * pip_values(symbol, 1.0, account_currency, prices)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.where(loss_per_lot > 0, risk / loss_per_lot, np.nan)
+    lots = round_lots(raw, LOT_STEP[symbol], MIN_LOT[symbol], MAX_LOT[symbol])
+    status = np.where(raw > MAX_LOT[symbol], CAPPED, np.where(lots > 0, OK, BELOW_MIN))
+    return pd.DataFrame({
+        "symbol": np.asarray(SYMBOLS, dtype=object)[symbol],
+        "stop_pips": stop_pips,
+        "loss_per_lot": loss_per_lot,
+        "raw_lots": raw,
+        "lots": np.where(np.isnan(raw), np.nan, lots),
+        "risk": lots * loss_per_lot,
+        "risk_pct": lots * loss_per_lot / equity * 100 if equity > 0 else np.nan,
+        "status": np.where(np.isnan(raw), None, status),
+    })
@@ -0,0 +1,161 @@
+# 可合并的点差分位数草图：按 (品种, 日期, 小时) 记录对数分桶计数，分区并行构建后相加即可合并
+import numpy as np
+import pandas as pd
+
+from core.instruments import PIP_SIZE, SYMBOLS, symbol_ids
+
+DEFAULT_ACCURACY = 0.01   # 分位数的相对误差上限（1%）
+MIN_PIPS = 1e-3           # 小于等于该值的点差（含 0 与负点差）记入零桶
+ZERO_BUCKET = -(2 ** 31)
+KEY_LEVELS = ["symbol", "day", "hour"]
+
+
+def _canonical(symbols):
+    """Map aliases (XAUUSD, Gold, ...) to registry names; unknown names are kept as given."""
+    symbols = np.asarray(symbols, dtype=object)
+    sid = symbol_ids(symbols)
+    return np.where(sid >= 0, np.asarray(SYMBOLS, dtype=object)[sid], symbols)
+
+
+class SpreadSketch:
+    """Log-bucketed spread counts per (symbol, day, hour), mergeable by addition.
+
+    Every quantile read from the sketch is within `accuracy` (relative) of an exact
+    sample quantile, while storage grows with the number of occupied buckets rather
+    than the number of ticks.
+    """
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        self.accuracy = float(accuracy)
+        self.gamma = (1 + self.accuracy) / (1 - self.accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._parts = []
+        self._counts = None
+
+    def bucket(self, spread_pips):
+        """Bucket index of each spread (ZERO_BUCKET for spreads <= MIN_PIPS)."""
+        x = np.asarray(spread_pips, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            b = np.ceil(np.log(x) / self._log_gamma)
+        return np.where(x > MIN_PIPS, b, ZERO_BUCKET).astype(np.int64)
+
+    def value(self, bucket):
+        """Representative spread (pips) of each bucket index."""
+        b = np.asarray(bucket, dtype=np.int64)
+        return np.where(b == ZERO_BUCKET, 0.0, 2 * self.gamma ** b.astype(float) / (self.gamma + 1))
+
+    def update(self, timestamp, symbol, spread_pips):
+        """Add spreads (pips) observed at `timestamp` for `symbol` (equal-length columns)."""
+        ts = pd.DatetimeIndex(timestamp)
+        part = pd.Series(1, index=pd.MultiIndex.from_arrays(
+            [_canonical(symbol), ts.normalize(), ts.hour.astype(np.int8), self.bucket(spread_pips)],
+            names=KEY_LEVELS + ["bucket"]))
+        self._parts.append(part.groupby(level=[0, 1, 2, 3], sort=False).sum())
+        self._counts = None
+        return self
+
+    def update_ticks(self, chunk):
+        """Add a raw tick chunk (timestamp, symbol, bid, ask); unknown symbols are skipped."""
+        sid = symbol_ids(chunk["symbol"])
+        known = sid >= 0
+        pips = (chunk["ask"].to_numpy(dtype=float) - chunk["bid"].to_numpy(dtype=float))[known] / PIP_SIZE[sid[known]]
+        return self.update(chunk["timestamp"].to_numpy()[known], chunk["symbol"].to_numpy()[known], pips)
+
+    def merge(self, other):
+        """Fold another sketch (e.g. from a parallel partition) into this one."""
+        if other.accuracy != self.accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self._parts.append(other.counts)
+        self._counts = None
+        return self
+
+    @property
+    def counts(self):
+        """Bucket counts as a Series indexed by (symbol, day, hour, bucket)."""
+        if self._counts is None:
+            if self._parts:
+                merged = pd.concat(self._parts).groupby(level=[0, 1, 2, 3]).sum().astype(np.int64)
+            else:
+                merged = pd.Series([], dtype=np.int64, index=pd.MultiIndex.from_arrays(
+                    [[], pd.DatetimeIndex([]), np.array([], np.int8), np.array([], np.int64)],
+                    names=KEY_LEVELS + ["bucket"]))
+            self._parts = [merged]
+            self._counts = merged
+        return self._counts
+
+    def _select(self, symbols=None, start=None, end=None, hours=None):
+        counts = self.counts
+        idx = counts.index
+        mask = np.ones(len(counts), dtype=bool)
+        if symbols is not None:
+            mask &= idx.get_level_values("symbol").isin(_canonical(list(symbols)))
+        day = idx.get_level_values("day")
+        if start is not None:
+            mask &= day >= pd.Timestamp(start)
+        if end is not None:
+            mask &= day <= pd.Timestamp(end)
+        if hours is not None:
+            mask &= idx.get_level_values("hour").isin(list(hours))
+        return counts[mask]
+
+    def quantiles(self, qs=(0.5, 0.95, 0.99), symbols=None, start=None, end=None, hours=None):
+        """Per-symbol spread quantiles (pips) over the selected days [start, end] and hours."""
+        columns = ["ticks"] + [f"p{q * 100:g}" for q in qs]
+        selected = self._select(symbols, start, end, hours)
+        if selected.empty:
+            return pd.DataFrame(columns=columns).rename_axis("symbol")
+        per_bucket = selected.groupby(level=["symbol", "bucket"]).sum().sort_index()
+        rows = {}
+        for sym, group in per_bucket.groupby(level="symbol", sort=False):
+            cum = group.to_numpy().cumsum()
+            n = cum[-1]
+            # 与 np.quantile(method="lower") 一致：取排名 floor(q·(n-1)) 的样本所在桶
+            ranks = np.floor(np.asarray(qs, dtype=float) * (n - 1)).astype(np.int64)
+            buckets = group.index.get_level_values("bucket").to_numpy()[np.searchsorted(cum, ranks, side="right")]
+            rows[sym] = [n, *self.value(buckets)]
+        return pd.DataFrame.from_dict(rows, orient="index", columns=columns).rename_axis("symbol")
+
+    def quantile(self, q, symbol, start=None, end=None, hours=None):
+        """Single spread quantile (pips) of `symbol`; NaN when nothing is selected."""
+        table = self.quantiles((q,), [symbol], start, end, hours)
+        return float(table.iloc[0, 1]) if len(table) else float("nan")
+
+    def save(self, file):
+        """Write the sketch to an .npz file (path or file-like)."""
+        idx = self.counts.index
+        np.savez_compressed(
+            file, accuracy=self.accuracy,
+            symbol=idx.get_level_values("symbol").to_numpy(dtype=str),
+            day=idx.get_level_values("day").to_numpy(dtype="datetime64[D]"),
+            hour=idx.get_level_values("hour").to_numpy(dtype=np.int8),
+            bucket=idx.get_level_values("bucket").to_numpy(dtype=np.int64),
+            count=self.counts.to_numpy(dtype=np.int64),
+        )
+
+    @classmethod
+    def load(cls, file):
+        """Read a sketch written by `save`."""
+        with np.load(file, allow_pickle=False) as data:
+            sketch = cls(float(data["accuracy"]))
+            index = pd.MultiIndex.from_arrays(
+                [data["symbol"].astype(object), pd.DatetimeIndex(data["day"].astype("datetime64[ns]")),
+                 data["hour"], data["bucket"]], names=KEY_LEVELS + ["bucket"])
+            sketch._parts = [pd.Series(data["count"], index=index)]
+        return sketch
+
+
+def merge_sketches(sketches):
+    """Merge an iterable of partition sketches into a new sketch; the inputs are not modified."""
+    sketches = list(sketches)
+    merged = SpreadSketch(sketches[0].accuracy if sketches else DEFAULT_ACCURACY)
+    for other in sketches:
+        merged.merge(other)
+    return merged
+
+
+def sketch_ticks(chunks, accuracy=DEFAULT_ACCURACY):
+    """Build a sketch from an iterable of raw tick chunks (see core.ticks.iter_tick_chunks)."""
+    sketch = SpreadSketch(accuracy)
+    for chunk in chunks:
+        sketch.update_ticks(chunk)
+    return sketch
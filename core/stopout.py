@@ -0,0 +1,97 @@
+# 强平价位求解：权益与保证金对价格是线性的，保证金比率触及强平线的价位有闭式解，多账户一次算完
+import numpy as np
+import pandas as pd
+
+from core.account import direction_sign, margin_level
+from core.instruments import SYMBOLS
+from core.stress import STOP_OUT_LEVEL
+
+
+def _book_sums(account, symbol, direction, size, contract_size, entry_price, current_price, margin_rate):
+    account_ids, accounts = pd.factorize(np.asarray(account, dtype=object))
+    symbol = np.asarray(symbol, dtype=np.int64)
+    sign = direction_sign(direction)
+    exposure = np.multiply(np.asarray(size, dtype=float), contract_size)
+    price = np.asarray(current_price, dtype=float)
+    rate = np.asarray(margin_rate, dtype=float) / 100
+    n_accounts, n_symbols = len(accounts), len(SYMBOLS)
+    pair = account_ids * n_symbols + symbol
+
+    def per_account(weights):
+        return np.bincount(account_ids, weights=np.nan_to_num(weights), minlength=n_accounts)
+
+    def per_pair(weights):
+        return np.bincount(pair, weights=np.nan_to_num(weights), minlength=n_accounts * n_symbols).reshape(n_accounts, n_symbols)
+
+    return accounts, {
+        "floating": per_account((price - np.asarray(entry_price, dtype=float)) * sign * exposure),
+        "margin": per_account(exposure * price * rate),
+        # 单一品种价格每变动 1 个价格单位，浮盈与保证金的变化量
+        "pnl_per_price": per_pair(sign * exposure),
+        "margin_per_price": per_pair(exposure * rate),
+        # 全部品种同时变动 100% 时的变化量
+        "pnl_per_move": per_account(sign * exposure * price),
+        "margin_per_move": per_account(exposure * price * rate),
+        "exposure": per_pair(exposure),
+        "exposure_value": per_pair(exposure * price),
+    }
+
+
+def _balances(balance, accounts):
+    if np.isscalar(balance):
+        return np.full(len(accounts), float(balance))
+    return pd.Series(balance, dtype=float).reindex(accounts).to_numpy()
+
+
+def stop_out_prices(account, symbol, direction, size, contract_size, entry_price, current_price, margin_rate,
+                    balance, stop_out_level=STOP_OUT_LEVEL):
+    """Price of each (account, symbol) at which margin level hits `stop_out_level`, other prices fixed.
+
+    Solves balance + floating + a·d = L·(margin + b·d) for the price move d, where a
+    and b are the account's P/L and margin per unit price of that symbol. `balance`
+    is a scalar or a mapping account → balance. Moves that would need a negative
+    price (or never cross) are NaN.
+    """
+    accounts, sums = _book_sums(account, symbol, direction, size, contract_size, entry_price, current_price, margin_rate)
+    level = stop_out_level / 100
+    equity = _balances(balance, accounts) + sums["floating"]
+    gap = level * sums["margin"] - equity                      # (K,)
+    slope = sums["pnl_per_price"] - level * sums["margin_per_price"]  # (K, S)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move = gap[:, None] / slope
+        reference = sums["exposure_value"] / sums["exposure"]   # 按敞口加权的当前价
+    target = reference + move
+    move = np.where(np.isfinite(move) & (target > 0), move, np.nan)
+
+    k, s = np.nonzero(sums["exposure"] != 0)
+    return pd.DataFrame({
+        "account": accounts[k],
+        "symbol": np.asarray(SYMBOLS, dtype=object)[s],
+        "price": reference[k, s],
+        "stop_out_price": reference[k, s] + move[k, s],
+        "move": move[k, s],
+        "move_pct": move[k, s] / reference[k, s] * 100,
+    })
+
+
+def uniform_stop_out(account, symbol, direction, size, contract_size, entry_price, current_price, margin_rate,
+                     balance, stop_out_level=STOP_OUT_LEVEL):
+    """Per-account uniform % move of every price that brings margin level to `stop_out_level`.
+
+    Accounts are ranked by the size of that move (closest to liquidation first).
+    """
+    accounts, sums = _book_sums(account, symbol, direction, size, contract_size, entry_price, current_price, margin_rate)
+    level = stop_out_level / 100
+    equity = _balances(balance, accounts) + sums["floating"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move = (level * sums["margin"] - equity) / (sums["pnl_per_move"] - level * sums["margin_per_move"])
+    move = np.where(np.isfinite(move) & (move > -1), move, np.nan)
+    result = pd.DataFrame({
+        "account": accounts,
+        "equity": equity,
+        "used_margin": sums["margin"],
+        "margin_level": margin_level(equity, sums["margin"]),
+        "stop_out_move_pct": move * 100,
+    })
+    result["distance"] = result["stop_out_move_pct"].abs()
+    return result.sort_values("distance", na_position="last").drop(columns="distance").reset_index(drop=True)
@@ -0,0 +1,60 @@
+# 价格冲击压力测试：按品种的相对价格冲击网格，一次广播算出权益、可用保证金与保证金比率
+import numpy as np
+
+from core.account import direction_sign, margin_level
+from core.instruments import SYMBOLS
+
+MARGIN_CALL_LEVEL = 100.0  # %
+STOP_OUT_LEVEL = 50.0      # %
+SAFE, MARGIN_CALL, STOP_OUT = "safe", "margin_call", "stop_out"
+
+
+def shock_grid(max_shock=0.20, steps=200):
+    """`steps` relative price shocks evenly spaced over [-max_shock, +max_shock]."""
+    return np.linspace(-max_shock, max_shock, steps)
+
+
+def correlated_loadings(lead, correlations, n_symbols=len(SYMBOLS)):
+    """Loadings (len(correlations) × n_symbols): the lead symbol moves 1:1, every other symbol by ρ."""
+    correlations = np.asarray(correlations, dtype=float)
+    loadings = np.repeat(correlations[:, None], n_symbols, axis=1)
+    loadings[:, lead] = 1.0
+    return loadings
+
+
+def symbol_sensitivities(symbol, direction, size, contract_size, current_price, margin_rate, n_symbols=len(SYMBOLS)):
+    """Per-symbol change in floating P/L and used margin for a +100% price move.
+
+    Both are linear in the price, so one bincount over the order table gives
+    everything the stress grid needs. Orders without a price contribute nothing.
+    """
+    value = np.multiply(np.asarray(size, dtype=float), contract_size) * np.asarray(current_price, dtype=float)
+    pnl = np.nan_to_num(direction_sign(direction) * value)
+    margin = np.nan_to_num(value * (np.asarray(margin_rate, dtype=float) / 100))
+    symbol = np.asarray(symbol, dtype=np.int64)
+    return (np.bincount(symbol, weights=pnl, minlength=n_symbols),
+            np.bincount(symbol, weights=margin, minlength=n_symbols))
+
+
+def stress_grid(balance, floating, used_margin, pnl_sensitivity, margin_sensitivity, shocks, loadings,
+                stop_out_level=STOP_OUT_LEVEL):
+    """Equity, free margin, margin level and zone for every (loading row, shock) pair.
+
+    Scenario prices are current × (1 + shock × loading[symbol]); results have shape
+    (len(loadings), len(shocks)).
+    """
+    shocks = np.asarray(shocks, dtype=float)
+    loadings = np.atleast_2d(loadings)
+    pnl_per_shock = loadings @ pnl_sensitivity          # (R,)
+    margin_per_shock = loadings @ margin_sensitivity    # (R,)
+    equity = balance + floating + pnl_per_shock[:, None] * shocks[None, :]
+    margin = np.maximum(used_margin + margin_per_shock[:, None] * shocks[None, :], 0.0)
+    level = margin_level(equity, margin)
+    zone = np.where(level < stop_out_level, STOP_OUT, np.where(level < MARGIN_CALL_LEVEL, MARGIN_CALL, SAFE))
+    return {
+        "equity": equity,
+        "free_margin": equity - margin,
+        "used_margin": margin,
+        "margin_level": level,
+        "zone": zone,
+    }
@@ -0,0 +1,212 @@
+# 隔夜利息（swap）计提：按品种类别的结算周期与节假日历，用工作日运算精确统计开平仓之间的展期次数与计息天数
+#
+# 每次展期（交易日 d 的结算时刻）把起息日从 value(d) 推到 value(d 的下一个工作日)，计息天数为两者相差的自然日；
+# value(d) = d 之后第 SETTLEMENT_DAYS 个工作日。外汇 / 金属 / 能源 / 指数按 T+2 结算，周三展期跨过周末，计 3 天；
+# 加密货币按 T+0，周五计 3 天。节假日同样从起息日中跳过，假期前的展期自动多计天数。
+# 费率按 (品种, 方向, 生效日) 分版本保存，成交记录批量按 as-of 取费率计提。
+import numpy as np
+import pandas as pd
+
+from core.account import direction_sign, LONG
+from core.files import read_table
+from core.instruments import ASSET_CLASS, ASSET_CLASSES, SYMBOLS, require_symbol_ids
+
+SETTLEMENT_DAYS = np.array([{"crypto": 0}.get(name, 2) for name in ASSET_CLASSES], dtype=np.int64)
+WEEKMASK = "Mon Tue Wed Thu Fri"
+ROLLOVER_TIME = np.timedelta64(17, "h")  # 纽约收盘 17:00；时间戳与之同一时区
+HOLIDAYS = ()  # 默认不设假日；页面与批处理可传入券商公布的日历
+
+
+def business_calendar(holidays=HOLIDAYS):
+    """numpy business-day calendar over WEEKMASK with the given holiday dates."""
+    return np.busdaycalendar(weekmask=WEEKMASK, holidays=np.asarray(holidays, dtype="datetime64[D]"))
+
+
+def parse_holidays(text):
+    """Holiday dates from comma / whitespace separated YYYY-MM-DD text; raises ValueError."""
+    return np.array(text.replace(",", " ").split(), dtype="datetime64[D]")
+
+
+def _trade_date(timestamps, rollover_time):
+    # 时刻之后（含）的第一个展期对应的交易日：向上取整到日
+    shifted = np.asarray(timestamps, dtype="datetime64[ns]") - rollover_time
+    day = shifted.astype("datetime64[D]")
+    return day + (shifted > day).astype(np.int64)
+
+
+def _span(open_time, close_time, rollover_time):
+    # 开平仓之间的展期交易日区间 [start, end)；缺失或倒序的时间记为空区间（0 次展期）
+    start = _trade_date(open_time, rollover_time)
+    end = _trade_date(close_time, rollover_time)
+    valid = ~(np.isnat(start) | np.isnat(end)) & (end > start)
+    epoch = np.datetime64("1970-01-01", "D")
+    return np.where(valid, start, epoch), np.where(valid, end, epoch)
+
+
+def _swap_days(start, end, lag, calendar):
+    # 交易日区间 [start, end) 内的展期次数与计息天数：
+    # 相邻展期的起息日首尾相接，总天数 = 最后一次展期后的起息日 − 第一次展期前的起息日
+    count = np.busday_count(start, end, busdaycal=calendar)
+    first = np.busday_offset(start, 0, roll="forward", busdaycal=calendar)
+    days = (np.busday_offset(first, count + lag, busdaycal=calendar)
+            - np.busday_offset(first, lag, busdaycal=calendar)).astype(np.int64)
+    return count, np.where(count > 0, days, 0)
+
+
+def rollovers(symbol, open_time, close_time, holidays=HOLIDAYS, rollover_time=ROLLOVER_TIME):
+    """Number of rollovers and swap days charged between open and close, per position.
+
+    A rollover at `trade date + rollover_time` is charged when open_time <= rollover <
+    close_time and the trade date is a business day; swap days sum the value-date
+    shifts of those rollovers (so triple days come out of the settlement cycle of each
+    asset class and the holiday calendar). Positions still open take a NaT close_time
+    as no rollovers; pass the valuation moment instead. Vectorized over positions.
+    """
+    symbol = np.asarray(symbol, dtype=np.int64)
+    start, end = _span(open_time, close_time, rollover_time)
+    return _swap_days(start, end, SETTLEMENT_DAYS[ASSET_CLASS[symbol]], business_calendar(holidays))
+
+
+def accrue_swap(symbol, direction, lots, swap_long, swap_short, open_time, close_time,
+                holidays=HOLIDAYS, rollover_time=ROLLOVER_TIME):
+    """Total swap per position: lots × daily swap rate of its direction × swap days.
+
+    `swap_long` / `swap_short` are per-lot, per-day rates (positive = earned); see
+    `rollovers` for how days are counted. Batch function over whole position arrays.
+    """
+    _, days = rollovers(symbol, open_time, close_time, holidays, rollover_time)
+    rate = np.where(direction_sign(direction) == LONG, swap_long, swap_short)
+    return np.asarray(lots, dtype=float) * rate * days
+
+
+# 版本化 swap 费率：每行 = 某品种某方向自生效日起的每手每日 swap（正为收、负为付）
+SWAP_RATE_COLUMNS = ["symbol", "direction", "effective_date", "swap"]
+SWAP_RATE_DTYPES = {"symbol": str, "direction": str, "effective_date": str, "swap": np.float64}
+DEFAULT_SWAP_RATES = pd.DataFrame([
+    ("EUR/USD", "Long", "2024-01-01", -7.23), ("EUR/USD", "Short", "2024-01-01", 2.10),
+    ("AUD/USD", "Long", "2024-01-01", -4.10), ("AUD/USD", "Short", "2024-01-01", 0.90),
+    ("GBP/USD", "Long", "2024-01-01", -2.40), ("GBP/USD", "Short", "2024-01-01", -0.60),
+    ("USD/JPY", "Long", "2024-01-01", 14.50), ("USD/JPY", "Short", "2024-01-01", -24.80),
+    ("Gold (XAUUSD)", "Long", "2024-01-01", -52.00), ("Gold (XAUUSD)", "Short", "2024-01-01", 31.00),
+    ("Oil (WTI)", "Long", "2024-01-01", -9.50), ("Oil (WTI)", "Short", "2024-01-01", 2.50),
+    ("BTC/USD", "Long", "2024-01-01", -18.00), ("BTC/USD", "Short", "2024-01-01", -6.00),
+    # 2024-09-18 美联储降息 50bp 后的调整
+    ("EUR/USD", "Long", "2024-09-19", -5.80), ("EUR/USD", "Short", "2024-09-19", 1.05),
+    ("AUD/USD", "Long", "2024-09-19", -3.20), ("AUD/USD", "Short", "2024-09-19", 0.35),
+    ("GBP/USD", "Long", "2024-09-19", -1.30), ("GBP/USD", "Short", "2024-09-19", -1.20),
+    ("USD/JPY", "Long", "2024-09-19", 12.90), ("USD/JPY", "Short", "2024-09-19", -22.60),
+    ("Gold (XAUUSD)", "Long", "2024-09-19", -46.00), ("Gold (XAUUSD)", "Short", "2024-09-19", 26.00),
+    ("Oil (WTI)", "Long", "2024-09-19", -8.40), ("Oil (WTI)", "Short", "2024-09-19", 1.90),
+], columns=SWAP_RATE_COLUMNS)
+_NO_DATE = np.datetime64("9999-12-31", "D")
+
+
+def _rate_key(symbol, direction):
+    return np.asarray(symbol, dtype=np.int64) * 2 + (direction_sign(direction) == LONG)
+
+
+def _stamp(key, day):
+    # (品种方向键, 日期) 合成一个可排序的 int64，便于 searchsorted 做 as-of 查找
+    return (np.asarray(key, dtype=np.int64) << 32) + (np.asarray(day, dtype="datetime64[D]").astype(np.int64) + (1 << 31))
+
+
+class SwapRates:
+    """Versioned swap-rate store: per-lot daily swap per (symbol, direction) from an effective date on.
+
+    Immutable; `add` returns a new store with extra versions. When two rows share a
+    symbol, direction and effective date the later row wins. Lookups are as-of joins
+    done with one searchsorted over the sorted (key, date) stamps.
+    """
+
+    def __init__(self, table=DEFAULT_SWAP_RATES):
+        symbol = require_symbol_ids(table["symbol"])
+        key = _rate_key(symbol, np.asarray(table["direction"]))
+        date = pd.to_datetime(table["effective_date"]).to_numpy().astype("datetime64[D]")
+        if np.isnat(date).any():
+            raise ValueError("Missing effective_date")
+        stamp = _stamp(key, date)
+        order = np.argsort(stamp, kind="stable")
+        last = np.append(stamp[order][1:] != stamp[order][:-1], True)  # 同键同日保留最后一行
+        order = order[last]
+        self._stamp, self._key, self._date = stamp[order], key[order], date[order]
+        self._swap = np.asarray(table["swap"], dtype=float)[order]
+        same_key = np.append(self._key[1:] == self._key[:-1], False)
+        self._next = np.where(same_key, np.append(self._date[1:], _NO_DATE), _NO_DATE)
+
+    @classmethod
+    def from_file(cls, source):
+        """Load versions from a CSV / Excel / Parquet / Arrow file with SWAP_RATE_COLUMNS."""
+        return cls(read_table(source, SWAP_RATE_DTYPES))
+
+    def __len__(self):
+        return len(self._stamp)
+
+    def table(self):
+        """All versions as a frame with SWAP_RATE_COLUMNS, sorted by symbol, direction and date."""
+        return pd.DataFrame({
+            "symbol": np.asarray(SYMBOLS, dtype=object)[self._key // 2],
+            "direction": np.where(self._key % 2 == 1, "Long", "Short"),
+            "effective_date": self._date,
+            "swap": self._swap,
+        })
+
+    def add(self, table):
+        """New store with the versions in `table` added (overriding same-day versions)."""
+        current = self.table().assign(effective_date=lambda f: f["effective_date"].astype(str))
+        return SwapRates(pd.concat([current, table[SWAP_RATE_COLUMNS]], ignore_index=True))
+
+    def as_of(self, symbol, direction, dates):
+        """Swap rate in force on each date (NaN before the first version of the key)."""
+        key = _rate_key(symbol, direction)
+        index = np.searchsorted(self._stamp, _stamp(key, dates), side="right") - 1
+        found = (index >= 0) & (self._key[np.maximum(index, 0)] == key)
+        return np.where(found, self._swap[np.maximum(index, 0)], np.nan)
+
+    def accrue(self, symbol, direction, lots, open_time, close_time, holidays=HOLIDAYS, rollover_time=ROLLOVER_TIME):
+        """Rollovers, swap days and total swap per position under the versioned rates.
+
+        Each holding period is split at the effective dates of its key's versions, and
+        each piece is charged at the rate then in force (swap days as in `rollovers`).
+        Swap is NaN when some rollover precedes the key's first version.
+        """
+        symbol = np.asarray(symbol, dtype=np.int64)
+        key = _rate_key(symbol, direction)
+        start, end = _span(open_time, close_time, rollover_time)
+        lag = SETTLEMENT_DAYS[ASSET_CLASS[symbol]]
+        calendar = business_calendar(holidays)
+        count, days = _swap_days(start, end, lag, calendar)
+
+        # 每笔持仓覆盖的版本区间 [lo, hi]：开始时生效的版本 … 最后一个展期日之前生效的版本
+        first = np.searchsorted(self._stamp, key << 32, side="left")
+        lo = np.maximum(np.searchsorted(self._stamp, _stamp(key, start), side="right") - 1, first)
+        hi = np.searchsorted(self._stamp, _stamp(key, end - 1), side="right") - 1
+        pieces = np.where(count > 0, np.maximum(hi - lo + 1, 0), 0)
+        row = np.repeat(np.arange(len(key)), pieces)
+        version = np.repeat(lo, pieces) + np.arange(len(row)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        piece_count, piece_days = _swap_days(np.maximum(start[row], self._date[version]),
+                                             np.minimum(end[row], self._next[version]), lag[row], calendar)
+
+        charged = np.bincount(row, weights=piece_count, minlength=len(key))
+        swap = np.asarray(lots, dtype=float) * np.bincount(row, weights=self._swap[version] * piece_days,
+                                                           minlength=len(key))
+        return count, days, np.where(charged < count, np.nan, swap)
+
+
+def trade_swaps(trades, rates, holidays=HOLIDAYS, rollover_time=ROLLOVER_TIME, as_of=None):
+    """Expected swap of every trade in a trade log (core.history TRADE_COLUMNS).
+
+    Adds rollovers, swap_days and expected_swap columns, plus swap_diff (booked −
+    expected) when the log carries a booked `swap` column. Open trades accrue up to
+    `as_of` (or none when it is not given).
+    """
+    symbol = require_symbol_ids(trades["symbol"])
+    open_time = pd.to_datetime(trades["open_time"]).to_numpy().astype("datetime64[ns]")
+    close_time = pd.to_datetime(trades["close_time"]).to_numpy().astype("datetime64[ns]")
+    if as_of is not None:
+        close_time = np.where(np.isnat(close_time), np.datetime64(pd.Timestamp(as_of), "ns"), close_time)
+    count, days, swap = rates.accrue(symbol, trades["direction"].to_numpy(), trades["lots"].to_numpy(dtype=float),
+                                     open_time, close_time, holidays, rollover_time)
+    out = trades.assign(rollovers=count, swap_days=days, expected_swap=swap)
+    if "swap" in trades:
+        out["swap_diff"] = trades["swap"].to_numpy(dtype=float) - swap
+    return out
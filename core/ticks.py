@@ -0,0 +1,132 @@
+# 逐笔报价（tick）文件的流式点差统计：固定大小分块读取，内存占用有界
+import numpy as np
+import pandas as pd
+
+from core.files import iter_table_chunks
+from core.instruments import PIP_SIZE, symbol_ids
+
+TICK_COLUMNS = ["timestamp", "symbol", "bid", "ask"]
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def iter_tick_chunks(source, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """Yield tick DataFrames (timestamp, symbol, bid, ask) of at most `chunksize` rows.
+
+    `source` is a path or file-like object holding CSV or Parquet; `columns` maps
+    file column names to the standard names when they differ.
+    """
+    rename = dict(columns or {})
+    wanted = [next((k for k, v in rename.items() if v == c), c) for c in TICK_COLUMNS]
+    for chunk, _ in iter_table_chunks(source, chunksize, wanted):
+        yield _normalize(chunk.rename(columns=rename))
+
+
+def _normalize(chunk):
+    chunk = chunk[TICK_COLUMNS]
+    if not pd.api.types.is_datetime64_any_dtype(chunk["timestamp"]):
+        chunk = chunk.assign(timestamp=pd.to_datetime(chunk["timestamp"]))
+    return chunk
+
+
+class SpreadStream:
+    """Per-symbol rolling spread statistics (in pips) over a stream of tick chunks.
+
+    Only the last `window` spreads of each symbol are carried between chunks, so
+    memory is bounded by chunk size + symbols × window. Ticks are expected in time
+    order within each symbol.
+    """
+
+    def __init__(self, window=1000, percentile=95):
+        self.window = int(window)
+        self.percentile = float(percentile)
+        self.skipped = 0  # 注册表中不存在的品种，跳过的 tick 数
+        self._tail = None
+        self._totals = None
+        self._last = None
+
+    @property
+    def pct_column(self):
+        return f"roll_p{self.percentile:g}"
+
+    def update(self, chunk):
+        """Consume one tick chunk; return its rows with rolling mean/max/percentile."""
+        sid = symbol_ids(chunk["symbol"])
+        known = sid >= 0
+        self.skipped += int((~known).sum())
+        new = pd.DataFrame({
+            "timestamp": chunk["timestamp"].to_numpy()[known],
+            "symbol": chunk["symbol"].to_numpy()[known],
+            "spread_pips": (chunk["ask"].to_numpy(dtype=float)[known] - chunk["bid"].to_numpy(dtype=float)[known])
+                           / PIP_SIZE[sid[known]],
+            "is_new": True,
+        })
+        frame = new if self._tail is None else pd.concat([self._tail, new], ignore_index=True)
+        # 按品种稳定排序，组内保持时间顺序
+        frame = frame.iloc[np.argsort(pd.factorize(frame["symbol"])[0], kind="stable")].reset_index(drop=True)
+        groups = frame.groupby("symbol", sort=False)["spread_pips"]
+
+        rolling = groups.rolling(self.window, min_periods=1)
+        frame["roll_mean"] = rolling.mean().to_numpy()
+        frame["roll_max"] = rolling.max().to_numpy()
+        frame[self.pct_column] = rolling.quantile(self.percentile / 100).to_numpy()
+
+        # 时间加权：每个点差持续到同品种下一笔 tick
+        next_ts = frame.groupby("symbol", sort=False)["timestamp"].shift(-1)
+        duration = (next_ts - frame["timestamp"]).dt.total_seconds().to_numpy()
+        counts = np.isfinite(duration) & (frame["is_new"].to_numpy() | frame["is_new"].shift(-1, fill_value=False).to_numpy())
+        frame["_tw"] = np.where(counts, frame["spread_pips"] * duration, 0.0)
+        frame["_dt"] = np.where(counts, duration, 0.0)
+
+        fresh = frame[frame["is_new"]]
+        self._accumulate(fresh, frame)
+        keep = max(self.window - 1, 1)
+        self._tail = (frame.groupby("symbol", sort=False).tail(keep)
+                      [["timestamp", "symbol", "spread_pips"]].assign(is_new=False))
+        return fresh[["timestamp", "symbol", "spread_pips", "roll_mean", "roll_max", self.pct_column]]
+
+    def _accumulate(self, fresh, frame):
+        totals = fresh.groupby("symbol", sort=False).agg(
+            ticks=("spread_pips", "size"), spread_sum=("spread_pips", "sum"), spread_max=("spread_pips", "max"))
+        weighted = frame.groupby("symbol", sort=False)[["_tw", "_dt"]].sum()
+        totals = totals.join(weighted, how="outer").fillna(0.0)
+        last = fresh.groupby("symbol", sort=False)[["roll_mean", "roll_max", self.pct_column]].last()
+        if self._totals is None:
+            self._totals = totals
+            self._last = last
+            return
+        combined = self._totals.add(totals, fill_value=0.0)
+        combined["spread_max"] = np.fmax(self._totals["spread_max"].reindex(combined.index),
+                                         totals["spread_max"].reindex(combined.index))
+        self._totals = combined
+        self._last = last.combine_first(self._last)
+
+    def summary(self):
+        """Per-symbol summary: ticks, mean, max, latest rolling stats and time-weighted average spread."""
+        if self._totals is None:
+            return pd.DataFrame(columns=["symbol", "ticks", "mean_pips", "max_pips", "twas_pips"])
+        totals = self._totals
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = pd.DataFrame({
+                "ticks": totals["ticks"].astype(np.int64),
+                "mean_pips": totals["spread_sum"] / totals["ticks"],
+                "max_pips": totals["spread_max"],
+                "twas_pips": np.where(totals["_dt"] > 0, totals["_tw"] / totals["_dt"].where(totals["_dt"] > 0, 1.0), np.nan),
+            })
+        out = out.join(self._last)
+        return out.rename_axis("symbol").reset_index()
+
+
+def rolling_spread_stats(chunks, window=1000, percentile=95, stream=None):
+    """Generator stage: map tick chunks to rolling-stat chunks (see SpreadStream)."""
+    stream = stream or SpreadStream(window, percentile)
+    for chunk in chunks:
+        yield stream.update(chunk)
+
+
+def summarize_tick_file(source, window=1000, percentile=95, chunksize=DEFAULT_CHUNKSIZE, on_chunk=None):
+    """Stream a whole tick file and return the per-symbol summary DataFrame."""
+    stream = SpreadStream(window, percentile)
+    for stats in rolling_spread_stats(iter_tick_chunks(source, chunksize), stream=stream):
+        if on_chunk is not None:
+            on_chunk(stats)
+    return stream.summary()
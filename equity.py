@@ -1,107 +1,43 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
+from i18n import get_translations
+from core.account import LONG
+from core.instruments import SYMBOLS, UNIT, DECIMAL_PLACES, QUOTE_CURRENCY, require_symbol_ids, symbol_id, spec
+from core.files import load_table
+from core.orders import OrderStore, ORDER_FILE_DTYPES
+from core.stress import (MARGIN_CALL, STOP_OUT, MARGIN_CALL_LEVEL, STOP_OUT_LEVEL, shock_grid,
+                         correlated_loadings, symbol_sensitivities, stress_grid)
+from core.stopout import stop_out_prices, uniform_stop_out
+from core.montecarlo import default_volatility, uniform_correlation, simulate_equity
+from core.replay import MarginReplay, replay_tick_file
+from core.history import TRADE_COLUMNS, TRADE_DTYPES, PRICE_DTYPES, margin_history, margin_at, closed_trade_levels
+from core.margin import portfolio_margin
+from core.rates import ACCOUNT_CURRENCIES, REFERENCE_QUOTES, quote_snapshot, quote_to_account
+from charts import stress_heatmap
 
 # st.set_page_config(layout="wide")
 
+def orders_frame(book, t):
+    """Display / export table of the shared order book."""
+    sid = book["symbol"]
+    return pd.DataFrame({
+        "Instrument": book.symbols(),
+        "Direction": np.where(book["direction"] == LONG, t["long"], t["short"]),
+        "Position Size": book["size"],
+        "Entry Price": book["entry_price"],
+        "Current Price": book["current_price"],
+        "Margin Rate": book["margin_rate"],
+        "Contract Size": book["contract_size"],
+        "Unit": UNIT[sid],
+        "Decimals": DECIMAL_PLACES[sid],
+    })
+
+
 def equity_page():
-    products = {
-        "Gold (XAUUSD)": {"unit": "Ounces", "contract_size": 100, "decimal_places": 2},
-        "Silver (XAGUSD)": {"unit": "Ounces", "contract_size": 1000, "decimal_places": 3},
-        "Oil (WTI)": {"unit": "Barrels", "contract_size": 1000, "decimal_places": 2},
-        "Index (S&P 500)": {"unit": "Points", "contract_size": 50, "decimal_places": 2},
-        "EUR/USD": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "GBP/USD": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "USD/JPY": {"unit": "Units", "contract_size": 100000, "decimal_places": 3},
-        "AUD/USD": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "USD/CHF": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "USD/CAD": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "NZD/USD": {"unit": "Units", "contract_size": 100000, "decimal_places": 5},
-        "EUR/JPY": {"unit": "Units", "contract_size": 100000, "decimal_places": 3},
-        "GBP/JPY": {"unit": "Units", "contract_size": 100000, "decimal_places": 3},
-        "BTC/USD": {"unit": "Coins", "contract_size": 1, "decimal_places": 8},
-        "ETH/USD": {"unit": "Coins", "contract_size": 1, "decimal_places": 8},
-        "BNB/USD": {"unit": "Coins", "contract_size": 1, "decimal_places": 8},
-        "XRP/USD": {"unit": "Coins", "contract_size": 1, "decimal_places": 8},
-        "LTC/USD": {"unit": "Coins", "contract_size": 1, "decimal_places": 8},
-    }
-
-    translations = {
-        "en": {
-            "title": "📊 Balance, Equity, Margin & Margin Level Tool",
-            "balance": "Balance (Closed P/L)",
-            "balance_concept": "Balance is the historical net worth in your account, excluding any open trades. It reflects deposits, withdrawals, and closed position P/L.",
-            "equity": "Equity (Real-Time Value)",
-            "equity_concept": "Equity = Balance + floating P/L from open positions. Reflects the real-time account value.",
-            "floating_pl": "Floating Profit/Loss",
-            "floating_pl_concept": "Sum of all open positions' unrealized profits and losses, based on real-time prices.",
-            "used_margin": "Used Margin",
-            "used_margin_concept": "Total margin currently locked for open trades. Varies by position size, instrument, and real-time price.",
-            "free_margin": "Free Margin",
-            "free_margin_concept": "Equity minus Used Margin. It’s the margin left for new trades or to absorb losses.",
-            "margin_level": "Margin Level",
-            "margin_level_formula": "Margin Level = (Equity ÷ Used Margin) × 100%",
-            "margin_level_concept": "Shows how much your equity covers your used margin. <100% = margin call risk.",
-            "margin_requirement": "Margin Requirement",
-            "margin_requirement_formula": "Margin Requirement = Position Size × Price × Margin Rate",
-            "order_entry": "Enter Your Open Positions",
-            "instrument": "Instrument",
-            "position_size": "Position Size",
-            "entry_price": "Entry Price",
-            "current_price": "Current Price",
-            "direction": "Direction",
-            "long": "Long",
-            "short": "Short",
-            "margin_rate": "Margin Rate (%)",
-            "add_order": "Add Position",
-            "delete_order": "Delete Selected",
-            "calc_all": "🔄 Calculate Account Status",
-            "summary": "Account Summary",
-            "no_orders": "No open positions yet. Add one below.",
-            "remove_order": "Remove",
-            "concepts": "🧮 Concepts Explained",
-            "formulas": "🔗 Key Formulas",
-            "delete_confirm": "Are you sure to delete this order?",
-        },
-        "zh": {
-            "title": "📊 余额、权益、保证金与比率工具",
-            "balance": "余额（已平仓盈亏）",
-            "balance_concept": "余额是账户历史净值，不包含未平仓订单。反映入金、出金和已平仓盈亏。",
-            "equity": "权益（实时）",
-            "equity_concept": "权益 = 余额 + 未平仓单浮动盈亏。反映账户实时价值。",
-            "floating_pl": "浮动盈亏",
-            "floating_pl_concept": "所有未平仓单的浮动盈亏总和，根据实时行情计算。",
-            "used_margin": "已用保证金",
-            "used_margin_concept": "当前未平仓订单占用的保证金总额。与持仓、品种、实时价格等相关。",
-            "free_margin": "可用保证金",
-            "free_margin_concept": "权益减去已用保证金，可用来开新仓或抵御亏损。",
-            "margin_level": "保证金比率",
-            "margin_level_formula": "保证金比率 = (权益 ÷ 已用保证金) × 100%",
-            "margin_level_concept": "反映权益对已用保证金的覆盖。低于100%面临强平风险。",
-            "margin_requirement": "保证金要求",
-            "margin_requirement_formula": "保证金要求 = 持仓规模 × 当前价格 × 保证金率",
-            "order_entry": "请录入你的未平仓订单",
-            "instrument": "品种",
-            "position_size": "持仓规模",
-            "entry_price": "开仓价",
-            "current_price": "当前价",
-            "direction": "方向",
-            "long": "买入",
-            "short": "卖出",
-            "margin_rate": "保证金率（%）",
-            "add_order": "添加订单",
-            "delete_order": "删除选中订单",
-            "calc_all": "🔄 计算账户状态",
-            "summary": "账户汇总",
-            "no_orders": "暂无未平仓单，请下方添加。",
-            "remove_order": "移除",
-            "concepts": "🧮 核心概念说明",
-            "formulas": "🔗 主要公式",
-            "delete_confirm": "确认要删除该订单？",
-        }
-    }
 
     lang = st.session_state.get("language", "en")
-    t = translations[lang]
+    t = get_translations("equity", lang)
 
     # 统一页面样式
     st.markdown("""
@@ -131,19 +67,29 @@ def equity_page():
     st.divider()
 
     # 账户初始余额输入 + 汇总卡片区
-    balance = st.number_input(f"💰 {t['balance']}", min_value=0.0, value=10000.0, step=100.0, key="balance_input")
-    if "orders" not in st.session_state:
-        st.session_state.orders = []
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        balance = st.number_input(f"💰 {t['balance']}", min_value=0.0, value=10000.0, step=100.0, key="balance_input")
+    with c2:
+        account_currency = st.selectbox(t["account_currency"], ACCOUNT_CURRENCIES, key="account_currency")
+    # 换算报价：每个品种一个明确的价格，不随订单在表中的位置变化
+    with st.expander(t["conversion_quotes"], expanded=False):
+        quote_table = st.data_editor(
+            pd.DataFrame({"Instrument": list(REFERENCE_QUOTES), "Price": list(REFERENCE_QUOTES.values())}),
+            disabled=["Instrument"], hide_index=True, use_container_width=True, key="equity_quotes",
+            column_config={"Instrument": t["instrument"], "Price": t["price"]})
+    quotes = quote_snapshot(dict(zip(quote_table["Instrument"], quote_table["Price"])))
+    # 三个持仓页面共用的列式订单簿；其 account 累计值在增删改时 O(1) 增量更新
+    if "book" not in st.session_state:
+        st.session_state.book = OrderStore()
+    book = st.session_state.book
 
     # 新订单录入
     with st.form("order_form"):
         cols = st.columns([2, 1, 1, 1.5, 1.5, 1])
         with cols[0]:
-            instrument = st.selectbox(t["instrument"], list(products.keys()), key="order_instrument")
-        product_params = products[instrument]
-        contract_size = product_params["contract_size"]
-        decimals = product_params["decimal_places"]
-        unit = product_params["unit"]
+            instrument = st.selectbox(t["instrument"], SYMBOLS, key="order_instrument")
+        contract_size = spec(symbol_id(instrument))["contract_size"]
 
         with cols[1]:
             direction = st.selectbox(t["direction"], [t["long"], t["short"]])
@@ -157,17 +103,7 @@ def equity_page():
             margin_rate = st.number_input(t["margin_rate"], min_value=0.1, max_value=100.0, value=2.0)
         submitted = st.form_submit_button(t["add_order"])
         if submitted:
-            st.session_state.orders.append({
-                "Instrument": instrument,
-                "Direction": direction,
-                "Position Size": size,
-                "Entry Price": entry_price,
-                "Current Price": current_price,
-                "Margin Rate": margin_rate,
-                "Contract Size": contract_size,
-                "Unit": unit,
-                "Decimals": decimals
-            })
+            book.append(instrument, direction, size, contract_size, entry_price, current_price, margin_rate)
             st.success("✅ Added!")
 
     # 展示已输入订单 + 单个移除按钮
@@ -177,101 +113,114 @@ def equity_page():
     st.markdown("##### 📥 Import / Export Orders")
     col_u, col_d = st.columns(2)
     with col_u:
-        uploaded = st.file_uploader("Import from Excel/CSV", type=["csv", "xlsx"])
-        if uploaded:
+        uploaded = st.file_uploader("Import from Excel/CSV/Parquet/Arrow", type=["csv", "xlsx", "parquet", "arrow", "feather"])
+        # 同一次上传只导入一次，之后的重跑不再覆盖订单簿；解析结果按文件内容哈希缓存
+        if uploaded is not None and st.session_state.get("orders_upload_id") != uploaded.file_id:
             try:
-                if uploaded.name.endswith(".csv"):
-                    df_up = pd.read_csv(uploaded)
-                else:
-                    df_up = pd.read_excel(uploaded)
-                st.session_state.orders = df_up.to_dict(orient="records")
-                st.success("Imported orders!")
-            except Exception as e:
+                df_up = load_table(uploaded.getvalue(), uploaded.name, ORDER_FILE_DTYPES)
+                st.session_state.book = book = OrderStore.from_frame(df_up)
+            except (KeyError, ValueError, ImportError) as e:
                 st.error(f"Import failed: {e}")
+            else:
+                st.session_state.orders_upload_id = uploaded.file_id
+                st.success(f"Imported {len(book):,} orders!")
     with col_d:
-        if st.session_state.orders:
-            df_orders = pd.DataFrame(st.session_state.orders)
+        if len(book):
+            df_orders = orders_frame(book, t)
             buffer = io.BytesIO()
             df_orders.to_csv(buffer, index=False)
             st.download_button("Export Orders (CSV)", buffer.getvalue(), file_name="orders.csv")
 
+    # 盈亏与保证金以各品种报价货币计；订单簿按账户货币维护累计值，仅在货币或换算报价变化时整本重算
+    book.set_account_currency(account_currency, quotes)
+    contract_size = book.account_contract_size()
+
     # ----------- 订单DataFrame展示+批量删除+单笔浮盈 -----------
-    if st.session_state.orders:
-        orders_df = pd.DataFrame(st.session_state.orders)
-        orders_df["Floating P/L"] = orders_df.apply(
-            lambda row: ((row["Current Price"] - row["Entry Price"]) if row["Direction"]==t["long"]
-                        else (row["Entry Price"] - row["Current Price"]))
-                        * row["Position Size"] * row["Contract Size"],
-            axis=1
-        )
+    if len(book):
+        # 整张订单表一次向量化估值，直接读取订单簿的列
+        orders_df = orders_frame(book, t)
+        orders_df["Floating P/L"] = book.evaluate()["floating"]
+        orders_df["Quote Ccy"] = QUOTE_CURRENCY[book["symbol"]]
+        orders_df[f"Floating P/L ({account_currency})"] = orders_df["Floating P/L"] * book["to_account"]
         st.dataframe(orders_df, use_container_width=True)
         selected = st.multiselect("Select orders to delete", orders_df.index)
         if st.button(t["delete_order"]):
-            st.session_state.orders = [o for i, o in enumerate(st.session_state.orders) if i not in selected]
+            book.remove(selected)
             st.rerun()
+
+        # 单笔订单更新现价
+        cols = st.columns([1, 1, 1])
+        with cols[0]:
+            reprice_index = st.selectbox("Order to reprice", orders_df.index, key="reprice_index")
+        with cols[1]:
+            new_price = st.number_input(t["current_price"], min_value=0.0,
+                                        value=float(orders_df.at[reprice_index, "Current Price"]), key=f"reprice_price_{reprice_index}")
+        with cols[2]:
+            st.write("")
+            if st.button("Update price"):
+                book.set_price(reprice_index, new_price)
+                st.rerun()
+
+        # 报价回放：按 tick 逐笔重估订单簿，记录保证金比率穿越 300% / 追保线 / 强平线的时刻
+        with st.expander("⏯️ Replay quotes (CSV / Parquet ticks)", expanded=False):
+            quotes_file = st.file_uploader("Upload ticks (timestamp, symbol, bid, ask)", type=["csv", "parquet"], key="replay_file")
+            quotes_path = st.text_input("…or a tick file path on the server", key="replay_path")
+            liquidate = st.checkbox("Close all positions at stop-out", value=True, key="replay_liquidate")
+            source = quotes_file if quotes_file is not None else quotes_path.strip()
+            if source and st.button("▶️ Replay"):
+                # 合约规模不换算，盈亏与保证金按订单簿的报价货币 → 账户货币汇率换算
+                replay = MarginReplay.from_store(book, balance, liquidate=liquidate)
+                try:
+                    events = pd.DataFrame(list(replay_tick_file(source, replay)))
+                except (KeyError, ValueError, OSError) as e:
+                    st.error(f"Replay failed: {e}")
+                else:
+                    st.session_state.replay_marks = replay.marks(book["symbol"], book["direction"])
+                    final = replay.summary().iloc[0]
+                    st.markdown(f"- **Ticks replayed:** {replay.ticks:,}\n"
+                                f"- **Final equity:** {final['equity']:,.2f}\n"
+                                f"- **Final margin level:** {final['margin_level']:.2f}%")
+                    if len(events):
+                        st.dataframe(events.drop(columns="account"), use_container_width=True, hide_index=True)
+                    else:
+                        st.success("No margin-level thresholds crossed.")
+            marks = st.session_state.get("replay_marks")
+            if marks is not None and len(marks) == len(book) and st.button("Apply last replayed prices to orders"):
+                for row in np.flatnonzero(np.isfinite(marks)):
+                    book.set_price(row, marks[row])
+                del st.session_state.replay_marks
+                st.rerun()
         st.divider()
     else:
         st.info(t["no_orders"])
 
 
     # 计算所有账户关键指标
+    tiered = st.checkbox("Tiered leverage margin (as on the Margin page)", key="tiered_margin")
+    # 账户汇总、压力测试与蒙特卡洛共用的已用保证金（账户货币）及各品种保证金对价格的敏感度
+    pnl_sens, margin_sens = symbol_sensitivities(
+        book["symbol"], book["direction"], book["size"], contract_size,
+        book["current_price"], book["margin_rate"]
+    )
+    used_margin = book.account.used_margin
+    if tiered and len(book):
+        # 与保证金页面同一引擎：按名义价值分档，经交叉汇率换算为账户货币；价格冲击下按当前有效杠杆线性外推
+        position_margin = portfolio_margin(book["symbol"], book["size"], book["contract_size"], book["current_price"],
+                                           book.quotes, account_currency)["margin"]
+        used_margin = position_margin.sum()
+        margin_sens = np.bincount(book["symbol"], weights=position_margin, minlength=len(SYMBOLS))
     if st.button(t["calc_all"]):
-        total_floating = 0.0
-        total_used_margin = 0.0
-        for order in st.session_state.orders:
-            cs = order.get("Contract Size", 100000)
-            pnl_per_unit = (order["Current Price"] - order["Entry Price"]) if order["Direction"] == t["long"] else (order["Entry Price"] - order["Current Price"])
-            floating = pnl_per_unit * order["Position Size"] * cs
-            total_floating += floating
-            margin_req = order["Position Size"] * cs * order["Current Price"] * (order["Margin Rate"] / 100)
-            total_used_margin += margin_req
-
-        equity = balance + total_floating
-        free_margin = equity - total_used_margin
-        margin_level = (equity / total_used_margin * 100) if total_used_margin > 0 else float('inf')
-
-        # ----------- 新增：自动实时汇总与风险高亮 -----------
-        def calc_account_summary(balance, orders):
-            total_floating = 0.0
-            total_used_margin = 0.0
-            long_size = 0.0
-            short_size = 0.0
-            for order in orders:
-                cs = order["Contract Size"]
-                dir_long = order["Direction"] == t["long"] or order["Direction"] == "买入"
-                size = order["Position Size"]
-                pnl = (order["Current Price"] - order["Entry Price"]) if dir_long else (order["Entry Price"] - order["Current Price"])
-                floating = pnl * size * cs
-                total_floating += floating
-                margin_req = size * cs * order["Current Price"] * (order["Margin Rate"] / 100)
-                total_used_margin += margin_req
-                if dir_long:
-                    long_size += size * cs
-                else:
-                    short_size += size * cs
-            equity = balance + total_floating
-            free_margin = equity - total_used_margin
-            margin_level = (equity / total_used_margin * 100) if total_used_margin > 0 else float('inf')
-            margin_used_pct = (total_used_margin / balance * 100) if balance > 0 else 0
-            net_position = long_size - short_size
-            return {
-                "floating": total_floating,
-                "used_margin": total_used_margin,
-                "free_margin": free_margin,
-                "margin_level": margin_level,
-                "margin_used_pct": margin_used_pct,
-                "long_size": long_size,
-                "short_size": short_size,
-                "net_position": net_position,
-                "equity": equity
-            }
-
-        summary = calc_account_summary(balance, st.session_state.orders)
+        # 直接读取订单簿的累计值（已是账户货币），不再整本重算
+        summary = book.account.summary(balance, used_margin)
+        total_floating = summary["floating"]
+        total_used_margin = summary["used_margin"]
+        equity = summary["equity"]
+        free_margin = summary["free_margin"]
         margin_level = summary["margin_level"]
         margin_level_color = "green" if margin_level >= 300 else "orange" if margin_level >= 100 else "red"
         free_margin_color = "green" if summary["free_margin"] >= 0 else "red"
 
-        st.markdown("##### 📊 Account Summary (Real-Time)")
+        st.markdown(f"##### 📊 Account Summary (Real-Time, {account_currency})")
         cols = st.columns(6)
         cols[0].metric(t["balance"], f"{balance:,.2f}")
         cols[1].metric(t["floating_pl"], f"{summary['floating']:,.2f}")
@@ -293,24 +242,10 @@ def equity_page():
             f"- **Net Position (Long - Short):** {summary['net_position']:,}"
         )
 
-        # 盈亏趋势图
-        import numpy as np
-        days = np.arange(7)
-        simulated_floating = [summary["floating"] + np.random.randn()*100 for _ in days]
-        st.line_chart(simulated_floating)
-
         # 风险小贴士
         st.info("💡 **Risk Tip:** Always monitor margin level! <100% means forced liquidation risk; keep >300% for safety. Prices and leverage changes may greatly affect your margin.")
 
 
-        # 卡片区 summary
-        colA, colB, colC, colD, colE, colF = st.columns(6)
-        colA.metric(label=t["balance"], value=f"{balance:,.2f}")
-        colB.metric(label=t["floating_pl"], value=f"{total_floating:,.2f}")
-        colC.metric(label=t["equity"], value=f"{equity:,.2f}")
-        colD.metric(label=t["used_margin"], value=f"{total_used_margin:,.2f}")
-        colE.metric(label=t["free_margin"], value=f"{free_margin:,.2f}")
-        colF.metric(label=t["margin_level"], value=f"{margin_level:.2f} %")
         st.caption(t["margin_level_concept"])
         st.divider()
 
@@ -323,5 +258,146 @@ def equity_page():
             st.markdown(f"- **{t['free_margin']}:** {free_margin:.2f} ({t['free_margin_concept']})")
             st.markdown(f"- **{t['margin_level']}:** {margin_level:.2f}% ({t['margin_level_concept']})")
 
+    # 价格冲击压力测试：主导品种冲击 × 其余品种相关系数，整张订单表一次广播计算
+    if len(book):
+        with st.expander("🌪️ Price-shock stress test", expanded=False):
+            held = np.unique(book["symbol"])
+            held = held[np.argsort(-np.abs(pnl_sens[held]))]  # 默认以敞口最大的品种为主导
+            c1, c2, c3, c4 = st.columns(4)
+            with c1:
+                lead = st.selectbox("Lead symbol", held, format_func=lambda i: SYMBOLS[i], key="stress_lead")
+            with c2:
+                max_shock = st.slider("Max shock (%)", 0.1, 20.0, 20.0, step=0.1, key="stress_max_shock")
+            with c3:
+                steps = st.number_input("Steps", min_value=10, max_value=400, value=200, step=10, key="stress_steps")
+            with c4:
+                stop_out = st.number_input("Stop-out level (%)", min_value=0.0, max_value=100.0, value=STOP_OUT_LEVEL, key="stress_stop_out")
+            correlations = np.round(np.linspace(-1.0, 1.0, 21), 2)
+            shocks = shock_grid(max_shock / 100, int(steps))
+            grid = stress_grid(
+                balance, book.account.floating, used_margin, pnl_sens, margin_sens,
+                shocks, correlated_loadings(lead, correlations), stop_out
+            )
+            st.caption(f"{SYMBOLS[lead]} moves by the shock; every other symbol moves by ρ × shock.")
+            st.altair_chart(stress_heatmap(shocks * 100, correlations, grid), use_container_width=True)
+            zones = pd.Series(grid["zone"].ravel()).value_counts()
+            st.markdown(
+                f"- **Margin call (<{MARGIN_CALL_LEVEL:.0f}%) scenarios:** {zones.get(MARGIN_CALL, 0):,}\n"
+                f"- **Stop-out (<{stop_out:.0f}%) scenarios:** {zones.get(STOP_OUT, 0):,}"
+            )
+
+    # 蒙特卡洛权益路径：相关 GBM 价格路径一次生成为张量，沿路径重估整本订单
+    if len(book):
+        with st.expander("🎲 Monte Carlo equity paths", expanded=False):
+            c1, c2, c3, c4 = st.columns(4)
+            with c1:
+                n_paths = st.number_input("Paths", min_value=100, max_value=100_000, value=5000, step=500, key="mc_paths")
+            with c2:
+                horizon = st.number_input("Horizon (trading days)", min_value=1, max_value=60, value=10, key="mc_days")
+            with c3:
+                rho = st.slider("Correlation between symbols", -0.2, 0.95, 0.3, step=0.05, key="mc_rho")
+            with c4:
+                call_level = st.number_input("Margin call level (%)", min_value=0.0, value=MARGIN_CALL_LEVEL, key="mc_call_level")
+            vol_scale = st.slider("Volatility multiplier", 0.25, 4.0, 1.0, step=0.25, key="mc_vol_scale")
+            use_pool = st.checkbox("Run path batches in a process pool", key="mc_pool")
+            held = np.unique(book["symbol"])
+            volatility = default_volatility(held) * vol_scale
+            st.caption("Annualized volatility: " + ", ".join(f"{SYMBOLS[i]} {v:.0%}" for i, v in zip(held, volatility)))
+            if st.button("▶️ Run simulation"):
+                try:
+                    result = simulate_equity(
+                        balance, book.account.floating, pnl_sens[held], margin_sens[held], volatility,
+                        uniform_correlation(len(held), rho), n_paths=int(n_paths), days=int(horizon),
+                        margin_call_level=call_level, workers=4 if use_pool else 1
+                    )
+                except np.linalg.LinAlgError:
+                    st.error("The correlation matrix is not positive definite; raise the correlation.")
+                else:
+                    st.metric(f"P(margin call within {int(horizon)} days)", f"{result['hit_probability']:.1%}")
+                    st.markdown("##### Equity quantiles by day")
+                    st.line_chart(result["equity_quantiles"])
+                    st.markdown("##### Cumulative margin-call probability")
+                    st.line_chart(result["hit_probability_by_day"])
+
+    # 强平价位：单品种价格（其余不变）与全部品种同比例变动两种口径，闭式求解
+    with st.expander("🧮 Stop-out levels", expanded=False):
+        stop_level = st.number_input("Stop-out level (%)", min_value=0.0, max_value=100.0, value=STOP_OUT_LEVEL, key="stopout_level")
+        if len(book):
+            columns = (np.zeros(len(book), dtype=np.int64), book["symbol"], book["direction"], book["size"],
+                       contract_size, book["entry_price"], book["current_price"], book["margin_rate"])
+            per_symbol = stop_out_prices(*columns, balance, stop_level).drop(columns="account")
+            uniform = uniform_stop_out(*columns, balance, stop_level)
+            st.markdown(f"##### {t['current_price']} → stop-out (other prices fixed)")
+            st.dataframe(per_symbol.round(5), use_container_width=True, hide_index=True)
+            move = uniform["stop_out_move_pct"].iloc[0]
+            st.markdown(f"- **Uniform move of all prices to stop-out:** "
+                        + ("—" if np.isnan(move) else f"{move:+.3f}%"))
+
+        # 多账户批量：按距强平的同比例价格变动幅度排序
+        accounts_file = st.file_uploader(
+            "Rank accounts (CSV: Account, Balance, Instrument, Direction, Position Size, Entry Price, Current Price, Margin Rate)",
+            type=["csv", "parquet", "arrow", "feather"], key="stopout_accounts")
+        if accounts_file is not None:
+            try:
+                positions = load_table(accounts_file.getvalue(), accounts_file.name,
+                                       {"Account": str, "Balance": np.float64, **ORDER_FILE_DTYPES})
+                # 余额视为账户货币，持仓按同一组换算报价换算为账户货币
+                accounts_book = OrderStore.from_frame(positions).set_account_currency(account_currency, quotes)
+                columns = (positions["Account"].to_numpy(), accounts_book["symbol"], accounts_book["direction"],
+                           accounts_book["size"], accounts_book.account_contract_size(), accounts_book["entry_price"],
+                           accounts_book["current_price"], accounts_book["margin_rate"])
+                balances = positions.groupby("Account")["Balance"].first()
+                ranking = uniform_stop_out(*columns, balances, stop_level)
+                closest = stop_out_prices(*columns, balances, stop_level)
+            except (KeyError, ValueError) as e:
+                st.error(f"Invalid accounts file: {e}")
+            else:
+                st.markdown("##### Accounts by distance to stop-out (uniform % move)")
+                st.dataframe(ranking.round(4), use_container_width=True, hide_index=True)
+                st.markdown("##### Closest single-symbol stop-out per account")
+                closest = closest.dropna(subset=["move_pct"])
+                closest = closest.loc[closest["move_pct"].abs().groupby(closest["account"]).idxmin()]
+                st.dataframe(closest.sort_values("move_pct", key=np.abs).round(5), use_container_width=True, hide_index=True)
+
+    # 历史账户还原：成交记录 + 价格历史 → 余额 / 权益 / 保证金比率时间序列，及任一时刻的保证金比率
+    with st.expander("📜 Account history (trade log + prices)", expanded=False):
+        trades_file = st.file_uploader(
+            "Trade log (" + ", ".join(TRADE_COLUMNS) + "; optional contract_size, margin_rate, commission, swap)",
+            type=["csv", "parquet", "arrow", "feather"], key="history_trades")
+        prices_file = st.file_uploader("Prices (timestamp, symbol, close — or bid, ask)",
+                                       type=["csv", "parquet", "arrow", "feather"], key="history_prices")
+        c1, c2 = st.columns(2)
+        with c1:
+            start_balance = st.number_input(f"Starting balance ({account_currency})", min_value=0.0, value=10000.0, step=100.0, key="history_balance")
+        with c2:
+            freq = st.selectbox("Sampling", ["Every price", "1min", "5min", "1h"], key="history_freq")
+        if trades_file is not None and prices_file is not None:
+            try:
+                trades = load_table(trades_file.getvalue(), trades_file.name, TRADE_DTYPES)
+                prices = load_table(prices_file.getvalue(), prices_file.name, PRICE_DTYPES)
+                # 与订单簿相同的换算报价：各笔盈亏与保证金换算为账户货币（手续费与隔夜利息视为已是账户货币）
+                to_account = quote_to_account(require_symbol_ids(trades["symbol"]), account_currency, quotes)
+                history = margin_history(trades, prices, start_balance, None if freq == "Every price" else freq, to_account)
+                closes = closed_trade_levels(trades, prices, start_balance, to_account)
+            except (KeyError, ValueError) as e:
+                st.error(f"Invalid history files: {e}")
+            else:
+                st.markdown(f"##### Balance, equity and used margin ({account_currency})")
+                st.line_chart(history[["balance", "equity", "used_margin"]])
+                st.markdown("##### Margin level (%)")
+                st.line_chart(history["margin_level"].replace(np.inf, np.nan))
+                st.markdown(f"##### Closed trades — margin level just before the close (stop-out at {STOP_OUT_LEVEL:.0f}%)")
+                st.dataframe(closes.sort_values("margin_level_before").round(4), use_container_width=True, hide_index=True)
+                moment = st.text_input("Margin level at (e.g. 2025-03-03 14:05:00)", key="history_moment")
+                if moment.strip():
+                    try:
+                        state = margin_at(trades, prices, start_balance, [moment.strip()], to_account).iloc[0]
+                    except (ValueError, TypeError) as e:
+                        st.error(f"Invalid time: {e}")
+                    else:
+                        st.markdown(f"- **Equity:** {state['equity']:,.2f} {account_currency}\n"
+                                    f"- **Used margin:** {state['used_margin']:,.2f} {account_currency}\n"
+                                    f"- **Margin level:** {state['margin_level']:.2f}%")
+
 # 调用页面函数
 # equity_page()
@@ -0,0 +1,30 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+
+# 全部页面的中英文文案，进程内只加载一次，所有会话共享只读视图
+CATALOG_PATH = Path(__file__).with_name("translations.json")
+DEFAULT_LANGUAGE = "en"
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def load_catalog():
+    """Load and freeze the translation catalog (cached for the whole process)."""
+    with open(CATALOG_PATH, encoding="utf-8") as f:
+        return _freeze(json.load(f))
+
+
+def get_translations(page, lang=DEFAULT_LANGUAGE):
+    """Return the frozen translation table of `page` for `lang` (falls back to English)."""
+    section = load_catalog()[page]
+    return section.get(lang, section[DEFAULT_LANGUAGE])
@@ -1,56 +1,18 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
+from i18n import get_translations
+from core.instruments import SYMBOLS, CONTRACT_SIZE, PIP_SIZE, QUOTE_CURRENCY, symbol_id, symbol_ids
+from core.files import load_table
+from core.rates import ACCOUNT_CURRENCIES, REFERENCE_QUOTES, quote_snapshot, pip_values
+from core.sizing import BELOW_MIN, CAPPED, OK, position_sizes
+
+WATCHLIST_DTYPES = {"Instrument": str, "Stop (pips)": np.float64}
 
 def lot_page():
-    translations = {
-        "en": {
-            "title": "🔢 Lot Size Calculator",
-            "concept": "Concept",
-            "concept_text": "A 'Lot' is the standardized quantity of a financial instrument being traded. For example, 1 standard Forex lot = 100,000 units of the base currency. Different assets have different lot sizes.",
-            "formula": "Lot Size = Position Size (units) ÷ Contract Size (per lot)",
-            "calculator": "Lot Size Calculator",
-            "position_size": "Position Size (units)",
-            "contract_size": "Contract Size (per lot)",
-            "calculate": "Calculate",
-            "result": "Required Lots",
-            "note": "*Always refer to your broker's specification for each instrument.*",
-            "examples": "Common Standard Lots",
-            "forex": "Forex: 1 lot = 100,000 units (standard)",
-            "gold": "Gold: 1 lot = 100 ounces (standard)",
-            "btc": "BTC: 1 lot = 1 coin (standard)",
-            "quick_select": "Quick Select Instrument",
-        },
-        "zh": {
-            "title": "🔢 手数（Lot）计算器",
-            "concept": "概念",
-            "concept_text": "“手数”是金融市场的标准交易单位。例如，外汇1标准手=10万基础货币。不同品种手数定义不同。",
-            "formula": "手数 = 持仓规模（单位） ÷ 合约单位（每手）",
-            "calculator": "手数计算器",
-            "position_size": "持仓规模（单位）",
-            "contract_size": "合约单位（每手）",
-            "calculate": "计算",
-            "result": "所需手数",
-            "note": "*具体请以交易商品参数为准*",
-            "examples": "常用标准手数",
-            "forex": "外汇：1标准手=100,000单位",
-            "gold": "黄金：1标准手=100盎司",
-            "btc": "比特币：1标准手=1枚",
-            "quick_select": "一键选择品种",
-        }
-    }
-
-    product_presets = {
-        "Forex (EUR/USD, USD/JPY, etc)": 100000,
-        "Gold (XAUUSD)": 100,
-        "Silver (XAGUSD)": 1000,
-        "Oil (WTI)": 1000,
-        "Index (S&P 500)": 50,
-        "BTC/USD": 1,
-        "ETH/USD": 1,
-        "XRP/USD": 1,
-    }
 
     lang = st.session_state.get("language", "en")
-    t = translations[lang]
+    t = get_translations("lot", lang)
 
     st.markdown("""
         <style>
@@ -76,7 +38,7 @@ def lot_page():
     with col1:
         quick_choice = st.selectbox(
             t["quick_select"],
-            [""] + list(product_presets.keys()),
+            [""] + list(SYMBOLS),
             index=0,
             help="Choose an instrument to autofill contract size"
         )
@@ -92,7 +54,7 @@ def lot_page():
     with cols[1]:
         if quick_choice:
             contract_size = st.number_input(
-                t["contract_size"], min_value=1.0, value=float(product_presets[quick_choice]), step=1.0, key="lot_contract_size"
+                t["contract_size"], min_value=1.0, value=float(CONTRACT_SIZE[symbol_id(quick_choice)]), step=1.0, key="lot_contract_size"
             )
         else:
             contract_size = st.number_input(
@@ -112,6 +74,66 @@ def lot_page():
 
     st.caption(t["note"])
 
+    # 点值表：每手一个点的价值，经交叉汇率换算为账户货币
+    st.divider()
+    st.header("📏 " + t["pip_value_header"])
+    cols = st.columns(2)
+    with cols[0]:
+        account_currency = st.selectbox(t["account_currency"], ACCOUNT_CURRENCIES, key="lot_account_currency")
+    with cols[1]:
+        pip_lots = st.number_input(t["lots"], min_value=0.0, value=1.0, step=0.1, key="lot_pip_lots")
+    with st.expander(t["conversion_quotes"], expanded=False):
+        quote_table = st.data_editor(
+            pd.DataFrame({"Instrument": list(REFERENCE_QUOTES), "Price": list(REFERENCE_QUOTES.values())}),
+            disabled=["Instrument"], hide_index=True, use_container_width=True, key="lot_quotes",
+            column_config={"Instrument": t["instrument"], "Price": t["price"]})
+    quotes = quote_snapshot(dict(zip(quote_table["Instrument"], quote_table["Price"])))
+    sid = np.arange(len(SYMBOLS))
+    st.dataframe(pd.DataFrame({
+        t["instrument"]: SYMBOLS,
+        t["table_contract_size"]: CONTRACT_SIZE,
+        t["pip_size"]: PIP_SIZE,
+        t["quote_currency"]: QUOTE_CURRENCY,
+        t["pip_value_quote"]: PIP_SIZE * CONTRACT_SIZE * pip_lots,
+        t["pip_value_account"].format(ccy=account_currency): pip_values(sid, pip_lots, account_currency, quotes),
+    }).round(4), use_container_width=True, hide_index=True)
+
+    # 按风险批量计算手数：观察列表每行一个品种与止损点数，向量化一次算完
+    st.divider()
+    st.header("🎯 " + t["sizing_header"])
+    cols = st.columns(2)
+    with cols[0]:
+        equity = st.number_input(t["account_equity"].format(ccy=account_currency), min_value=0.0, value=10000.0,
+                                 step=1000.0, key="lot_sizing_equity")
+    with cols[1]:
+        risk_pct = st.slider(t["risk_per_trade"], min_value=0.1, max_value=10.0, value=1.0, step=0.1,
+                             key="lot_sizing_risk")
+    watchlist = pd.DataFrame({"Instrument": list(SYMBOLS), "Stop (pips)": 20.0})
+    uploaded = st.file_uploader(t["import_watchlist"], type=["csv", "parquet", "arrow", "feather"],
+                                key="lot_sizing_upload")
+    if uploaded is not None:
+        try:
+            watchlist = load_table(uploaded.getvalue(), uploaded.name, WATCHLIST_DTYPES)[["Instrument", "Stop (pips)"]]
+        except (KeyError, ValueError, ImportError) as e:
+            st.error(f"{t['invalid_watchlist']} {e}")
+    # 观察列表沿用导入文件的列名，只替换显示标签
+    watchlist = st.data_editor(
+        watchlist, num_rows="dynamic", hide_index=True, use_container_width=True, key="lot_sizing_watchlist",
+        column_config={"Instrument": st.column_config.SelectboxColumn(t["instrument"], options=list(SYMBOLS), required=True),
+                       "Stop (pips)": st.column_config.NumberColumn(t["stop_pips"], min_value=0.0, step=1.0)})
+    sid = symbol_ids(watchlist["Instrument"].fillna(""))
+    if (sid < 0).any():
+        st.warning(t["unknown_skipped"] + ", ".join(sorted(set(watchlist["Instrument"][sid < 0].astype(str)))))
+    sizes = position_sizes(equity, risk_pct, sid[sid >= 0], watchlist["Stop (pips)"].to_numpy(dtype=float)[sid >= 0],
+                           account_currency, quotes)
+    status_text = {OK: t["status_ok"], BELOW_MIN: t["status_below_min"], CAPPED: t["status_capped"]}
+    st.dataframe(sizes.assign(status=sizes["status"].map(status_text)).rename(columns={
+        "symbol": t["instrument"], "stop_pips": t["stop_pips"],
+        "loss_per_lot": t["loss_per_lot"].format(ccy=account_currency), "raw_lots": t["exact_lots"], "lots": t["lots"],
+        "risk": t["risk_amount"].format(ccy=account_currency), "risk_pct": t["risk_pct"], "status": t["status"],
+    }).round(4), use_container_width=True, hide_index=True)
+    st.caption(t["sizing_note"])
+
     # 常见品种标准
     with st.expander("📖 " + t["examples"], expanded=False):
         st.markdown(f"- {t['forex']}")
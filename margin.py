@@ -1,85 +1,26 @@
 import streamlit as st
 import pandas as pd
+from i18n import get_translations
+from core.instruments import SYMBOLS, CONTRACT_SIZE, symbol_id, symbol_ids, spec
+from core.margin import LEVERAGE_TIERS, TIER_CURRENCY, margin_required, portfolio_margin
+from core.rates import ACCOUNT_CURRENCIES, REFERENCE_QUOTES, quote_snapshot
 
 def margin_page():
-    translations = {
-        "en": {
-            "title": "📊 Financial Calculation Tool",
-            "calculation_formula": "📐 Calculation Formula",
-            "spread": "🔍 Calculate Spread Cost",
-            "equity": "🔍 Calculate Equity",
-            "margin": "🔍 Calculate Margin",
-            "concept": "Concept",
-            "value": "Value",
-            "unit": "Unit",
-            "enter_bid_ask": "Enter the **Bid Price** and **Ask Price** below, then enter **Leverage** and **Trade Size**, and click 'Calculate' to see the result!",
-            "selected_product": "Selected Product: ",
-            "market_info": "📖 Click to Show Market Info for ",
-            "notes": "### 📌 Notes:\n- **Leverage** affects the margin cost, amplifying both potential profits and risks.\n- The **Margin** can vary depending on market conditions and asset volatility.",
-            "contract_size": "Contract Size",
-            "decimal_places": "Decimal Places",
-            "unit_intro": "Unit refers to the standard measurement of each trading contract.",
-            "contract_intro": "Contract Size defines the amount of the asset represented by each contract. ",
-            "decimal_intro": "Decimal Places refer to the number of decimal points used in pricing. Different products have different decimal places.",
-            "select_product": "Please select the product you want to see its unit, contract size, and decimal places:",
-        },
-        "zh": {
-            "title": "📊 财务计算工具",
-            "calculation_formula": "📐 计算公式",
-            "concept": "概念",
-            "value": "值",
-            "unit": "单位",
-            "spread": "🔍 计算点差成本",
-            "equity": "🔍 计算权益",
-            "margin": "🔍 计算保证金",
-            "enter_bid_ask": "输入 **买入价** 和 **卖出价**，然后输入 **杠杆** 和 **交易规模**，点击“计算”以查看结果！",
-            "selected_product": "选择的产品: ",
-            "market_info": "📖 点击查看市场信息: ",
-            "notes": "### 📌 注意事项:\n- **杠杆** 会影响保证金成本，放大潜在利润和风险。\n- **保证金** 会根据市场条件和资产波动性而变化。",
-            "contract_size": "合约大小",
-            "decimal_places": "小数点位数",
-            "unit_intro": "单位（Unit）指每个交易合约的标准计量单位。例如，在外汇交易中，1手通常等于100,000单位的基础货币。",
-            "contract_intro": "合约大小（Contract Size）定义每个合约代表的资产数量。例如，XAU/USD（黄金）的合约大小通常是100盎司。",
-            "decimal_intro": "小数点位数（DP）指价格中保留的小数位数。不同的产品有不同的小数点位数。",
-            "select_product": "请选择你想查看其单位、合约大小和小数点位数的产品：",
-        }
-    }
+    t = get_translations("margin", st.session_state.language)
 
     # Set the page title based on selected language
-    st.title(translations[st.session_state.language]["title"])
-
-    # Products data dictionary with the full list of 19 products
-    products = {
-        "Gold (XAUUSD)": {"unit": "Ounces", "contract_size": "100 Ounces", "decimal_places": 2},
-        "Silver (XAGUSD)": {"unit": "Ounces", "contract_size": "100 Ounces", "decimal_places": 2},
-        "Oil (WTI)": {"unit": "Barrels", "contract_size": "1000 Barrels", "decimal_places": 2},
-        "Index (S&P 500)": {"unit": "Points", "contract_size": "$50 per point", "decimal_places": 2},
-        "EUR/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "GBP/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "USD/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 2},
-        "AUD/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "USD/CHF": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "USD/CAD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "NZD/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 4},
-        "EUR/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 2},
-        "GBP/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 2},
-        "BTC/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "ETH/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "BNB/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "XRP/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "LTC/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8}
-    }
+    st.title(t["title"])
 
     # Product selection
     product_selection = st.selectbox(
-        translations[st.session_state.language]["select_product"],
-        list(products.keys())
+        t["select_product"],
+        SYMBOLS
     )
 
     # Update dropdown values when product changes
-    selected_product = products[product_selection]
+    selected_product = spec(symbol_id(product_selection))
     st.session_state.selected_unit = selected_product["unit"]
-    st.session_state.selected_contract_size = selected_product["contract_size"]
+    st.session_state.selected_contract_size = selected_product["contract_label"]
     st.session_state.selected_decimal_places = selected_product["decimal_places"]
 
     # Helper function to display static rows
@@ -94,30 +35,31 @@ def margin_page():
 
     # Display static rows
     display_static_row(
-        translations[st.session_state.language]["unit"],
+        t["unit"],
         st.session_state.selected_unit,
-        translations[st.session_state.language]["unit_intro"]
+        t["unit_intro"]
     )
     display_static_row(
-        translations[st.session_state.language]["contract_size"],
+        t["contract_size"],
         st.session_state.selected_contract_size,
-        translations[st.session_state.language]["contract_intro"]
+        t["contract_intro"]
     )
     display_static_row(
-        translations[st.session_state.language]["decimal_places"],
+        t["decimal_places"],
         st.session_state.selected_decimal_places,
-        translations[st.session_state.language]["decimal_intro"]
+        t["decimal_intro"]
     )
 
     # Margin calculation logic
     bid_price = st.number_input(f"Enter **Bid Price** for {product_selection}:", min_value=0.0)
     ask_price = st.number_input(f"Enter **Ask Price** for {product_selection}:", min_value=0.0)
     leverage = st.number_input("Enter **Leverage**:", min_value=1.0, step=1.0)
-    trade_size = st.number_input(f"Enter **Trade Size** (in {st.session_state.selected_unit}):", min_value=0.0)
+    trade_size = st.number_input(t["trade_size_lots"].format(contract=selected_product["contract_label"]), min_value=0.0)
 
     if st.button("🔄 Calculate Margin"):
         if bid_price > 0 and ask_price > 0 and trade_size > 0:
-            margin = (ask_price * trade_size) / leverage
+            # 交易规模以手计，与 core.margin 及注册表的合约规模一致
+            margin = float(margin_required(ask_price, trade_size, leverage, CONTRACT_SIZE[symbol_id(product_selection)]))
             st.markdown(f"### 📊 The Margin Required: **{margin:.4f}**")
 
             cost = margin * leverage
@@ -125,7 +67,35 @@ def margin_page():
         else:
             st.warning("Please enter valid values for **Bid Price**, **Ask Price**, **Leverage**, and **Trade Size**.")
 
-    st.markdown(translations[st.session_state.language]["notes"])
+    # 组合保证金：整张持仓表按名义价值分档杠杆计算，并经交叉汇率换算为账户货币
+    with st.expander(t["portfolio_margin"], expanded=False):
+        account_currency = st.selectbox(t["account_currency"], ACCOUNT_CURRENCIES, key="pm_currency")
+        positions = st.data_editor(pd.DataFrame({
+            "Account": ["A-1001", "A-1001", "A-1002"],
+            "Instrument": ["USD/JPY", "EUR/USD", "Gold (XAUUSD)"],
+            "Lots": [5.0, 12.0, 3.0],
+            "Price": [REFERENCE_QUOTES["USD/JPY"], REFERENCE_QUOTES["EUR/USD"], REFERENCE_QUOTES["Gold (XAUUSD)"]],
+        }), num_rows="dynamic", use_container_width=True, key="pm_positions",
+            column_config={"Instrument": st.column_config.SelectboxColumn(options=SYMBOLS, required=True)})
+        positions = positions.dropna(subset=["Instrument", "Lots", "Price"])
+        sid = symbol_ids(positions["Instrument"])
+        if (sid < 0).any():
+            st.error(t["unknown_instruments"] + " " + ", ".join(sorted(set(positions["Instrument"][sid < 0].astype(str)))))
+            positions, sid = positions[sid >= 0], sid[sid >= 0]
+        if len(positions):
+            # 表中的价格覆盖参考报价，换算汇率随之更新
+            quotes = quote_snapshot(dict(zip(positions["Instrument"], positions["Price"])))
+            result = portfolio_margin(sid, positions["Lots"], CONTRACT_SIZE[sid], positions["Price"], quotes,
+                                      account_currency, account=positions["Account"].fillna(""))
+            st.markdown(t["margin_by_pair"].format(ccy=account_currency))
+            st.dataframe(result["pairs"].round(2), use_container_width=True, hide_index=True)
+            st.markdown(t["margin_by_account"].format(ccy=account_currency))
+            st.dataframe(result["accounts"].round(2), use_container_width=True)
+            st.caption(t["leverage_tiers"].format(ccy=TIER_CURRENCY) + " " + "; ".join(
+                f"{name}: " + ", ".join(f"≥{floor:,.0f} → 1:{lev:g}" for floor, lev in zip(*tiers))
+                for name, tiers in LEVERAGE_TIERS.items()))
+
+    st.markdown(t["notes"])
 
     if st.button("Export Results to CSV"):
         result = {
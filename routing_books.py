@@ -1,127 +1,12 @@
 # routing_books.py
 import streamlit as st
+from i18n import get_translations
+from core.routing import risk_score, risk_rating, suggest_route
 
 def routing_books_page():
     lang = st.session_state.get("language", "zh")
 
-    T = {
-        "en": {
-            "title": "📚 Routing Console",
-            "subtitle": "A-Book / B-Book / MM-Stream + Monitor (overlay)",
-            "legend": "A-Book = external LP; B-Book = internal; MM-Stream = internal market-making; Monitor = overlay",
-            # Formal hero (fixed policy + second-gate rule)
-            "hero_abook": "Default (fixed): route to A-Book only when the computed **risk rating > 3 AND Biggest Profit > Biggest Loss**. Ratings 1–2 remain in B-Book.",
-            "hero_note": (
-                "Monitor is not a separate stream but an overlay tag, typically applied for onboarding, compliance, or risk-control scenarios (e.g., new account, delayed activation, AML or abnormal funding cases, or when flagged by senior management/CEO). "
-                "MM-Stream is a special lane used primarily to handle heavy trade and persistent bursts with throttling/hedging."
-            ),
-            # Concepts
-            "concepts": "Concepts (formal definitions & operational intent)",
-            "concepts_md": (
-                "### A-Book\n"
-                "- **Objective**: Externalize risk to LP/market to protect internal book.\n"
-                "- **When to Use**: Clients with stable profile and **rating > 3** **and** Biggest Profit > Biggest Loss.\n"
-                "- **Key Risks**: LP depth/availability, slippage under bursts, credit lines, rejection ratios.\n"
-                "- **Controls**: LP fan-out, throttles, max order rate, per-symbol caps, liquidity tiers.\n"
-                "- **Examples**: Experienced hedgers; profit pattern not one-sided; moderate-to-large sizes with low manipulation signals.\n\n"
-                "### B-Book\n"
-                "- **Objective**: Internalize typical retail risk where edge is limited or negative; capture spread/behavioral PnL.\n"
-                "- **When to Use**: **Default** for ratings **1–2**; also ratings 4–5 **if** Biggest Profit ≤ Biggest Loss (second-gate not passed).\n"
-                "- **Key Risks**: Skilled clients, copy clusters, latency exploitation, martingale/stacking blow-ups.\n"
-                "- **Controls**: Per-account exposure caps, circuit breakers, session kill-switch, behavior monitoring.\n"
-                "- **Examples**: New/unproven accounts; profit asymmetry not established; or compliance-monitoring phase.\n\n"
-                "### MM-Stream\n"
-                "- **Objective**: An internal market-making environment to absorb **heavy/complex flows**, with the ability to throttle and hedge partially.\n"
-                "- **When to Use**: Heavy trader with large typical size or ongoing bursts, even if rating alone would suggest A/B.\n"
-                "- **Key Risks**: Inventory swings, adverse selection when hedging too late.\n"
-                "- **Controls**: Inventory bands, dynamic spreads, partial hedge-on-fill, real-time kill logic.\n"
-                "- **Examples**: High-frequency scalpers in peak hours; clustered bursts; symbol-specific stress.\n\n"
-                "### Monitor (Overlay)\n"
-                "- **Objective**: Add an operational **overlay** to any base route for enhanced supervision.\n"
-                "- **When to Use**: Onboarding (new/delayed activation) or **compliance** signals (AML, abnormal funding, CEO flagged).\n"
-                "- **Key Risks**: Rapid behavior change, KYC/AML findings, copy-leakage from risky sources.\n"
-                "- **Controls**: Tighter caps, manual review for funding/withdrawal, increased sampling of orders/logs.\n"
-                "- **Examples**: A-Book with Monitor for a seasoned but newly linked account; B-Book with Monitor during account warming."
-            ),
-            # Inputs
-            "inputs": "Inputs",
-            "recent_weight": "Recency weight (0.3–0.9)",
-            "maxp": "Biggest Profit (abs $/pips)",
-            "maxl": "Biggest Loss (abs $/pips)",
-            "avg_size": "Typical position size (lots)",
-            "burst": "Open-orders burst risk now?",
-            "heavy": "Heavy trader?",
-            "labels_title": "Select labels",
-            "chips_quick": "Quick sets",
-            "calc": "Compute suggestion",
-            # Output
-            "rating": "Computed risk rating (1–5)",
-            "route": "Suggested routing",
-            "reasons": "Attribution (why this rating)",
-            "op": "Operational notes",
-            "monitor_yes": "Add Monitor",
-            "monitor_no": "No Monitor",
-            "mm_tip": "Prefer MM-Stream under heavy with large sizes or ongoing bursts; throttle/hedge as configured.",
-        },
-        "zh": {
-            "title": "📚 路由控制台",
-            "subtitle": "A-Book / B-Book / MM-Stream + Monitor（覆盖层）",
-            "legend": "A-Book=外部LP；B-Book=内部；MM-Stream=内部做市；Monitor=覆盖层",
-            # 严谨 Hero（固定策略 + 二次门槛）
-            "hero_abook": "固定策略：只有当**风险评级 > 3 且 Biggest Profit > Biggest Loss**时，才真正进入 A-Book；评级 1–2 默认留在 B-Book。",
-            "hero_note": (
-                "Monitor 在新户/合规等场景叠加（如新开/延迟激活、AML/异常资金、CEO 标记）；"
-                "MM-Stream 属于特殊通道，主要用于处理 heavy trade 与持续爆单，可限流/分层对冲。"
-            ),
-            # 概念
-            "concepts": "概念（定义与操作目标）",
-            "concepts_md": (
-                "### A-Book\n"
-                "- **目标**：将风险对冲至外部 LP/市场，保护内部账簿。\n"
-                "- **适用条件**：客户画像稳定，且**评级 > 3** **并且** Biggest Profit > Biggest Loss（通过二次门槛）。\n"
-                "- **典型风险**：LP 深度/可得性、爆单下滑点、授信额度、拒单率。\n"
-                "- **控制手段**：LP 扇出、下单限流、单/时段订单上限、分层流动性。\n"
-                "- **使用样例**：成熟对冲型；利润不呈单边；中大仓位但操纵信号低。\n\n"
-                "### B-Book\n"
-                "- **目标**：内部化典型零售风险，获取点差/行为 PnL。\n"
-                "- **适用条件**：**默认**用于**评级 1–2**；若评级 4–5 但 **Biggest Profit ≤ Biggest Loss**（未通过二次门槛），仍留在 B-Book。\n"
-                "- **典型风险**：高水平客户、复制簇、时延套利、马丁/叠加爆仓。\n"
-                "- **控制手段**：账户敞口上限、熔断、会话级 Kill-Switch、行为监控。\n"
-                "- **使用样例**：新户/未验证画像；利润不具备单边优势；或处于合规观察期。\n\n"
-                "### MM-Stream\n"
-                "- **目标**：作为内部做市池承接**重/复杂**流，支持限流与部分对冲。\n"
-                "- **适用条件**：heavy + 大典型手数，或存在持续爆单，即便仅从评级看可能走 A/B。\n"
-                "- **典型风险**：库存波动、迟对冲导致不利选择。\n"
-                "- **控制手段**：库存带、动态点差、部分对冲（成交即对冲）、实时 Kill 逻辑。\n"
-                "- **使用样例**：高频剥头皮的峰值时段；簇状爆单；品种突发应激。\n\n"
-                "### Monitor（覆盖层）\n"
-                "- **目标**：在任一路由上叠加操作监督层。\n"
-                "- **适用条件**：新户/延迟激活，或**合规**信号（AML、异常资金、CEO 标记）。\n"
-                "- **典型风险**：行为快速变化、KYC/AML 发现、来自高风险来源的复制外溢。\n"
-                "- **控制手段**：更严格的限额、资金流人工复核、订单/日志抽样频率提升。\n"
-                "- **使用样例**：A-Book with Monitor；B-Book with Monitor。"
-            ),
-            # 输入
-            "inputs": "输入项",
-            "recent_weight": "最近行为权重（0.3–0.9）",
-            "maxp": "Biggest Profit（绝对值 $/点）",
-            "maxl": "Biggest Loss（绝对值 $/点）",
-            "avg_size": "典型持仓规模（手）",
-            "burst": "当前是否存在爆单/开单骤增？",
-            "heavy": "是否 Heavy Trader？",
-            "labels_title": "选择标签",
-            "chips_quick": "快捷组合",
-            "calc": "计算建议",
-            # 输出
-            "rating": "风险评级（1–5）",
-            "route": "路由建议",
-            "reasons": "评级归因（为何得到该分）",
-            "op": "操作提示",
-            "monitor_yes": "建议加 Monitor",
-            "monitor_no": "无需 Monitor",
-            "mm_tip": "Heavy 且大手数或持续爆单时优先考虑 MM-Stream，并配置限流/分层对冲。",
-        }
-    }[lang]
+    T = get_translations("routing_books", lang)
 
     LABELS_ALL = [
         "scalper","ultra short trader","hedger","martingale","arbitrage","stacking","fast TP",
@@ -206,96 +91,17 @@ def routing_books_page():
     # ------- Compute -------
     st.divider()
     if st.button("✅ " + T["calc"]):
-        score = 0.0
-        reasons = []
-
-        # Profit/Loss shape
-        if max_profit > 0 or max_loss > 0:
-            ratio = (max_profit + 1e-9) / (max_loss + 1e-9)
-            prof_signal = 2.0 * (ratio - 1.0) / (abs(ratio) + 1.0)  # bounded symmetric transform
-            score += prof_signal
-            reasons.append(f"P/L shape ratio≈{ratio:.2f} → {prof_signal:+.2f}")
-
-        # Size buckets
-        if "trade 6+ lots per position" in chosen_labels or avg_size >= 6:
-            score += 1.2; reasons.append("Size ≥6 lots → +1.2")
-        elif "trade 3-6 lots per position" in chosen_labels or avg_size >= 3:
-            score += 0.7; reasons.append("Size 3–6 lots → +0.7")
-        elif "trade 1-3 lots per position" in chosen_labels or avg_size >= 1:
-            score += 0.3; reasons.append("Size 1–3 lots → +0.3")
-
-        # Risk-up
-        risk_up = {
-            "scalper": 0.6, "ultra short trader": 0.7, "martingale": 1.3, "arbitrage": 1.0,
-            "stacking": 0.7, "fast TP": 0.5, "system spam orders": 0.9, "first two abnormal": 0.5,
-            "changing trading behaviour": 0.4, "changing EA": 0.4, "increasing trading size": 0.6,
-            "AML": 1.6, "abnormal funding": 1.1, "large order": 0.8, "medium order": 0.4,
-            "pending order": 0.2, "Day trade": 0.3, "copy trade": 0.6
-        }
-        for lb, w in risk_up.items():
-            if lb in chosen_labels:
-                score += w; reasons.append(f"Label '{lb}' → +{w}")
-
-        # Risk-down
-        risk_down = {
-            "hedger": -0.7, "experience trader": -0.4, "low frequency trading": -0.25,
-            "swing trader": -0.15, "holds profit/loss": -0.15, "withdraw profit": -0.15,
-            "no trade": -0.25, "inactive now": -0.35, "profiting": -0.15,
-        }
-        for lb, w in risk_down.items():
-            if lb in chosen_labels:
-                score += w; reasons.append(f"Label '{lb}' → {w}")
-
-        # Heavy affects rating only
-        if heavy:
-            score += 0.6; reasons.append("Heavy trader → +0.6 (rating influence only)")
-
-        # Recency weighting
-        score *= (0.5 + recent_weight/2)
-        reasons.append(f"Recency weighting {recent_weight:.2f} applied")
-
-        # Map to rating 1–5
-        rating_raw = 3 + 2 * (score / 3.0)
-        rating = int(min(5, max(1, round(rating_raw))))
+        score, reasons = risk_score(max_profit, max_loss, avg_size, chosen_labels, heavy, recent_weight)
+        rating = risk_rating(score)
 
         # ----- Routing (fixed) with second-gate -----
-        abook_gate = (rating > 3) and (max_profit > max_loss)
-
-        if abook_gate:
-            base_route = "A-Book"
-            route_badge = "<span class='route-badge route-ab'>A-Book</span>"
-            base_note = "Rating > 3 and Biggest Profit > Biggest Loss → route to A-Book."
-        else:
-            base_route = "B-Book"
-            route_badge = "<span class='route-badge route-bb'>B-Book</span>"
-            if rating > 3 and not (max_profit > max_loss):
-                base_note = "Rating > 3 but Biggest Profit ≤ Biggest Loss → stay in B-Book."
-            else:
-                base_note = "Rating ≤ 3 → stay in B-Book."
-
-        # MM heuristic (non-forcing)
-        prefer_mm = False
-        if heavy and (avg_size >= 3 or "trade 3-6 lots per position" in chosen_labels or "trade 6+ lots per position" in chosen_labels):
-            prefer_mm = True
-        if burst and (heavy or avg_size >= 3):
-            prefer_mm = True
-
-        # Monitor overlay (no correlation input)
-        need_monitor = False
-        op_notes = [base_note]
-
-        if "new account" in chosen_labels or "delay trade activation" in chosen_labels:
-            need_monitor = True
-            op_notes.append("Onboarding: add Monitor.")
-        if "AML" in chosen_labels or "abnormal funding" in chosen_labels or "CEO flagged" in chosen_labels:
-            need_monitor = True
-            op_notes.append("Compliance flags: add Monitor.")
-
-        # Burst notes
-        if burst and base_route == "A-Book":
-            op_notes.append("Burst on A-Book: verify LP depth, throttles, credit lines.")
-        elif burst:
-            op_notes.append("Burst internalized: enforce throttles/position caps/circuit breakers.")
+        suggestion = suggest_route(rating, max_profit, max_loss, avg_size, chosen_labels, heavy, burst)
+        base_route = suggestion["base_route"]
+        prefer_mm = suggestion["prefer_mm"]
+        need_monitor = suggestion["need_monitor"]
+        op_notes = suggestion["op_notes"]
+        route_badge = ("<span class='route-badge route-ab'>A-Book</span>" if base_route == "A-Book"
+                       else "<span class='route-badge route-bb'>B-Book</span>")
 
         if prefer_mm:
             op_notes.append(T["mm_tip"])
@@ -1,80 +1,27 @@
+import io
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from i18n import get_translations
+from charts import CHART_ENGINES, bar_chart_png, bar_chart_altair
+from core.instruments import SYMBOLS, DECIMAL_PLACES, UNIT, symbol_id, spec
+from core.spread import compare_spreads, style_by_precision
+from core.fixed import on_grid, spread_ticks, from_ticks
+from core.ticks import summarize_tick_file
+from core.costs import summarize_order_log
+from core.sketch import SpreadSketch, merge_sketches
+from core.files import load_table, source_hash
+
+# LP 报价对比文件的列：Symbol, LP, Bid, Ask（可选 Leverage, Trade Size）
+LP_QUOTE_DTYPES = {"Symbol": str, "LP": str, "Bid": np.float64, "Ask": np.float64,
+                   "Leverage": np.float64, "Trade Size": np.float64}
+
 def spread_page():
-    translations = {
-    "en": {
-        "title": "📊 Financial Calculation Tool",
-        "calculation_formula": "📐 Calculation Formula",
-        "spread": "🔍 Calculate Spread Cost",
-        "equity": "🔍 Calculate Equity",
-        "margin": "🔍 Calculate Margin",
-        "concept": "Concept",
-        "value": "Value",
-        "unit": "Unit",
-        "enter_bid_ask": "Enter the **Bid Price** and **Ask Price** below, then enter **Leverage** and **Trade Size**, and click 'Calculate' to see the result!",
-        "selected_product": "Selected Product: ",
-        "market_info": "📖 Click to Show Market Info for ",
-        "notes": "### 📌 Notes:\n- **Leverage** affects the spread cost, amplifying both potential profits and risks.\n- The **Spread** can vary depending on market conditions and asset volatility.",
-        "contract_size": "Contract Size",
-        "decimal_places": "Decimal Places",
-        "unit_intro": "Unit refers to the standard measurement of each trading contract.",
-        "contract_intro": "Contract Size defines the amount of the asset represented by each contract.",
-        "decimal_intro": "Decimal Places refer to the number of decimal points used in pricing. Different products have different decimal places.",
-        "select_product": "Please select the product you want to see its unit, contract size, and decimal places:",
-        "pips_vs_points": "### 📌 Pips vs Points\n\n- **Pips** (Percentage in Points) is the smallest price movement in most **forex currency pairs**, typically **0.0001**.\n- In **JPY pairs**, a pip is defined as **0.01** (two decimal places).\n- **Points** refer to price changes in **stocks**, **commodities**, and **futures** markets, usually representing a **whole unit** price change.",
-        "spread_calculation": "### 📌 Spread Calculation Formula\n\nThe formula to calculate the spread is:\n\n$$\text{Spread} = \text{Ask Price in pips} - \text{Bid Price in pips}$$",
-        "calculation_example": "### 💡 Calculation Example\n\nFor example, if the **Bid Price** for EUR/USD is 1.2000 and the **Ask Price** is 1.2005, then:"
-    },
-    "zh": {
-        "title": "📊 财务计算工具",
-        "calculation_formula": "📐 计算公式",
-        "concept": "概念",
-        "value": "值",
-        "unit": "单位",
-        "spread": "🔍 计算点差成本",
-        "equity": "🔍 计算权益",
-        "margin": "🔍 计算保证金",
-        "enter_bid_ask": "输入 **买入价** 和 **卖出价**，然后输入 **杠杆** 和 **交易规模**，点击“计算”以查看结果！",
-        "selected_product": "选择的产品: ",
-        "market_info": "📖 点击查看市场信息: ",
-        "notes": "### 📌 注意事项:\n- **杠杆** 会影响点差成本，放大潜在利润和风险。\n- **点差** 会根据市场条件和资产波动性而变化。",
-        "contract_size": "合约大小",
-        "decimal_places": "小数点位数",
-        "unit_intro": "单位（Unit）指每个交易合约的标准计量单位。例如，在外汇交易中，1手通常等于100,000单位的基础货币。",
-        "contract_intro": "合约大小（Contract Size）定义每个合约代表的资产数量。例如，XAU/USD（黄金）的合约大小通常是100盎司。",
-        "decimal_intro": "小数点位数（DP）指价格中保留的小数位数。不同的产品有不同的小数点位数。",
-        "select_product": "请选择你想查看其单位、合约大小和小数点位数的产品：",
-        "pips_vs_points": "### 📌 Pips 与 Points\n\n- **Pips**（Percentage in Points）是大多数 **外汇货币对** 的最小价格变动，通常为 **0.0001**。\n- 在 **JPY 货币对** 中，1个 pip 定义为 **0.01**（两位小数）。\n- **Points** 用于 **股票**、**商品** 和 **期货** 市场，通常表示 **一个整体单位** 的价格变动。",
-        "spread_calculation": "### 📌 点差计算公式\n\n计算点差的公式是：\n\n$$\text{Spread} = \text{买入价（Bid Price）以pips为单位} - \text{卖出价（Ask Price）以pips为单位}$$",
-        "calculation_example": "### 💡 计算示例\n\n例如，如果 **EUR/USD** 的 **买入价** 为 1.2000，**卖出价** 为 1.2005，则："
-    }
-}
+    t = get_translations("spread", st.session_state.language)
 
     # Set the page title based on selected language
-    st.title(translations[st.session_state.language]["title"])
-
-    # Products data dictionary with the full list of 19 products
-    products = {
-        "Gold (XAUUSD)": {"unit": "Ounces", "contract_size": "100 Ounces", "decimal_places": 2},
-        "Silver (XAGUSD)": {"unit": "Ounces", "contract_size": "1000 Ounces", "decimal_places": 3},
-        "Oil (WTI)": {"unit": "Barrels", "contract_size": "1000 Barrels", "decimal_places": 2},
-        "Index (S&P 500)": {"unit": "Points", "contract_size": "$50 per point", "decimal_places": 2},
-        "EUR/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "GBP/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "USD/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 3},
-        "AUD/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "USD/CHF": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "USD/CAD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "NZD/USD": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 5},
-        "EUR/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 3},
-        "GBP/JPY": {"unit": "Units of Base Currency", "contract_size": "100,000 Units", "decimal_places": 3},
-        "BTC/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "ETH/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "BNB/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "XRP/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8},
-        "LTC/USD": {"unit": "Coins", "contract_size": "1 Coin", "decimal_places": 8}
-    }
+    st.title(t["title"])
+
 
 
 
@@ -85,14 +32,14 @@ def spread_page():
 
     # Product selection
     product_selection = st.selectbox(
-        translations[st.session_state.language]["select_product"],
-        list(products.keys())
+        t["select_product"],
+        SYMBOLS
     )
 
     # Update dropdown values when product changes
-    selected_product = products[product_selection]
+    selected_product = spec(symbol_id(product_selection))
     st.session_state.selected_unit = selected_product["unit"]
-    st.session_state.selected_contract_size = selected_product["contract_size"]
+    st.session_state.selected_contract_size = selected_product["contract_label"]
     st.session_state.selected_decimal_places = selected_product["decimal_places"]
 
 
@@ -117,29 +64,29 @@ def spread_page():
         with col1:
             st.write("##")  # Empty header for first column
         with col2:
-            st.write(f"### {translations[st.session_state.language]['concept']}")
+            st.write(f"### {t['concept']}")
         with col3:
-            st.write(f"### {translations[st.session_state.language]['value']}")
+            st.write(f"### {t['value']}")
         
         # Unit row
         display_static_row(
-            translations[st.session_state.language]["unit"],
+            t["unit"],
             st.session_state.selected_unit,
-            translations[st.session_state.language]["unit_intro"]
+            t["unit_intro"]
         )
 
         # Contract Size row
         display_static_row(
-            translations[st.session_state.language]["contract_size"],
+            t["contract_size"],
             st.session_state.selected_contract_size,
-            translations[st.session_state.language]["contract_intro"]
+            t["contract_intro"]
         )
 
         # Decimal Places row
         display_static_row(
-            translations[st.session_state.language]["decimal_places"],
+            t["decimal_places"],
             st.session_state.selected_decimal_places,
-            translations[st.session_state.language]["decimal_intro"]
+            t["decimal_intro"]
         )
 
     # Apply some CSS to style the table
@@ -237,33 +184,172 @@ def spread_page():
         market_info = "No specific market info available." if st.session_state.language == 'en' else "没有具体的市场信息。"
 
     # Display product and unit
-    st.write(f"{translations[st.session_state.language]['selected_product']} **{product_selection}** (Unit: **{unit}**)")
+    st.write(f"{t['selected_product']} **{product_selection}** (Unit: **{unit}**)")
 
     # Display market info in an expandable section
-    with st.expander(f"{translations[st.session_state.language]['market_info']} {product_selection}"):
+    with st.expander(f"{t['market_info']} {product_selection}"):
         st.write(f"### 📈 {market_info}")
-    st.subheader(translations[st.session_state.language]["calculation_formula"])
+    st.subheader(t["calculation_formula"])
  
   
-    st.markdown(translations[st.session_state.language]["pips_vs_points"])
+    st.markdown(t["pips_vs_points"])
 
     # Use st.latex for rendering the formula properly
     st.latex(r"Spread = \text{Ask Price in pips} - \text{Bid Price in pips}")
 
-    st.markdown(translations[st.session_state.language]["calculation_example"])
+    st.markdown(t["calculation_example"])
     st.latex(r"Spread = 1.2005 - 1.2000 = 0.0005 \quad \text{(5 pips)}")
 
 
         
 
     # "Try Calculate" button section
-    st.subheader(translations[st.session_state.language]["spread"])
+    st.subheader(t["spread"])
+
+    # 多 LP 报价批量对比：CSV 列 Symbol, LP, Bid, Ask（可选 Leverage, Trade Size）
+    with st.expander(t["lp_compare"]):
+        quotes_file = st.file_uploader(t["lp_upload"], type=["csv"], key="lp_quotes")
+        if quotes_file is not None:
+            try:
+                quotes = load_table(quotes_file.getvalue(), quotes_file.name, LP_QUOTE_DTYPES)
+                lp_results = compare_spreads(
+                    quotes["Symbol"], quotes["Bid"], quotes["Ask"],
+                    quotes["Leverage"] if "Leverage" in quotes else 1.0,
+                    quotes["Trade Size"] if "Trade Size" in quotes else 0.0,
+                    lp=quotes["LP"] if "LP" in quotes else None,
+                )
+            except (KeyError, ValueError, ImportError) as e:
+                st.error(f"{t['lp_invalid']} {e}")
+            else:
+                decimals = lp_results["Decimal Places"].to_numpy()
+                off_grid = ~(on_grid(quotes["Bid"].to_numpy(dtype=float), decimals)
+                             & on_grid(quotes["Ask"].to_numpy(dtype=float), decimals))
+                if off_grid.any():
+                    st.warning(t["off_grid"].format(n=int(off_grid.sum())))
+                if "LP" in lp_results:
+                    st.markdown(t["lp_pivot"])
+                    st.dataframe(lp_results.pivot_table(index="Product", columns="LP", values="Spread (pips)", aggfunc="mean").round(1))
+                st.dataframe(style_by_precision(
+                    lp_results, ["Bid Price", "Ask Price", "Spread"],
+                    formats={"Spread (pips)": "{:.1f}", "Spread Cost": "{:.4f}", "Leverage": "{:.2f}"}
+                ))
+
+    # 逐笔 tick 文件流式点差监控：分块读取，按品种滚动统计 + 时间加权平均点差
+    with st.expander(t["tick_analytics"]):
+        tick_file = st.file_uploader(t["tick_upload"], type=["csv", "parquet"], key="tick_file")
+        tick_path = st.text_input(t["tick_path"], key="tick_path")
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            window = st.number_input(t["rolling_window"], min_value=1, value=1000, step=100, key="tick_window")
+        with c2:
+            percentile = st.slider(t["percentile"], 50, 99, 95, key="tick_percentile")
+        with c3:
+            chunksize = st.selectbox(t["chunk_size"], [100_000, 500_000, 1_000_000], index=1, key="tick_chunksize")
+        source = tick_file if tick_file is not None else tick_path.strip()
+        if source and st.button(t["run_ticks"]):
+            progress = st.empty()
+            processed = [0]
+            minute_stats = []
+            # 同时累积 (品种, 日期, 小时) 分位数草图；按文件内容哈希存入会话，重复运行同一文件只替换不重复计数
+            sketch = SpreadSketch()
+
+            def on_chunk(stats):
+                processed[0] += len(stats)
+                progress.caption(t["ticks_progress"].format(n=processed[0]))
+                # 图表只保留每分钟最后一个滚动均值，内存与文件大小无关
+                minute_stats.append(stats.set_index("timestamp").groupby("symbol")["roll_mean"].resample("1min").last())
+                sketch.update(stats["timestamp"], stats["symbol"], stats["spread_pips"])
+
+            try:
+                digest = source_hash(source)
+                tick_summary = summarize_tick_file(source, window, percentile, chunksize, on_chunk=on_chunk)
+            except (KeyError, ValueError, OSError) as e:
+                st.error(f"{t['ticks_failed']} {e}")
+            else:
+                progress.caption(t["ticks_done"].format(n=processed[0]))
+                st.session_state.setdefault("spread_sketches", {})[digest] = sketch
+                st.dataframe(tick_summary.round(3), use_container_width=True, hide_index=True)
+                if minute_stats:
+                    per_minute = pd.concat(minute_stats).groupby(level=[0, 1]).last().unstack(level=0)
+                    st.markdown(t["rolling_chart"])
+                    st.line_chart(per_minute)
+
+    # 成交日志批量点差成本：逐笔、按品种、按账户，分块处理并显示进度
+    with st.expander(t["order_log_cost"]):
+        fills_file = st.file_uploader(t["fills_upload"], type=["csv", "parquet"], key="fills_file")
+        fills_path = st.text_input(t["fills_path"], key="fills_path")
+        fills_chunksize = st.selectbox(t["chunk_size"], [100_000, 250_000, 1_000_000], index=1, key="fills_chunksize")
+        source = fills_file if fills_file is not None else fills_path.strip()
+        if source and st.button(t["run_costs"]):
+            progress = st.progress(0.0, text=t["fills_reading"])
+            preview = []
+
+            def on_fills(costs, done):
+                progress.progress(done, text=t["fills_progress"].format(done=done))
+                # 逐笔明细只保留前 1,000 行预览，汇总表由 summary 累计
+                if sum(len(p) for p in preview) < 1000:
+                    preview.append(costs.head(1000))
+
+            try:
+                cost_summary = summarize_order_log(source, fills_chunksize, on_chunk=on_fills)
+            except (KeyError, ValueError, OSError) as e:
+                st.error(f"{t['costs_failed']} {e}")
+            else:
+                progress.progress(1.0, text=t["fills_done"].format(n=cost_summary.fills))
+                if cost_summary.skipped:
+                    st.warning(t["fills_skipped"].format(n=cost_summary.skipped))
+                st.caption(t["costs_currency"])
+                if preview:
+                    st.markdown(t["per_trade"])
+                    st.dataframe(pd.concat(preview).head(1000), use_container_width=True, hide_index=True)
+                by_symbol = cost_summary.by_symbol()
+                by_account = cost_summary.by_account()
+                st.markdown(t["per_symbol"])
+                st.dataframe(by_symbol.round(4), use_container_width=True, hide_index=True)
+                st.markdown(t["per_account"])
+                st.dataframe(by_account.round(4), use_container_width=True, hide_index=True)
+                c1, c2 = st.columns(2)
+                with c1:
+                    st.download_button(t["symbol_costs_csv"], by_symbol.to_csv(index=False).encode("utf-8"),
+                                       file_name="spread_cost_by_symbol.csv", mime="text/csv")
+                with c2:
+                    st.download_button(t["account_costs_csv"], by_account.to_csv(index=False).encode("utf-8"),
+                                       file_name="spread_cost_by_account.csv", mime="text/csv")
     selected_products = st.multiselect(
     "🔍 Select multiple products to compare:",
-    list(products.keys())
+    SYMBOLS
 
     
 ) 
+    # 基于预计算草图的历史点差分位数，毫秒级响应；会话中的草图按文件内容哈希区分，同一文件只计一次
+    with st.expander(t["sketch_quantiles"]):
+        sketches = st.session_state.setdefault("spread_sketches", {})
+        sketch_file = st.file_uploader(t["sketch_upload"], type=["npz"], key="sketch_file")
+        if sketch_file is not None:
+            try:
+                sketches[source_hash(sketch_file)] = SpreadSketch.load(sketch_file)
+            except (KeyError, ValueError, OSError) as e:
+                st.error(f"{t['sketch_failed']} {e}")
+        sketch = merge_sketches(sketches.values())
+        if sketch.counts.empty:
+            st.info(t["sketch_empty"])
+        else:
+            days = sketch.counts.index.get_level_values("day")
+            c1, c2 = st.columns(2)
+            with c1:
+                day_range = st.date_input(t["days"], (days.min().date(), days.max().date()), key="sketch_days")
+            with c2:
+                hour_range = st.slider(t["hours_utc"], 0, 23, (0, 23), key="sketch_hours")
+            start, end = (day_range + (None, None))[:2] if isinstance(day_range, tuple) else (day_range, day_range)
+            quantile_table = sketch.quantiles(
+                (0.5, 0.95, 0.99), symbols=selected_products or [product_selection], start=start, end=end,
+                hours=range(hour_range[0], hour_range[1] + 1)
+            )
+            st.dataframe(quantile_table.round(3), use_container_width=True)
+            buffer = io.BytesIO()
+            sketch.save(buffer)
+            st.download_button(t["download_sketch"], buffer.getvalue(), file_name="spread_sketch.npz")
+
     if len(selected_products) >= 2:
 
         with st.expander("⚙️ Click here to input parameters for selected products", expanded=True):
@@ -271,16 +357,12 @@ def spread_page():
 
             for product in selected_products:
                 st.markdown(f"### 🎯 **{product}**")
-                decimal_places = products[product]["decimal_places"]
-                unit = products[product]["unit"]
+                sid = symbol_id(product)
+                decimal_places = int(DECIMAL_PLACES[sid])
+                unit = UNIT[sid]
 
                 # 调整后的更佳列宽比例
                 cols = st.columns([1, 1, 1, 1])
-                def check_decimal_places(value, decimal_places):
-                    # 如果输入的价格的实际小数位数不符合要求，返回 False
-                    if len(str(value).split('.')[-1]) > decimal_places:
-                        return False
-                    return True
 
                 with cols[0]:
                     bid_price = st.number_input(
@@ -290,13 +372,6 @@ def spread_page():
                         step=10 ** (-decimal_places),
                         key=f"bid_{product}"
                     )
-                    if not check_decimal_places(bid_price, decimal_places):
-                        show_warning_bid = True
-                    else:
-                        show_warning_bid = False
-
-                    if show_warning_bid:
-                        st.warning(f"**Warning:** Bid Price for {product_selection} should have {decimal_places} decimal places.")  # 显示警告消息
                 with cols[1]:
                     ask_price = st.number_input(
                         f"{product} - Ask Price",
@@ -331,56 +406,45 @@ def spread_page():
                     "Unit": unit
                 }
 
+            # 所有产品的买卖价一次性校验是否落在各自的价格网格上
+            inputs = pd.DataFrame.from_dict(product_inputs, orient="index")
+            decimals = inputs["Decimal Places"].to_numpy()
+            off_grid = ~(on_grid(inputs["Bid Price"].to_numpy(dtype=float), decimals)
+                         & on_grid(inputs["Ask Price"].to_numpy(dtype=float), decimals))
+            for product, dp in zip(inputs.index[off_grid], decimals[off_grid]):
+                st.warning(f"**Warning:** Prices for {product} should have {dp} decimal places.")
+
+            chart_engine = st.radio("Chart", CHART_ENGINES, horizontal=True, key="compare_chart_engine")
             if st.button("🔄 Calculate & Compare"):
-                results = []
-                for product, params in product_inputs.items():
-                    bid = params["Bid Price"]
-                    ask = params["Ask Price"]
-                    lev = params["Leverage"]
-                    size = params["Trade Size"]
-                    spread = ask - bid
-                    cost = spread * size / lev
-
-                    results.append({
-                        "Product": product,
-                        "Bid Price": bid,
-                        "Ask Price": ask,
-                        "Spread": spread,
-                        "Leverage": lev,
-                        "Trade Size": size,
-                        "Spread Cost": cost,
-                        "Decimal Places": params["Decimal Places"]  # 新增用于动态格式化
-                    })
-
-                df_results = pd.DataFrame(results)
-
-                # 动态格式化展示表格
-                styled_df = df_results.style.format({
-                    "Bid Price": lambda x, dp=df_results: f"{x:.{dp.loc[dp['Bid Price']==x, 'Decimal Places'].iloc[0]}f}",
-                    "Ask Price": lambda x, dp=df_results: f"{x:.{dp.loc[dp['Ask Price']==x, 'Decimal Places'].iloc[0]}f}",
-                    "Spread": lambda x, dp=df_results: f"{x:.{dp.loc[dp['Spread']==x, 'Decimal Places'].iloc[0]}f}",
-                    "Spread Cost": "{:.4f}",
-                    "Trade Size": lambda x, dp=df_results: f"{x:.{dp.loc[dp['Trade Size']==x, 'Decimal Places'].iloc[0]}f}",
-                    "Leverage": "{:.2f}"
-                })
+                # 一次向量化计算全部产品，每行自带精度用于格式化
+                df_results = compare_spreads(
+                    list(product_inputs.keys()),
+                    [p["Bid Price"] for p in product_inputs.values()],
+                    [p["Ask Price"] for p in product_inputs.values()],
+                    [p["Leverage"] for p in product_inputs.values()],
+                    [p["Trade Size"] for p in product_inputs.values()],
+                )
+                styled_df = style_by_precision(
+                    df_results, ["Bid Price", "Ask Price", "Spread", "Trade Size"],
+                    formats={"Spread (pips)": "{:.1f}", "Spread Cost": "{:.4f}", "Leverage": "{:.2f}"}
+                )
 
                 st.markdown("### 📋 Comparison Results")
                 st.dataframe(styled_df)
 
-                # Fancy可视化展示Spread Cost对比
-                fig, ax = plt.subplots(figsize=(10, 5))
-                bars = ax.bar(df_results["Product"], df_results["Spread Cost"], color='skyblue')
-
-                ax.set_xlabel("Product")
-                ax.set_ylabel("Spread Cost")
-                ax.set_title("📊 Spread Cost Comparison")
-                ax.grid(axis='y', linestyle='--', alpha=0.7)
-
-                for bar in bars:
-                    yval = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2, yval, f'{yval:.4f}', va='bottom', ha='center', fontsize=10, fontweight='bold')
-
-                st.pyplot(fig)
+                # Spread Cost 对比图：默认 Altair，matplotlib 仅在选择时导入且输出按输入缓存
+                if chart_engine == "Matplotlib":
+                    st.image(bar_chart_png(
+                        df_results["Product"], df_results["Spread Cost"],
+                        "Product", "Spread Cost", "📊 Spread Cost Comparison"
+                    ))
+                elif chart_engine == "Altair":
+                    st.altair_chart(bar_chart_altair(
+                        df_results["Product"], df_results["Spread Cost"],
+                        "Product", "Spread Cost", "📊 Spread Cost Comparison"
+                    ), use_container_width=True)
+                else:
+                    st.bar_chart(df_results.set_index("Product")["Spread Cost"])
 
                 # CSV导出功能（去掉Decimal Places列）
                 csv = df_results.drop(columns=["Decimal Places"]).to_csv(index=False).encode('utf-8')
@@ -393,7 +457,7 @@ def spread_page():
 
     else:
         # st.info("ℹ️ Select at least **2 products** to trigger the comparison form.")
-        st.write(translations[st.session_state.language]["enter_bid_ask"])
+        st.write(t["enter_bid_ask"])
 
         
 
@@ -405,21 +469,10 @@ def spread_page():
         # User input fields with styling
         col1, col2 = st.columns(2)
 
-        unit = products[product_selection]["unit"]
-        contract_size = products[product_selection]["contract_size"]
-        decimal_places = products[product_selection]["decimal_places"]
-
+        unit = selected_product["unit"]
+        contract_size = selected_product["contract_label"]
+        decimal_places = selected_product["decimal_places"]
 
-        # 检查用户输入的价格是否符合 decimal_places
-        def check_decimal_places(value, decimal_places):
-            # 如果输入的价格的实际小数位数不符合要求，返回 False
-            if len(str(value).split('.')[-1]) > decimal_places:
-                return False
-            return True
-
-        # 用于存储是否需要显示警告的状态
-        show_warning_bid = False
-        show_warning_ask = False
 
         with col1:
             bid_price = st.number_input(
@@ -430,12 +483,7 @@ def spread_page():
                 key=f"bid_price_{product_selection}"  # 确保唯一的 key
             )
             # 检查输入的小数位数是否符合要求
-            if not check_decimal_places(bid_price, decimal_places):
-                show_warning_bid = True
-            else:
-                show_warning_bid = False
-
-            if show_warning_bid:
+            if not on_grid(bid_price, decimal_places):
                 st.warning(f"**Warning:** Bid Price for {product_selection} should have {decimal_places} decimal places.")  # 显示警告消息
 
         with col2:
@@ -447,20 +495,15 @@ def spread_page():
                 key=f"ask_price_{product_selection}"  # 确保唯一的 key
             )
             # 检查输入的小数位数是否符合要求
-            if not check_decimal_places(ask_price, decimal_places):
-                show_warning_ask = True
-            else:
-                show_warning_ask = False
-
-            if show_warning_ask:
+            if not on_grid(ask_price, decimal_places):
                 st.warning(f"**Warning:** Ask Price for {product_selection} should have {decimal_places} decimal places.")  # 显示警告消息
 
 
         # Input for leverage and trade size
         leverage = st.number_input("Enter **Leverage**:" if st.session_state.language == 'en' else "输入 **杠杆**:", min_value=1.0, step=1.0)
-        unit = products[product_selection]["unit"]
-        contract_size = products[product_selection]["contract_size"]
-        decimal_places = products[product_selection]["decimal_places"]
+        unit = selected_product["unit"]
+        contract_size = selected_product["contract_label"]
+        decimal_places = selected_product["decimal_places"]
 
         # 根据产品动态设置 Trade Size 输入框
         trade_size_label = f"Enter **Trade Size** (e.g., in {unit}):" if st.session_state.language == 'en' else f"输入 **交易规模** (例如，{unit}):"
@@ -481,7 +524,8 @@ def spread_page():
         # 点差计算逻辑
         if st.button("🔄 Calculate Spread" if st.session_state.language == 'en' else "🔄 计算点差"):
             if bid_price > 0 and ask_price > 0 and trade_size > 0:
-                spread = ask_price - bid_price
+                # 在整数 tick 上求点差，避免浮点误差
+                spread = float(from_ticks(spread_ticks(bid_price, ask_price, decimal_places), decimal_places))
                 st.markdown(f"### 📊 The Spread: **{spread:.4f}** (or **{spread * 10000:.0f} {unit}**)" if st.session_state.language == 'en' else f"### 📊 点差: **{spread:.4f}** (或 **{spread * 10000:.0f} {unit}**)")
 
                 cost = spread * trade_size / leverage
@@ -493,7 +537,7 @@ def spread_page():
     
 
         # Display additional notes
-        st.markdown(translations[st.session_state.language]["notes"])
+        st.markdown(t["notes"])
 
         if st.button("Export Results to CSV" if st.session_state.language == 'en' else "导出结果为CSV"):
         
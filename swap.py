@@ -1,117 +1,23 @@
+import datetime
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-st.set_page_config(layout="wide")
+from i18n import get_translations
+from core.files import load_table
+from core.instruments import SYMBOLS, symbol_id, require_symbol_ids
+from core.swap import (ROLLOVER_TIME, SWAP_RATE_COLUMNS, SWAP_RATE_DTYPES, SwapRates, accrue_swap, parse_holidays,
+                       rollovers, trade_swaps)
+
+# 批量计提上传文件的列
+POSITION_COLUMNS = ["symbol", "direction", "lots", "swap_long", "swap_short", "open_time", "close_time"]
+POSITION_DTYPES = {"symbol": str, "direction": str, "lots": np.float64, "swap_long": np.float64,
+                   "swap_short": np.float64, "open_time": str, "close_time": str, "swap": np.float64}
 
 def swap_page():
-    translations = {
-        "en": {
-            "title": "💱 Swap & Triple Swap Guide",
-            "concept_title": "What is Swap (Overnight Interest)?",
-            "concept": (
-                "Swap, or overnight interest, is the cost or income incurred for holding a position overnight in leveraged products such as Forex, metals, indices, energy, and cryptocurrencies. "
-                "It’s calculated based on the interest rate differential of the two currencies or by broker's standard rates for commodities. "
-                "Swap can be **positive (you earn)** or **negative (you pay)** depending on position direction and product."
-            ),
-            "triple_swap_title": "What is Triple Swap (3x Swap)?",
-            "triple_swap": (
-                "On certain days, usually Wednesdays for FX/Metals, swap is charged **three times** to account for settlement over weekends. "
-                "For cryptocurrencies, triple swap is typically applied on Fridays. Always check your broker’s rules!"
-            ),
-            "common_time_title": "🕑 When is Swap Applied?",
-            "common_time": [
-                "**FX, Metals, Indices:** Swap is charged at broker's rollover time (often 5am Sydney / 5pm New York).",
-                "**Triple Swap:** Applied on Wednesday night (for FX/metals), Friday night (for crypto), or as broker specifies.",
-                "**No swap on weekends:** But triple swap covers Sat+Sun.",
-                "**Major holidays:** Swap may be adjusted before/after public holidays."
-            ],
-            "positive_swap": "💡 When Do You Earn or Pay Swap?",
-            "earn_swap": [
-                "You **earn** swap (get paid) when the interest rate of the bought asset is higher than that of the sold asset, after considering broker commissions.",
-                "Example: Buy AUD/USD (if AUD rate > USD rate), you might receive positive swap."
-            ],
-            "pay_swap": [
-                "You **pay** swap (get charged) when the interest rate of the sold asset is higher, or the broker’s swap/commission makes it negative overall.",
-                "Example: Sell AUD/USD (if AUD rate < USD rate), you pay swap."
-            ],
-            "products_title": "Swap Rules by Product",
-            "product_table_cols": ["Product", "Triple Swap Day", "Swap Basis", "Common Currencies Involved"],
-            "table_fx": ["Forex", "Wednesday", "Interest rate differential", "EUR/USD, AUD/USD, GBP/JPY, etc."],
-            "table_metals": ["Metals (Gold/Silver)", "Wednesday", "USD interest rate vs. metal lease rate", "XAUUSD, XAGUSD"],
-            "table_energy": ["Energy (Oil)", "Wednesday", "Broker rate / USD Libor", "WTI, Brent"],
-            "table_crypto": ["Cryptos", "Friday", "Funding rate, platform policy", "BTC/USD, ETH/USD"],
-            "table_indices": ["Indices", "Wednesday", "Index components’ dividend rate", "S&P500, HK50"],
-            "calc_title": "Swap & Triple Swap Calculator",
-            "direction": "Position Type",
-            "long": "Long",
-            "short": "Short",
-            "volume": "Position Size (lots/contracts)",
-            "swap_rate": "Daily Swap Rate (per lot)",
-            "days": "Holding Days",
-            "calculate": "Calculate",
-            "swap_result": "Total Swap (incl. triple swap days)",
-            "faq_title": "Frequently Asked Questions",
-            "faq": [
-                "**Q: Why is swap positive one week and negative the next?**\nA: Central bank rates and broker commissions change; also, dividend/funding/market events may affect swap.",
-                "**Q: Why do triple swap days exist?**\nA: Saturday and Sunday don’t charge swap, but positions still cross two days. So, brokers charge 3x swap on a certain day to cover the full period.",
-                "**Q: Can swap flip sign (from + to -)?**\nA: Yes! If interest rate policy changes, or your broker adjusts swap rates, positive can become negative and vice versa.",
-                "**Q: Is swap the same across all brokers?**\nA: No. Always check your broker’s contract/specification. Some even offer ‘swap free’ accounts for Islamic clients."
-            ]
-        },
-        "zh": {
-            "title": "💱 Swap与三倍Swap全解析",
-            "concept_title": "什么是Swap（隔夜利息/掉期费）？",
-            "concept": (
-                "Swap，也叫隔夜利息或掉期费，是指持仓过夜时产生的利息收入或成本。适用于外汇、贵金属、原油、指数、加密货币等杠杆产品。"
-                "Swap根据两种货币利差或各平台公布标准费率收取。Swap既可能为正（收钱），也可能为负（扣钱），取决于交易方向和品种。"
-            ),
-            "triple_swap_title": "什么是三倍Swap（Triple Swap）？",
-            "triple_swap": (
-                "为覆盖周末无结算的两天，外汇、贵金属等产品一般在周三结算三倍swap；加密货币多为周五结算三倍swap，具体以平台为准。"
-            ),
-            "common_time_title": "🕑 Swap结算常见时间",
-            "common_time": [
-                "**外汇、贵金属、指数**：大多在平台结算时间点（常见为悉尼5点/纽约下午5点）计息。",
-                "**三倍Swap**：一般周三（外汇/金属），周五（加密），以券商公布为准。",
-                "**周末不计息**：但周三或周五的三倍swap自动覆盖周六/日。",
-                "**重大节假日**：假期前后swap可能提前或推迟结算。"
-            ],
-            "positive_swap": "💡 什么时候是收钱/给钱？",
-            "earn_swap": [
-                "如果买入的货币利率高于卖出货币，并扣除平台手续费后仍为正，则**收利息**（swap为正）。",
-                "例如：买入AUD/USD（澳元利率高于美元时），有机会正swap。"
-            ],
-            "pay_swap": [
-                "如果卖出货币利率更高或平台费率因素导致，swap为负则**需要付钱**。",
-                "例如：卖出AUD/USD（澳元利率低于美元时），通常会被扣swap。"
-            ],
-            "products_title": "各品种swap/三倍swap规则",
-            "product_table_cols": ["品种", "三倍结算日", "计息依据", "常见合约"],
-            "table_fx": ["外汇", "周三", "货币利差", "EUR/USD、AUD/USD、GBP/JPY等"],
-            "table_metals": ["贵金属", "周三", "美元利率-金属租借利率", "XAUUSD、XAGUSD"],
-            "table_energy": ["能源（原油）", "周三", "平台标准/美元Libor", "WTI、Brent"],
-            "table_crypto": ["加密货币", "周五", "Funding费率/平台规则", "BTC/USD、ETH/USD"],
-            "table_indices": ["指数", "周三", "指数成分分红率", "标普500、恒指等"],
-            "calc_title": "Swap与三倍Swap计算器",
-            "direction": "方向",
-            "long": "多头",
-            "short": "空头",
-            "volume": "持仓规模（手/合约）",
-            "swap_rate": "每日swap费率（每手）",
-            "days": "持仓天数",
-            "calculate": "计算",
-            "swap_result": "总Swap（含三倍天）",
-            "faq_title": "常见问题FAQ",
-            "faq": [
-                "**问：为什么swap有时正有时负？**\n答：利率政策变动、手续费调整、平台定价变动，都会导致swap方向变化。",
-                "**问：三倍swap为什么要存在？**\n答：为覆盖周末两天（无结算），通常在周三（外汇）/周五（加密）一次性计入三天的swap。",
-                "**问：swap正负会变化吗？**\n答：当然可能，比如加息、降息、平台策略调整等。",
-                "**问：各平台swap一样吗？**\n答：差别很大！一定要查自己券商的合约细则，有的还有伊斯兰“免swap”账户。"
-            ]
-        }
-    }
 
     lang = st.session_state.get("language", "en")
-    t = translations[lang]
+    t = get_translations("swap", lang)
 
     st.markdown("""
         <style>
@@ -153,62 +59,54 @@ def swap_page():
     # ====== Swap方向测算区 ======
     st.markdown("#### 🧭 Swap Direction Estimator ")
 
-    # 主要品种及示例利率（如实际有最新利率可更新）
-    product_rate_dict = {
-        "EUR/USD": {"base": "EUR", "quote": "USD", "base_rate": 4.5, "quote_rate": 5.5},
-        "AUD/USD": {"base": "AUD", "quote": "USD", "base_rate": 4.35, "quote_rate": 5.5},
-        "GBP/USD": {"base": "GBP", "quote": "USD", "base_rate": 5.25, "quote_rate": 5.5},
-        "USD/JPY": {"base": "USD", "quote": "JPY", "base_rate": 5.5, "quote_rate": 0.1},
-        "Gold (XAUUSD)": {"base": "Gold", "quote": "USD", "base_rate": 0.0, "quote_rate": 5.5},
-        "Oil (WTI)": {"base": "Oil", "quote": "USD", "base_rate": 0.0, "quote_rate": 5.5},
-        "BTC/USD": {"base": "BTC", "quote": "USD", "base_rate": 0.0, "quote_rate": 5.5},
-    }
-
-    product_options = list(product_rate_dict.keys())
+    # 版本化 swap 费率表：按 (品种, 方向, 生效日) 保存每手每日 swap，可上传新版本或直接编辑
+    rates = SwapRates()
+    with st.expander("📚 Swap rate versions", expanded=False):
+        st.caption("Swap per lot per day (positive = earned) from the effective date on; "
+                   "the latest version on or before a date applies.")
+        uploaded = st.file_uploader("Add versions (" + ", ".join(SWAP_RATE_COLUMNS) + ")",
+                                    type=["csv", "parquet", "arrow", "feather"], key="swap_rates_upload")
+        if uploaded is not None:
+            try:
+                rates = rates.add(load_table(uploaded.getvalue(), uploaded.name, SWAP_RATE_DTYPES))
+            except (KeyError, ValueError, ImportError) as e:
+                st.error(f"Invalid swap rate file. {e}")
+        edited = st.data_editor(
+            rates.table(), num_rows="dynamic", hide_index=True, use_container_width=True, key="swap_rate_table",
+            column_config={"symbol": st.column_config.SelectboxColumn(options=list(SYMBOLS), required=True),
+                           "direction": st.column_config.SelectboxColumn(options=["Long", "Short"], required=True)})
+        try:
+            rates = SwapRates(edited.dropna())  # 未填完的新行不参与
+        except (KeyError, ValueError) as e:
+            st.error(f"Invalid swap rate versions. {e}")
+
+    product_options = sorted(set(rates.table()["symbol"]), key=SYMBOLS.index)
     col1, col2, col3 = st.columns([2, 1, 2])
     with col1:
         product = st.selectbox("Product", product_options)
     with col2:
         direction = st.radio("Direction", [t["long"], t["short"]], horizontal=True)
     with col3:
-        # 可选显示当前基准利率，用户也可手动调整体验
-        base_rate = st.number_input(
-            f"{product_rate_dict[product]['base']} rate",
-            value=product_rate_dict[product]['base_rate'],
-            step=0.01
-        )
-        quote_rate = st.number_input(
-            f"{product_rate_dict[product]['quote']} rate",
-            value=product_rate_dict[product]['quote_rate'],
-            step=0.01
-        )
+        as_of = st.date_input("As of", value=datetime.date.today(), key="swap_rate_as_of")
 
     if st.button("🔍 Estimate Swap Direction"):
-        msg = ""
-        color = ""
-        # 方向逻辑
-        if direction == t["long"]:
-            diff = base_rate - quote_rate
-            if diff > 0:
-                msg = "✅ Likely to **earn** swap (收钱)，但最终以券商为准。"
-                color = "green"
-            elif diff < 0:
-                msg = "❌ Likely to **pay** swap (付钱)，但最终以券商为准。"
-                color = "red"
-            else:
-                msg = "⚠️ Swap direction may be neutral or depends on broker policy."
-                color = "orange"
-        else:  # 空头
-            diff = quote_rate - base_rate
-            if diff > 0:
-                msg = "✅ Likely to **earn** swap (收钱)，但最终以券商为准。"
-                color = "green"
-            elif diff < 0:
-                msg = "❌ Likely to **pay** swap (付钱)，但最终以券商为准。"
-                color = "red"
-            else:
-                msg = "⚠️ Swap direction may be neutral or depends on broker policy."
-                color = "orange"
+        swap_rate_as_of = rates.as_of([symbol_id(product)], ["Long" if direction == t["long"] else "Short"],
+                                      [np.datetime64(as_of)])[0]
+        # 方向逻辑：按当日生效的费率符号判断
+        if np.isnan(swap_rate_as_of):
+            msg = "⚠️ No swap rate in force on this date; depends on broker policy."
+            color = "orange"
+        elif swap_rate_as_of > 0:
+            msg = "✅ Likely to **earn** swap (收钱)，但最终以券商为准。"
+            color = "green"
+        elif swap_rate_as_of < 0:
+            msg = "❌ Likely to **pay** swap (付钱)，但最终以券商为准。"
+            color = "red"
+        else:
+            msg = "⚠️ Swap direction may be neutral or depends on broker policy."
+            color = "orange"
+        if not np.isnan(swap_rate_as_of):
+            msg += f" ({swap_rate_as_of:+.2f} per lot per day)"
         st.markdown(f"<div style='font-size:1.2em;color:{color}'>{msg}</div>", unsafe_allow_html=True)
         st.caption("结果仅供参考，实际swap方向及金额以平台/券商报价为准，实际收付还会受手续费、浮动利差影响。")
 
@@ -242,23 +140,67 @@ def swap_page():
                 help=t["swap_rate"]+"（正为收钱，负为扣钱，具体查券商官网）"
             )
         with cols[3]:
-            days = st.number_input(t["days"], min_value=1, value=7, step=1,
-                                   help="总持仓天数（如遇三倍swap请计入三倍天数）")
+            symbol = st.selectbox("Product", SYMBOLS, key="swap_calc_symbol")
+        today = datetime.date.today()
+        cols = st.columns(4)
+        with cols[0]:
+            open_date = st.date_input("Open date", value=today - datetime.timedelta(days=7), key="swap_open_date")
+        with cols[1]:
+            open_time = st.time_input("Open time", value=datetime.time(10, 0), key="swap_open_time")
+        with cols[2]:
+            close_date = st.date_input("Close date", value=today, key="swap_close_date")
+        with cols[3]:
+            close_time = st.time_input("Close time", value=datetime.time(10, 0), key="swap_close_time")
+        holiday_text = st.text_input("Holidays (YYYY-MM-DD, comma separated)", value="", key="swap_holidays",
+                                     help="No rollover on these dates; value dates skip them as well")
         calc = st.form_submit_button(t["calculate"])
 
         swap_total = None
         if calc:
-            # 简化算法：每7天内自动识别“周三/周五为三倍天”
-            triple_days = 0
-            if days >= 3:
-                triple_days = days // 7  # 每周一次三倍swap
-            single_days = days - triple_days
-            swap_total = swap_rate * single_days + swap_rate * triple_days * 3
-            swap_total = swap_total * volume
-    if 'swap_total' not in locals():
-        swap_total = None
+            try:
+                holidays = parse_holidays(holiday_text)
+            except ValueError as e:
+                st.error(f"Invalid holiday date. {e}")
+            else:
+                # 按实际展期计息：外汇/金属/能源/指数周三三倍，加密货币周五三倍，节假日顺延
+                opened = np.datetime64(datetime.datetime.combine(open_date, open_time))
+                closed = np.datetime64(datetime.datetime.combine(close_date, close_time))
+                count, days = rollovers(symbol_id(symbol), opened, closed, holidays)
+                swap_total = float(volume * swap_rate * days)
     if swap_total is not None:
         st.metric(label=t["swap_result"], value=f"{swap_total:,.2f}")
+        st.caption(f"{int(count)} rollovers, {int(days)} swap days "
+                   f"(rollover at {ROLLOVER_TIME.astype(int)}:00, same clock as the times above)")
+
+    # 批量计提：上传持仓文件，一次向量化计算每笔持仓的 swap
+    with st.expander("📂 Batch swap accrual (positions file)", expanded=False):
+        st.caption("Columns: " + ", ".join(POSITION_COLUMNS) + ". Swap rates are per lot per day; without "
+                   "swap_long / swap_short the rate versions above apply. Holidays above apply.")
+        uploaded = st.file_uploader("Positions file", type=["csv", "parquet", "arrow", "feather"],
+                                    key="swap_positions_upload")
+        if uploaded is not None:
+            try:
+                positions = load_table(uploaded.getvalue(), uploaded.name, POSITION_DTYPES)
+                holidays = parse_holidays(holiday_text)
+                if "swap_long" in positions and "swap_short" in positions:
+                    sid = require_symbol_ids(positions["symbol"])
+                    opened = pd.to_datetime(positions["open_time"]).to_numpy().astype("datetime64[ns]")
+                    closed = pd.to_datetime(positions["close_time"]).to_numpy().astype("datetime64[ns]")
+                    count, days = rollovers(sid, opened, closed, holidays)
+                    result = positions.assign(
+                        rollovers=count, swap_days=days,
+                        expected_swap=accrue_swap(sid, positions["direction"].to_numpy(),
+                                                  positions["lots"].to_numpy(dtype=float),
+                                                  positions["swap_long"].to_numpy(dtype=float),
+                                                  positions["swap_short"].to_numpy(dtype=float), opened, closed, holidays))
+                else:
+                    # 没有费率列时按版本化费率表逐段 as-of 计提；有入账 swap 列时给出差额
+                    result = trade_swaps(positions, rates, holidays)
+            except (KeyError, ValueError, ImportError) as e:
+                st.error(f"Invalid positions file. {e}")
+            else:
+                st.metric("Total swap", f"{result['expected_swap'].sum():,.2f}")
+                st.dataframe(result, use_container_width=True, hide_index=True)
 
     st.divider()
 
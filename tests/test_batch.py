@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from core.account import calc_account_summary
+from core.batch import position_sums, summarize_snapshot
+from core.instruments import symbol_ids
+from core.rates import quote_snapshot, quote_to_account
+
+QUOTES = quote_snapshot({"USD/JPY": 150.0, "EUR/USD": 1.10, "GBP/USD": 1.25})
+
+SNAPSHOT = pd.DataFrame({
+    "account_id": [1, 1, 2, 1, 2, 1],
+    "symbol": ["EUR/USD", "USD/JPY", "EUR/USD", "Gold (XAUUSD)", "GBP/USD", "EUR/USD"],
+    "direction": ["Long", "Short", "Short", "Long", "Long", "Short"],
+    "lots": [1.0, 0.5, 2.0, 0.1, 1.0, 0.3],
+    "contract_size": [100000.0, 100000.0, 100000.0, 100.0, 100000.0, 100000.0],
+    "entry": [1.10, 145.0, 1.11, 2400.0, 1.30, 1.12],
+    "current": [1.11, 144.0, 1.105, 2450.0, 1.29, 1.11],
+    "margin_rate": [1.0, 2.0, 1.0, 5.0, 1.0, 1.0],
+    "balance": [20000.0, 20000.0, 5000.0, 20000.0, 5000.0, 20000.0],
+    "account_currency": ["USD", "USD", "EUR", "USD", "EUR", "USD"],
+})
+
+
+@pytest.fixture(params=[2, None], ids=["three-row-groups", "one-row-group"])
+def snapshot(tmp_path, request):
+    path = tmp_path / "snapshot.parquet"
+    # 每个 row group 两行时账户 1 分布在全部三个 row group 中；只有一个 row group 时按行区间切分
+    SNAPSHOT.to_parquet(path, index=False, row_group_size=request.param)
+    return str(path)
+
+
+def test_pnl_is_converted_to_the_account_currency():
+    # USD/JPY 空 1 手 150 → 151：-100000 JPY = -666.67 USD；保证金 1% × 100000 × 151 JPY
+    positions = pd.DataFrame({"account_id": [7], "symbol": ["USD/JPY"], "direction": ["Short"], "lots": [1.0],
+                              "entry": [150.0], "current": [151.0], "margin_rate": [1.0]})
+    sums = position_sums(positions, "USD", QUOTES)
+    assert sums.loc[7, "floating"] == pytest.approx(-100000.0 / 150)
+    assert sums.loc[7, "used_margin"] == pytest.approx(151000.0 / 150)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_summaries_match_calc_account_summary(snapshot, workers):
+    result = summarize_snapshot(snapshot, workers=workers, quotes=QUOTES).set_index("account_id")
+    for account, rows in SNAPSHOT.groupby("account_id"):
+        # 合约规模乘以报价货币 → 账户货币汇率，单账户汇总即为账户货币
+        to_account = quote_to_account(symbol_ids(rows["symbol"]), rows["account_currency"].iloc[0], QUOTES)
+        columns = (rows["direction"].to_numpy(), rows["lots"].to_numpy(), rows["contract_size"].to_numpy() * to_account,
+                   rows["entry"].to_numpy(), rows["current"].to_numpy(), rows["margin_rate"].to_numpy())
+        expected = calc_account_summary(rows["balance"].iloc[0], *columns)
+        units = calc_account_summary(rows["balance"].iloc[0], *columns[:2], rows["contract_size"].to_numpy(), *columns[3:])
+        got = result.loc[account]
+        assert got["orders"] == len(rows)
+        assert got["account_currency"] == rows["account_currency"].iloc[0]
+        for name in ("floating", "used_margin", "equity", "free_margin", "margin_level"):
+            assert got[name] == pytest.approx(expected[name]), name
+        for name in ("long_size", "short_size"):
+            assert got[name] == pytest.approx(units[name]), name
+
+
+def test_balances_override_the_snapshot(snapshot):
+    result = summarize_snapshot(snapshot, pd.Series({1: 1000.0, 2: 2000.0})).set_index("account_id")
+    assert result.loc[1, "balance"] == 1000.0
+    assert result.loc[2, "equity"] == pytest.approx(2000.0 + result.loc[2, "floating"])
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.history import margin_at, margin_history
+
+# 1 手 EUR/USD 多单：10:00 以 1.10 开仓，12:00 以 1.12 平仓，保证金率 1%
+TRADES = pd.DataFrame({
+    "open_time": ["2024-09-16 10:00"],
+    "close_time": ["2024-09-16 12:00"],
+    "symbol": ["EUR/USD"],
+    "direction": ["Long"],
+    "lots": [1.0],
+    "open_price": [1.10],
+    "close_price": [1.12],
+    "margin_rate": [1.0],
+})
+PRICES = pd.DataFrame({"timestamp": ["2024-09-16 11:00"], "symbol": ["EUR/USD"], "close": [1.11]})
+BALANCE = 10000.0
+
+
+def test_margin_at_excludes_trades_at_the_same_moment():
+    state = margin_at(TRADES, PRICES, BALANCE, ["2024-09-16 10:00", "2024-09-16 11:00", "2024-09-16 12:00"])
+    # 10:00 的开仓尚未计入；12:00 的平仓也未计入，持仓按平仓价 1.12 估值
+    np.testing.assert_allclose(state["balance"], [10000.0, 10000.0, 10000.0])
+    np.testing.assert_allclose(state["floating"], [0.0, 1000.0, 2000.0])
+    np.testing.assert_allclose(state["used_margin"], [0.0, 1110.0, 1120.0])
+    assert state["margin_level"].iloc[2] == pytest.approx(12000.0 / 1120.0 * 100)
+
+
+def test_margin_at_keeps_the_requested_order():
+    state = margin_at(TRADES, PRICES, BALANCE, ["2024-09-16 12:00", "2024-09-16 11:00"])
+    np.testing.assert_allclose(state["floating"], [2000.0, 1000.0])
+
+
+def test_margin_history_books_the_close():
+    history = margin_history(TRADES, PRICES, BALANCE)
+    closed = history.loc[pd.Timestamp("2024-09-16 12:00")]
+    assert closed["balance"] == pytest.approx(12000.0)
+    assert closed["used_margin"] == 0.0
+
+
+def test_margin_history_in_the_account_currency():
+    # EUR 账户：EUR/USD 盈亏与保证金以 USD 计，乘以 USD → EUR 汇率
+    history = margin_history(TRADES, PRICES, BALANCE, to_account=1 / 1.11)
+    state = history.loc[pd.Timestamp("2024-09-16 11:00")]
+    assert state["floating"] == pytest.approx(1000.0 / 1.11)
+    assert state["used_margin"] == pytest.approx(1110.0 / 1.11)
+    assert history["balance"].iloc[-1] == pytest.approx(BALANCE + 2000.0 / 1.11)
@@ -0,0 +1,39 @@
+import pytest
+
+from core.orders import OrderStore
+from core.rates import quote_snapshot
+
+# 换算报价固定 USD/JPY = 150（与订单现价 151 无关）
+QUOTES = quote_snapshot({"USD/JPY": 150.0})
+
+
+def _book():
+    book = OrderStore().set_account_currency("USD", QUOTES)
+    # EUR/USD 多 1 手 1.10 → 1.11：+1000 USD，保证金 1110 USD
+    book.append("EUR/USD", "Long", 1.0, None, 1.10, 1.11, 1.0)
+    # USD/JPY 空 1 手 150 → 151：-100000 JPY，保证金 151000 JPY
+    book.append("USD/JPY", "Short", 1.0, None, 150.0, 151.0, 1.0)
+    return book
+
+
+def test_running_totals_are_in_the_account_currency():
+    book = _book()
+    assert book.account.floating == pytest.approx(1000.0 - 100000.0 / 150)
+    assert book.account.used_margin == pytest.approx(1110.0 + 151000.0 / 150)
+    assert book.account.long_size == 100000.0
+    assert book.verify()
+
+
+def test_reprice_and_remove_keep_the_converted_totals():
+    book = _book()
+    book.set_price(1, 149.0)
+    assert book.account.floating == pytest.approx(1000.0 + 100000.0 / 150)
+    book.remove([0])
+    assert book.account.used_margin == pytest.approx(149000.0 / 150)
+    assert book.verify()
+
+
+def test_changing_the_currency_recomputes_the_totals():
+    book = _book().set_account_currency("JPY", QUOTES)
+    assert book.account.floating == pytest.approx(1000.0 * 150 - 100000.0)
+    assert book.verify()
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from core.instruments import symbol_id
+from core.replay import DOWN, UP, MarginReplay
+
+# 1 手 EUR/USD 多单，1.10 开仓，保证金率 1%，余额 4000：
+# 买价 p 时 浮动 = 100000 × (p − 1.10)，保证金 = 1000 × p
+BALANCE = 4000.0
+
+
+def _replay(**options):
+    return MarginReplay([symbol_id("EUR/USD")], ["Long"], [1.0], [100000.0], [1.10], [1.10], [1.0],
+                        BALANCE, **options)
+
+
+def _ticks(*bids):
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-09-16 10:00", periods=len(bids), freq="s"),
+        "symbol": "EUR/USD",
+        "bid": bids,
+        "ask": [bid + 0.0002 for bid in bids],
+    })
+
+
+def test_threshold_crossings_down_and_up():
+    replay = _replay(liquidate=False)
+    # 1.09: 3000 / 1090 = 275%；1.07: 1000 / 1070 = 93%；1.09: 回到 275%
+    events = replay.update(_ticks(1.09, 1.07, 1.09))
+    assert [(e["threshold"], e["direction"]) for e in events] == [(300.0, DOWN), (100.0, DOWN), (100.0, UP)]
+    assert events[0]["equity"] == pytest.approx(3000.0)
+    assert events[0]["used_margin"] == pytest.approx(1090.0)
+    assert events[1]["margin_level"] == pytest.approx(1000.0 / 1070.0 * 100)
+    assert not any(e["liquidated"] for e in events)
+
+
+def test_stop_out_liquidates_and_realizes_the_loss():
+    replay = _replay()
+    # 1.0645: 权益 450，保证金 1064.5 → 42%，一笔 tick 同时穿越 100% 与 50%（强平线）
+    events = replay.update(_ticks(1.09, 1.0645, 1.08))
+    assert [(e["threshold"], e["liquidated"]) for e in events] == [(300.0, False), (100.0, False), (50.0, True)]
+    assert events[-1]["timestamp"] == pd.Timestamp("2024-09-16 10:00:01")
+    # 强平后账户无持仓：之后的 1.08 不再产生事件，亏损已计入余额
+    summary = replay.summary().iloc[0]
+    assert summary["balance"] == pytest.approx(450.0)
+    assert summary["floating"] == 0.0
+    assert summary["used_margin"] == 0.0
+
+
+def test_without_liquidation_the_position_recovers():
+    replay = _replay(liquidate=False)
+    events = replay.update(_ticks(1.0645, 1.08))
+    assert [(e["threshold"], e["direction"]) for e in events] == [
+        (300.0, DOWN), (100.0, DOWN), (50.0, DOWN), (50.0, UP), (100.0, UP)]
+    summary = replay.summary().iloc[0]
+    assert summary["equity"] == pytest.approx(2000.0)
+    assert summary["used_margin"] == pytest.approx(1080.0)
+
+
+def test_stop_outs_of_several_accounts_in_one_chunk():
+    # 账户 b 余额 2500：1.08 时权益 500 / 保证金 1080 = 46%，先于账户 a 强平；a 在 1.0645 强平
+    eurusd = symbol_id("EUR/USD")
+    replay = MarginReplay([eurusd, eurusd], ["Long", "Long"], [1.0, 1.0], [100000.0] * 2, [1.10] * 2, [1.10] * 2,
+                          [1.0] * 2, {"a": BALANCE, "b": 2500.0}, account=["a", "b"])
+    events = replay.update(_ticks(1.09, 1.08, 1.0645))
+    assert [(e["account"], e["threshold"], e["liquidated"]) for e in events] == [
+        ("a", 300.0, False), ("b", 100.0, False), ("b", 50.0, True), ("a", 100.0, False), ("a", 50.0, True)]
+    summary = replay.summary().set_index("account")
+    assert summary.loc["a", "balance"] == pytest.approx(450.0)
+    assert summary.loc["b", "balance"] == pytest.approx(500.0)
+    assert (summary["used_margin"] == 0.0).all()
+
+
+def test_account_currency_replay():
+    # EUR 账户，USD → EUR 汇率 0.9：1.09 时 浮动 −1000 USD = −900 EUR，保证金 1090 USD = 981 EUR
+    replay = _replay(liquidate=False, to_account=0.9)
+    replay.update(_ticks(1.09))
+    summary = replay.summary().iloc[0]
+    assert summary["floating"] == pytest.approx(-900.0)
+    assert summary["used_margin"] == pytest.approx(981.0)
+    assert summary["balance"] == BALANCE
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from core.sketch import SpreadSketch, merge_sketches
+
+
+def _sketch(spreads):
+    ts = pd.date_range("2024-09-18T10:00", periods=len(spreads), freq="s")
+    return SpreadSketch().update(ts, ["EUR/USD"] * len(spreads), spreads)
+
+
+def test_merge_sketches_leaves_the_inputs_unchanged():
+    first, second = _sketch([1.0, 2.0]), _sketch([3.0])
+    merged = merge_sketches([first, second])
+    assert merged.counts.sum() == 3
+    # 合并结果是新对象，重复合并同一组草图不会累加到第一个输入上
+    assert merge_sketches([first, second]).counts.sum() == 3
+    assert first.counts.sum() == 2
+    assert second.counts.sum() == 1
+
+
+def test_merge_of_nothing_is_empty():
+    assert merge_sketches([]).counts.empty
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from core.instruments import symbol_id
+from core.swap import SwapRates, parse_holidays, rollovers
+
+EURUSD = symbol_id("EUR/USD")
+BTCUSD = symbol_id("BTC/USD")
+
+
+def _times(*values):
+    return np.array(values, dtype="datetime64[ns]")
+
+
+def test_fx_charges_three_days_on_wednesday():
+    # 周三 → 周四：一次展期，T+2 起息日跨周末
+    count, days = rollovers([EURUSD], _times("2024-09-18T10:00"), _times("2024-09-19T10:00"))
+    assert (count[0], days[0]) == (1, 3)
+    count, days = rollovers([EURUSD], _times("2024-09-20T10:00"), _times("2024-09-23T10:00"))
+    assert (count[0], days[0]) == (1, 1)
+
+
+def test_crypto_charges_three_days_on_friday():
+    # T+0：周五的展期覆盖周末
+    count, days = rollovers([BTCUSD], _times("2024-09-20T10:00"), _times("2024-09-23T10:00"))
+    assert (count[0], days[0]) == (1, 3)
+    count, days = rollovers([BTCUSD], _times("2024-09-18T10:00"), _times("2024-09-19T10:00"))
+    assert (count[0], days[0]) == (1, 1)
+
+
+def test_holiday_skips_the_rollover():
+    holidays = parse_holidays("2024-09-17")
+    count, days = rollovers([EURUSD], _times("2024-09-16T10:00"), _times("2024-09-19T10:00"), holidays)
+    assert (count[0], days[0]) == (2, 4)
+
+
+def test_accrue_splits_at_a_rate_version():
+    # 周一 → 下周一，5 次展期 7 天：
+    # 9/16、9/17 按 -7.23 各 1 天，9/18 按 -7.23 计 3 天；9/19 起按 -5.80，9/19、9/20 各 1 天
+    count, days, swap = SwapRates().accrue([EURUSD], ["Long"], [1.0],
+                                           _times("2024-09-16T10:00"), _times("2024-09-23T10:00"))
+    assert (count[0], days[0]) == (5, 7)
+    assert swap[0] == pytest.approx(5 * -7.23 - 2 * 5.80)
+
+
+def test_accrue_before_the_first_version_is_nan():
+    _, _, swap = SwapRates().accrue([EURUSD], ["Short"], [1.0],
+                                    _times("2023-12-28T10:00"), _times("2024-01-03T10:00"))
+    assert np.isnan(swap[0])